@@ -0,0 +1,126 @@
+"""
+Şarkı sözü siteleri için adapter arayüzü
+
+Her adapter bir sitenin üç parçasını bilir:
+- artist_url:      sanatçıdan liste sayfası URL'i üretir
+- parse_song_list: liste sayfasından şarkı adlarını ve URL'lerini çıkarır
+- parse_lyrics:    şarkı sayfasından sözleri çıkarır
+ve bulunan linkleri normalize_url ile tek bir biçime getirir.
+
+Adapter'lar parser backend'leriyle aynı arayüzü (parse_song_list, parse_lyrics,
+streaming) taşıdığı için webScrapper fonksiyonlarına `parser` olarak verilebilir.
+"""
+
+import re
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from bs4 import BeautifulSoup
+
+from parsers import DEFAULT_PARSER, SKIPPED_ELEMENTS, get_parser
+
+
+class SiteAdapter:
+    """Site adapter'larının temel sınıfı"""
+
+    name = ''
+    streaming = False
+
+    def artist_url(self, artist):
+        """Sanatçı adı/slug'ından liste sayfası URL'i"""
+        raise NotImplementedError
+
+    def normalize_url(self, href, base_url):
+        """Linki tam, tekil bir URL'e çevirir (şema, host küçük harf, fragment yok)"""
+        parts = urlsplit(urljoin(base_url, href))
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ''))
+
+    def parse_song_list(self, content, url):
+        raise NotImplementedError
+
+    def parse_lyrics(self, content):
+        raise NotImplementedError
+
+
+class AZLyricsAdapter(SiteAdapter):
+    """azlyrics.com - `#listAlbum a` ve `br + div` seçicileri"""
+
+    name = 'azlyrics'
+    base_url = 'https://www.azlyrics.com/'
+
+    def __init__(self, parser=DEFAULT_PARSER):
+        self.backend = get_parser(parser)
+        self.streaming = self.backend.streaming
+
+    def artist_url(self, artist):
+        slug = re.sub(r'[^a-z0-9]', '', artist.lower())
+        # Rakamla başlayan sanatçılar '19' klasöründe tutulur
+        folder = slug[0] if slug[0].isalpha() else '19'
+        return f"{self.base_url}{folder}/{slug}.html"
+
+    def parse_song_list(self, content, url):
+        songs = self.backend.parse_song_list(content, url)
+        for song in songs:
+            song['url'] = self.normalize_url(song['url'], url)
+        return songs
+
+    def parse_lyrics(self, content):
+        return self.backend.parse_lyrics(content)
+
+
+class SelectorAdapter(SiteAdapter):
+    """CSS seçicileriyle tanımlanan genel adapter (yeni siteler için kod yazmadan)
+
+    Args:
+        name: Adapter adı
+        list_selector: Liste sayfasındaki şarkı linkleri
+        lyrics_selector: Şarkı sayfasındaki söz elementi
+        artist_url_template: '{artist}' yer tutuculu liste sayfası URL'i
+    """
+
+    def __init__(self, name, list_selector, lyrics_selector, artist_url_template=None,
+                 features='html.parser'):
+        self.name = name
+        self.list_selector = list_selector
+        self.lyrics_selector = lyrics_selector
+        self.artist_url_template = artist_url_template
+        self.features = features
+
+    def artist_url(self, artist):
+        if not self.artist_url_template:
+            raise ValueError(f"{self.name} adapter'ı için sanatçı URL'i verilmeli")
+        return self.artist_url_template.format(artist=artist)
+
+    def parse_song_list(self, content, url):
+        soup = BeautifulSoup(content, self.features)
+        songs = []
+        for link in soup.select(self.list_selector):
+            song_name = link.text.strip()
+            song_url = link.get('href')
+            if song_name and song_url:
+                songs.append({'name': song_name, 'url': self.normalize_url(song_url, url)})
+        return songs
+
+    def parse_lyrics(self, content):
+        soup = BeautifulSoup(content, self.features)
+        lyrics_element = soup.select_one(self.lyrics_selector)
+        if not lyrics_element:
+            return None
+        for tag in lyrics_element(list(SKIPPED_ELEMENTS)):
+            tag.decompose()
+        return lyrics_element.get_text(strip=True, separator='\n')
+
+
+SITE_ADAPTERS = {
+    'azlyrics': AZLyricsAdapter,
+}
+
+
+def get_adapter(site='azlyrics', **options):
+    """İsimle site adapter'ı oluşturur; SelectorAdapter için seçiciler options'ta verilir"""
+    if isinstance(site, SiteAdapter):
+        return site
+    if site in SITE_ADAPTERS:
+        return SITE_ADAPTERS[site](**options)
+    if 'list_selector' in options and 'lyrics_selector' in options:
+        return SelectorAdapter(site, **options)
+    raise ValueError(f"Bilinmeyen site: {site} (seçenekler: {', '.join(SITE_ADAPTERS)})")
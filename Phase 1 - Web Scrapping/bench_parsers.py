@@ -0,0 +1,105 @@
+"""
+Parser backend'leri için mikro benchmark
+
+Kaydedilmiş HTML sayfaları üzerinde her backend'in parse süresini ve tepe bellek
+kullanımını karşılaştırır, sonuçların html.parser ile aynı olduğunu doğrular. Her
+sayfada hem şarkı listesi hem söz çıkarımı çalıştırılır (liste ve söz sayfaları).
+
+    python bench_parsers.py                        # fixtures/azlyrics (test_adapters.py ile ortak)
+    python bench_parsers.py kayitli_sayfalar --repeat 20
+    python bench_parsers.py --synthetic            # büyük, sentetik azlyrics benzeri sayfalar
+
+Not: Tepe bellek tracemalloc ile ölçülür; lxml'in C tarafındaki ayırmaları bu
+sayıya dahil değildir.
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+
+from parsers import PARSER_BACKENDS, get_parser
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'azlyrics')
+# Liste sayfalarındaki göreli linkler bu adrese göre çözülür
+PAGE_URL = 'https://www.azlyrics.com/s/sagopakajmer.html'
+
+
+def synthetic_pages(count=20, lines=60):
+    """Reklam, script ve menü içeren, ortasında söz div'i olan sayfalar üretir"""
+    filler = ''.join(
+        f'<div class="ad"><script>var slot{i} = {{id: {i}}};</script><a href="/x{i}">menu {i}</a></div>'
+        for i in range(150)
+    )
+    pages = []
+    for n in range(count):
+        lyrics = '<br>\n'.join(f'Satır {n}-{i} zaman geçer yalnızlık kalır' for i in range(lines))
+        pages.append((
+            f'<html><head><title>Şarkı {n}</title><style>.a{{color:red}}</style></head><body>'
+            f'{filler}<div class="ringtone"></div><b>"Şarkı {n}"</b><br>'
+            f'<div><!-- lyrics -->{lyrics}</div><br><br>{filler}{filler}</body></html>'
+        ).encode('utf-8'))
+    return pages
+
+
+def load_pages(folder):
+    pages = []
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith(('.html', '.htm')):
+            with open(os.path.join(folder, filename), 'rb') as f:
+                pages.append(f.read())
+    return pages
+
+
+def parse_page(backend, page):
+    return backend.parse_song_list(page, PAGE_URL), backend.parse_lyrics(page)
+
+
+def bench_backend(name, pages, repeat):
+    """(sayfa başına ms, tepe bellek KB, sonuçlar) döner"""
+    backend = get_parser(name)
+    results = [parse_page(backend, page) for page in pages]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            parse_page(backend, page)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for page in pages:
+        parse_page(backend, page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_page_ms = elapsed / (repeat * len(pages)) * 1000
+    return per_page_ms, peak / 1024, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parser backend benchmark")
+    parser.add_argument('folder', nargs='?', default=FIXTURES_DIR, help="Kaydedilmiş HTML sayfaları klasörü")
+    parser.add_argument('--synthetic', action='store_true', help="Klasör yerine sentetik sayfalar")
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    pages = synthetic_pages() if args.synthetic else load_pages(args.folder)
+    if not pages:
+        parser.error(f"{args.folder} içinde .html sayfası yok")
+    total_kb = sum(len(page) for page in pages) / 1024
+    print(f"📄 {len(pages)} sayfa ({total_kb:.0f} KB), {args.repeat} tekrar\n")
+
+    baseline = None
+    print(f"{'Backend':12s} {'ms/sayfa':>10s} {'hızlanma':>10s} {'tepe bellek':>14s}  sonuç")
+    print("-" * 60)
+    for name in PARSER_BACKENDS:
+        try:
+            per_page_ms, peak_kb, results = bench_backend(name, pages, args.repeat)
+        except ImportError as e:
+            print(f"{name:12s} atlandı: {e}")
+            continue
+        if baseline is None:
+            baseline = (per_page_ms, results)
+        same = "✓ aynı" if results == baseline[1] else "✗ FARKLI"
+        speedup = baseline[0] / per_page_ms
+        print(f"{name:12s} {per_page_ms:10.2f} {speedup:9.1f}x {peak_kb:11.0f} KB  {same}")
@@ -0,0 +1,244 @@
+"""
+Tek dosyalık şarkı sözü corpus'u
+
+Her şarkı için ayrı .txt yazmak yerine sözler tek bir veri dosyasına
+uzunluk önekli kayıtlar olarak eklenir, yanındaki .idx dosyası şarkı id'sinden
+kaydın konumuna giden indeksi tutar. Okuma tarafı dosyayı memory-map eder;
+böylece binlerce küçük dosya açmak yerine tek bir dosyadan id ile rastgele
+erişim ya da sıralı tarama yapılır.
+
+Veri dosyası düzeni:
+    MAGIC | kayıt | kayıt | ...
+    kayıt = <uint32 meta_len><uint32 text_len><meta JSON><UTF-8 metin>
+
+Aynı id ile tekrar eklenen kayıt eskisinin yerini alır (son yazılan geçerlidir).
+
+Mevcut klasör düzeninden geçiş:
+    python corpus_store.py migrate song sagopa.corpus
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b'KCORPUS1'
+RECORD_HEADER = struct.Struct('<II')
+LYRICS_SUFFIX = '_lyrics_default.txt'
+
+
+def index_path(path):
+    return path + '.idx'
+
+
+def _scan_records(buffer, start):
+    """start konumundan itibaren tam kayıtları (offset, meta_len, text_len) olarak verir"""
+    offset = start
+    size = len(buffer)
+    while offset + RECORD_HEADER.size <= size:
+        meta_len, text_len = RECORD_HEADER.unpack_from(buffer, offset)
+        end = offset + RECORD_HEADER.size + meta_len + text_len
+        if end > size:
+            break
+        yield offset, meta_len, text_len
+        offset = end
+
+
+def _load_index(path, buffer):
+    """İndeksi okur; veri dosyasında indekse yazılamamış kayıt varsa tarayarak ekler
+
+    Returns:
+        (entries, end, missing): id -> (offset, meta_len, text_len) sözlüğü, son tam
+        kaydın bitişi ve indekse yazılmamış kayıtlar
+    """
+    entries = {}
+    end = len(MAGIC)
+    if os.path.exists(index_path(path)):
+        with open(index_path(path), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    # Yarım yazılmış son satır
+                    break
+                entries[item['id']] = (item['offset'], item['meta_len'], item['text_len'])
+                end = max(end, item['offset'] + RECORD_HEADER.size + item['meta_len'] + item['text_len'])
+
+    missing = []
+    for offset, meta_len, text_len in _scan_records(buffer, end):
+        meta_start = offset + RECORD_HEADER.size
+        meta = json.loads(bytes(buffer[meta_start:meta_start + meta_len]))
+        entries[meta['id']] = (offset, meta_len, text_len)
+        missing.append((meta['id'], offset, meta_len, text_len))
+        end = offset + RECORD_HEADER.size + meta_len + text_len
+
+    return entries, end, missing
+
+
+class CorpusWriter:
+    """Corpus dosyasına kayıt ekler (scraper tarafı)"""
+
+    def __init__(self, path):
+        self.path = path
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if is_new:
+            with open(path, 'wb') as f:
+                f.write(MAGIC)
+            self.entries, end, missing = {}, len(MAGIC), []
+        else:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if buffer[:len(MAGIC)] != MAGIC:
+                    raise ValueError(f"{path} bir corpus dosyası değil")
+                self.entries, end, missing = _load_index(path, buffer)
+
+        # Yarım kalmış son kaydı at, indekste eksik kalanları tamamla
+        self.data_file = open(path, 'r+b')
+        self.data_file.truncate(end)
+        self.data_file.seek(end)
+        # Veri dosyası yeniden oluşturulduysa eski indeksteki kayıtlar artık geçersizdir
+        self.index_file = open(index_path(path), 'w' if is_new else 'a', encoding='utf-8')
+        for song_id, offset, meta_len, text_len in missing:
+            self._write_index(song_id, offset, meta_len, text_len)
+        self.index_file.flush()
+
+    def __contains__(self, song_id):
+        return song_id in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def append(self, song_id, text, **meta):
+        """Şarkıyı ekler; aynı id varsa yeni kayıt eskisinin yerini alır"""
+        meta_bytes = json.dumps({'id': song_id, **meta}, ensure_ascii=False).encode('utf-8')
+        text_bytes = text.encode('utf-8')
+        offset = self.data_file.tell()
+        self.data_file.write(RECORD_HEADER.pack(len(meta_bytes), len(text_bytes)) + meta_bytes + text_bytes)
+        self.data_file.flush()
+        self._write_index(song_id, offset, len(meta_bytes), len(text_bytes))
+        self.index_file.flush()
+        self.entries[song_id] = (offset, len(meta_bytes), len(text_bytes))
+
+    def _write_index(self, song_id, offset, meta_len, text_len):
+        self.index_file.write(json.dumps(
+            {'id': song_id, 'offset': offset, 'meta_len': meta_len, 'text_len': text_len},
+            ensure_ascii=False
+        ) + '\n')
+
+    def close(self):
+        self.data_file.close()
+        self.index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CorpusReader:
+    """Memory-map edilmiş corpus üzerinde id ile erişim ve sıralı tarama (n-gram tarafı)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.buffer[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} bir corpus dosyası değil")
+        self.entries, _, _ = _load_index(path, self.buffer)
+        # Dosya sırasıyla tarama diskte ileri doğru okur
+        self.order = sorted(self.entries, key=lambda song_id: self.entries[song_id][0])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, song_id):
+        return song_id in self.entries
+
+    def ids(self):
+        return list(self.order)
+
+    def get_meta(self, song_id):
+        offset, meta_len, _ = self.entries[song_id]
+        start = offset + RECORD_HEADER.size
+        return json.loads(self.buffer[start:start + meta_len])
+
+    def __getitem__(self, song_id):
+        offset, meta_len, text_len = self.entries[song_id]
+        start = offset + RECORD_HEADER.size + meta_len
+        return self.buffer[start:start + text_len].decode('utf-8')
+
+    def iter_texts(self):
+        """(song_id, metin) çiftlerini dosya sırasıyla verir"""
+        for song_id in self.order:
+            yield song_id, self[song_id]
+
+    def close(self):
+        self.buffer.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def song_id_from_filename(filename):
+    """'<ad>_lyrics_default.txt' -> '<ad>'"""
+    if filename.endswith(LYRICS_SUFFIX):
+        return filename[:-len(LYRICS_SUFFIX)]
+    return os.path.splitext(filename)[0]
+
+
+def migrate_folder(folder_path, corpus_path):
+    """Şarkı başına .txt dosyalarını corpus'a taşır (alt klasörler sanatçı sayılır)"""
+    migrated = 0
+    with CorpusWriter(corpus_path) as writer:
+        for root, _, files in os.walk(folder_path):
+            artist = os.path.relpath(root, folder_path).replace(os.sep, '/')
+            for filename in sorted(files):
+                if not filename.endswith('.txt'):
+                    continue
+                with open(os.path.join(root, filename), 'r', encoding='utf-8') as f:
+                    text = f.read()
+                song_id = song_id_from_filename(filename)
+                meta = {'source_file': filename}
+                if artist != '.':
+                    song_id = f"{artist}/{song_id}"
+                    meta['artist'] = artist
+                writer.append(song_id, text, **meta)
+                migrated += 1
+    return migrated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Şarkı sözü corpus araçları")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    migrate = subparsers.add_parser('migrate', help="Klasördeki .txt dosyalarını corpus'a taşı")
+    migrate.add_argument('folder')
+    migrate.add_argument('corpus')
+
+    info = subparsers.add_parser('info', help="Corpus özetini göster")
+    info.add_argument('corpus')
+
+    show = subparsers.add_parser('show', help="Tek bir şarkıyı yazdır")
+    show.add_argument('corpus')
+    show.add_argument('song_id')
+
+    args = parser.parse_args()
+
+    if args.command == 'migrate':
+        count = migrate_folder(args.folder, args.corpus)
+        print(f"✓ {count} şarkı {args.corpus} dosyasına taşındı")
+    elif args.command == 'info':
+        with CorpusReader(args.corpus) as reader:
+            size_kb = os.path.getsize(args.corpus) / 1024
+            print(f"📚 {len(reader)} şarkı, {size_kb:.0f} KB")
+            for song_id in reader.ids()[:10]:
+                print(f"   - {song_id}")
+    elif args.command == 'show':
+        with CorpusReader(args.corpus) as reader:
+            print(reader[args.song_id])
@@ -0,0 +1,64 @@
+"""
+Kaydedilmiş HTML sayfalarını sunan yerel HTTP sunucusu
+
+Scraper'ı gerçek siteye gitmeden denemek için kullanılır:
+
+    python fixture_server.py fixtures --port 8000 --latency 0.2
+
+Ardından liste sayfası http://127.0.0.1:8000/<dosya>.html adresinden çekilebilir.
+"""
+
+import argparse
+import functools
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Her isteği gecikmeyle sunar ve istek zamanlarını kaydeder"""
+
+    latency = 0.0
+    request_log = []
+    log_lock = threading.Lock()
+
+    def do_GET(self):
+        with self.log_lock:
+            self.request_log.append((time.monotonic(), self.path))
+        if self.latency:
+            time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(directory, host='127.0.0.1', port=0, latency=0.0):
+    """Sunucuyu arka planda başlatır, (server, base_url) döner"""
+    handler = type('BoundFixtureHandler', (FixtureHandler,), {
+        'latency': latency,
+        'request_log': [],
+    })
+    server = ThreadingHTTPServer((host, port), functools.partial(handler, directory=directory))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://{host}:{server.server_address[1]}/"
+    return server, base_url
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fixture HTML sayfalarını yerel olarak sunar")
+    parser.add_argument('directory', help="HTML dosyalarının bulunduğu klasör")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help="İstek başına yapay gecikme (sn)")
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.directory, args.host, args.port, args.latency)
+    print(f"✓ Fixture sunucusu çalışıyor: {base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\n✓ Sunucu durduruldu")
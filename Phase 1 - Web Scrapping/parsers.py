@@ -0,0 +1,304 @@
+"""
+Scraper için değiştirilebilir HTML parser backend'leri
+
+Her backend liste sayfasından şarkıları (`#listAlbum a`) ve şarkı sayfasından
+sözleri (`br + div`) aynı sonuçla çıkarır:
+
+- html.parser: Tam BeautifulSoup ağacı (varsayılan, eski davranış)
+- lxml:        lxml.html ağacı + XPath (C ile yazılmış, daha hızlı)
+- stream:      Ağaç kurmayan artımlı extractor; hedef element kapanınca durur
+"""
+
+import codecs
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+DEFAULT_PARSER = 'html.parser'
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Kapanış etiketi olmayan HTML elementleri
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+SKIPPED_ELEMENTS = {'script', 'style'}
+
+
+def _join_lyrics(pieces):
+    """get_text(strip=True, separator='\\n') ile aynı birleştirme"""
+    lines = [piece.strip() for piece in pieces]
+    return '\n'.join(line for line in lines if line)
+
+
+def _iter_chunks(content, encoding):
+    """bytes, str ya da chunk iterable'ını str chunk'larına çevirir"""
+    if isinstance(content, (bytes, str)):
+        data = content
+        chunks = (data[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(data), STREAM_CHUNK_SIZE))
+    else:
+        chunks = content
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for chunk in chunks:
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+class SoupBackend:
+    """Tam BeautifulSoup ağacı kuran backend"""
+
+    name = 'html.parser'
+    streaming = False
+
+    def __init__(self, features='html.parser'):
+        self.features = features
+
+    def parse_song_list(self, content, url):
+        soup = BeautifulSoup(content, self.features)
+        songs = []
+        for link in soup.select('#listAlbum a'):
+            song_name = link.text.strip()
+            song_url = link.get('href')
+            if song_name and song_url:
+                songs.append({'name': song_name, 'url': urljoin(url, song_url)})
+        return songs
+
+    def parse_lyrics(self, content):
+        soup = BeautifulSoup(content, self.features)
+        lyrics_div = soup.select_one('br + div')
+        if not lyrics_div:
+            return None
+        for tag in lyrics_div(list(SKIPPED_ELEMENTS)):
+            tag.decompose()
+        return lyrics_div.get_text(strip=True, separator='\n')
+
+
+class LxmlBackend:
+    """lxml.html ağacı üzerinde XPath ile çalışan backend"""
+
+    name = 'lxml'
+    streaming = False
+
+    def __init__(self, encoding='utf-8'):
+        if lxml is None:
+            raise ImportError("lxml backend'i için 'pip install lxml' gerekli")
+        # Meta charset olmayan sayfalarda lxml latin-1 varsayar
+        self.html_parser = lxml.html.HTMLParser(encoding=encoding)
+
+    def _parse(self, content):
+        if isinstance(content, str):
+            return lxml.html.document_fromstring(content)
+        return lxml.html.document_fromstring(content, parser=self.html_parser)
+
+    def parse_song_list(self, content, url):
+        root = self._parse(content)
+        songs = []
+        for link in root.xpath('//*[@id="listAlbum"]//a'):
+            song_name = ''.join(self._iter_text(link)).strip()
+            song_url = link.get('href')
+            if song_name and song_url:
+                songs.append({'name': song_name, 'url': urljoin(url, song_url)})
+        return songs
+
+    def parse_lyrics(self, content):
+        root = self._parse(content)
+        matches = root.xpath('//br/following-sibling::*[1][self::div]')
+        if not matches:
+            return None
+        return _join_lyrics(self._iter_text(matches[0]))
+
+    def _iter_text(self, element):
+        """Script/style ve yorumları atlayarak metin parçalarını sırayla verir"""
+        if element.text:
+            yield element.text
+        for child in element:
+            if isinstance(child.tag, str) and child.tag not in SKIPPED_ELEMENTS:
+                yield from self._iter_text(child)
+            if child.tail:
+                yield child.tail
+
+
+class _StreamExtractor(HTMLParser):
+    """Eleman yığınını takip eden, ağaç kurmayan temel extractor"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # Her çerçeve: [etiket, son çocuk elementin etiketi]
+        self.stack = [[None, None]]
+        self.pending = []
+        self.done = False
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_data(self, data):
+        self.pending.append(data)
+
+    def handle_comment(self, data):
+        self.flush_text()
+
+    def flush_text(self):
+        if self.pending:
+            text = ''.join(self.pending)
+            self.pending = []
+            self.on_text(text)
+
+    def open_element(self, tag):
+        """Yeni elementi yığına ekler, önceki kardeş elementin etiketini döner"""
+        self.flush_text()
+        parent = self.stack[-1]
+        previous_sibling, parent[1] = parent[1], tag
+        if tag not in VOID_ELEMENTS:
+            self.stack.append([tag, None])
+        return previous_sibling
+
+    def close_element(self, tag):
+        """Eşleşen açık elemente kadar yığını boşaltır, kapanan derinlikleri döner"""
+        self.flush_text()
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth][0] == tag:
+                closed = range(depth, len(self.stack))
+                del self.stack[depth:]
+                return closed
+        return range(0)
+
+    def on_text(self, text):
+        pass
+
+    def run(self, content, encoding='utf-8'):
+        for chunk in _iter_chunks(content, encoding):
+            self.feed(chunk)
+            if self.done:
+                break
+        else:
+            self.close()
+            self.flush_text()
+        return self
+
+
+class _LyricsExtractor(_StreamExtractor):
+    """İlk `br + div` elementinin metnini toplar, div kapanınca durur"""
+
+    def __init__(self):
+        super().__init__()
+        self.capture_depth = None
+        self.skip_depth = None
+        self.pieces = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        previous_sibling = self.open_element(tag)
+        if self.capture_depth is None:
+            if tag == 'div' and previous_sibling == 'br':
+                self.capture_depth = len(self.stack) - 1
+        elif tag in SKIPPED_ELEMENTS and self.skip_depth is None:
+            self.skip_depth = len(self.stack) - 1
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        closed = self.close_element(tag)
+        if self.skip_depth in closed:
+            self.skip_depth = None
+        if self.capture_depth in closed:
+            self.done = True
+
+    def on_text(self, text):
+        if self.capture_depth is not None and self.skip_depth is None and not self.done:
+            self.pieces.append(text)
+
+
+class _SongListExtractor(_StreamExtractor):
+    """`#listAlbum` içindeki linkleri toplar, liste kapanınca durur"""
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        self.album_depth = None
+        self.link_depth = None
+        self.link_href = None
+        self.link_text = []
+        self.songs = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        self.open_element(tag)
+        depth = len(self.stack) - 1
+        if self.album_depth is None:
+            if dict(attrs).get('id') == 'listAlbum' and tag not in VOID_ELEMENTS:
+                self.album_depth = depth
+        elif tag == 'a' and self.link_depth is None:
+            self.link_depth = depth
+            self.link_href = dict(attrs).get('href')
+            self.link_text = []
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        closed = self.close_element(tag)
+        if self.link_depth in closed:
+            song_name = ''.join(self.link_text).strip()
+            if song_name and self.link_href:
+                self.songs.append({'name': song_name, 'url': urljoin(self.url, self.link_href)})
+            self.link_depth = None
+        if self.album_depth in closed:
+            self.done = True
+
+    def on_text(self, text):
+        if self.link_depth is not None:
+            self.link_text.append(text)
+
+
+class StreamingBackend:
+    """Ağaç kurmadan, hedef element kapanınca okumayı bırakan backend
+
+    İçerik olarak bytes/str ya da `response.iter_content()` gibi bir chunk
+    iterable'ı kabul eder; böylece sayfanın geri kalanı indirilmeden durulabilir.
+    """
+
+    name = 'stream'
+    streaming = True
+
+    def __init__(self, encoding='utf-8'):
+        self.encoding = encoding
+
+    def parse_song_list(self, content, url):
+        return _SongListExtractor(url).run(content, self.encoding).songs
+
+    def parse_lyrics(self, content):
+        extractor = _LyricsExtractor().run(content, self.encoding)
+        if extractor.capture_depth is None:
+            return None
+        return _join_lyrics(extractor.pieces)
+
+
+PARSER_BACKENDS = {
+    'html.parser': SoupBackend,
+    'lxml': LxmlBackend,
+    'stream': StreamingBackend,
+}
+
+_backend_cache = {}
+
+
+def get_parser(name=DEFAULT_PARSER):
+    """İsimle parser backend'i döner (backend nesneleri paylaşılır)"""
+    if not isinstance(name, str):
+        return name
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Bilinmeyen parser: {name} (seçenekler: {', '.join(PARSER_BACKENDS)})")
+    if name not in _backend_cache:
+        _backend_cache[name] = PARSER_BACKENDS[name]()
+    return _backend_cache[name]
@@ -0,0 +1,132 @@
+"""
+Scraper manifest'i - kaldığı yerden devam eden ve artımlı çalışan scraping için
+
+Her şarkı URL'i için içerik hash'i, ETag/Last-Modified ve çıktı dosyası SQLite'ta
+tutulur. Böylece tekrar çalıştırmada biten şarkılar atlanır, değişmiş olabilecekler
+koşullu istekle (If-None-Match / If-Modified-Since) kontrol edilir.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+DEFAULT_MANIFEST = 'scrape_manifest.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS songs (
+    url           TEXT PRIMARY KEY,
+    name          TEXT NOT NULL,
+    list_url      TEXT,
+    content_hash  TEXT,
+    etag          TEXT,
+    last_modified TEXT,
+    output_file   TEXT,
+    fetched_at    REAL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url           TEXT PRIMARY KEY,
+    content_hash  TEXT,
+    etag          TEXT,
+    last_modified TEXT,
+    fetched_at    REAL
+);
+"""
+
+
+def content_hash(data):
+    """Metin ya da byte içeriğin SHA-256 hash'i"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def conditional_headers(entry):
+    """Manifest kaydından koşullu istek header'larını üretir"""
+    request_headers = {}
+    if entry and entry.get('etag'):
+        request_headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        request_headers['If-Modified-Since'] = entry['last_modified']
+    return request_headers
+
+
+class ScrapeManifest:
+    """Şarkı ve liste sayfası durumlarını SQLite'ta saklar"""
+
+    def __init__(self, path=DEFAULT_MANIFEST):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- Şarkılar ----------
+
+    def get_song(self, url):
+        row = self.conn.execute("SELECT * FROM songs WHERE url = ?", (url,)).fetchone()
+        return dict(row) if row else None
+
+    def is_finished(self, url, output_dir='.'):
+        """Şarkı daha önce indirilmiş ve çıktı dosyası hâlâ duruyor mu"""
+        entry = self.get_song(url)
+        return bool(
+            entry and entry['output_file']
+            and os.path.exists(os.path.join(output_dir, entry['output_file']))
+        )
+
+    def record_song(self, url, name, lyrics_hash=None, etag=None, last_modified=None,
+                    output_file=None, list_url=None):
+        """Şarkı kaydını ekler/günceller ve hemen diske yazar"""
+        self.conn.execute(
+            """
+            INSERT INTO songs (url, name, list_url, content_hash, etag, last_modified, output_file, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                name = excluded.name,
+                list_url = COALESCE(excluded.list_url, songs.list_url),
+                content_hash = COALESCE(excluded.content_hash, songs.content_hash),
+                etag = COALESCE(excluded.etag, songs.etag),
+                last_modified = COALESCE(excluded.last_modified, songs.last_modified),
+                output_file = COALESCE(excluded.output_file, songs.output_file),
+                fetched_at = excluded.fetched_at
+            """,
+            (url, name, list_url, lyrics_hash, etag, last_modified, output_file, time.time())
+        )
+        self.conn.commit()
+
+    def songs_for_list(self, list_url):
+        """Bir liste sayfasından daha önce bulunan şarkılar"""
+        rows = self.conn.execute(
+            "SELECT name, url FROM songs WHERE list_url = ? ORDER BY rowid", (list_url,)
+        ).fetchall()
+        return [{'name': row['name'], 'url': row['url']} for row in rows]
+
+    # ---------- Liste sayfaları ----------
+
+    def get_page(self, url):
+        row = self.conn.execute("SELECT * FROM pages WHERE url = ?", (url,)).fetchone()
+        return dict(row) if row else None
+
+    def record_page(self, url, page_hash, etag=None, last_modified=None):
+        self.conn.execute(
+            """
+            INSERT INTO pages (url, content_hash, etag, last_modified, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                fetched_at = excluded.fetched_at
+            """,
+            (url, page_hash, etag, last_modified, time.time())
+        )
+        self.conn.commit()
@@ -0,0 +1,141 @@
+"""
+adapters.py testleri: kaydedilmiş HTML sayfaları (fixtures/) üzerinde her adapter
+
+    python -m pytest "Phase 1 - Web Scrapping/test_adapters.py" -q
+"""
+
+import os
+
+import pytest
+
+from adapters import AZLyricsAdapter, SelectorAdapter, SiteAdapter, get_adapter
+from parsers import PARSER_BACKENDS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+AZLYRICS_LIST_URL = 'https://www.azlyrics.com/s/sagopakajmer.html'
+SELECTOR_LIST_URL = 'https://sarkidefteri.example/sanatci/sagopa-kajmer'
+
+AZLYRICS_SONGS = [
+    {'name': 'Yalnız Gece', 'url': 'https://www.azlyrics.com/lyrics/sagopakajmer/yalnizgece.html'},
+    {'name': 'Söz & Zaman', 'url': 'https://www.azlyrics.com/lyrics/sagopakajmer/sozzaman.html'},
+    {'name': 'Kalemim Ağır', 'url': 'https://www.azlyrics.com/lyrics/sagopakajmer/kalemimagir.html'},
+    {'name': 'İstanbul 4:00', 'url': 'https://www.azlyrics.com/lyrics/sagopakajmer/istanbul400.html'},
+    {'name': 'Ümit (feat. Kolera)', 'url': 'https://www.azlyrics.com/lyrics/sagopakajmer/umit.html?ref=list'},
+    {'name': 'Şehir', 'url': 'https://www.azlyrics.com/lyrics/sagopakajmer/sehir.html'},
+]
+
+AZLYRICS_LYRICS = {
+    'lyrics_01.html': (
+        "Gece çöker şehre, sokak lambası titrek\n"
+        "Cebimde eski bir not, kağıdı yırtık ve çentik\n"
+        "Söz verdik zamana, zaman bize gülmedi\n"
+        "Kalemim ağır, mürekkep hâlâ kurumadı\n"
+        "[Nakarat:]\n"
+        "Yalnız gece, yalnız ben, bir de bu ses\n"
+        "Dinle beni, dinle \"dostum\", kimse değil kimse\n"
+        "Işık sönük, ağaç çıplak, gönül yorgun\n"
+        "Ama yine de yürürüm, yol benim yolum"
+    ),
+    'lyrics_02.html': (
+        "Söz & zaman, ikisi de uçup gider\n"
+        "Ağaç dalında kuş, kuşun dilinde keder\n"
+        "[Sagopa Kajmer:]\n"
+        "Şimdi sus ve dinle, bu hikâye senin de\n"
+        "İçimde bir çığlık, 'yarın' dediğin günde\n"
+        "[Nakarat x2]\n"
+        "Yağmur yağar, ıslanır ruhum, düşlerim\n"
+        "Öğrendim ki ölüm değil, asıl unutmak derin"
+    ),
+    'lyrics_03.html': (
+        "[Intro:]\n"
+        "İstanbul, saat dört, Üsküdar'da sessizlik\n"
+        "Çayım soğudu, ŞEHİR uyudu, ben hâlâ dik\n"
+        "Işıklar <söner>, gölgeler uzar\n"
+        "Ümit bir kıvılcım, yanar ama az"
+    ),
+}
+
+
+def read_fixture(*parts):
+    with open(os.path.join(FIXTURES, *parts), 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture(params=list(PARSER_BACKENDS))
+def azlyrics(request):
+    try:
+        return AZLyricsAdapter(request.param)
+    except ImportError as e:
+        pytest.skip(str(e))
+
+
+@pytest.fixture
+def selector_adapter():
+    return SelectorAdapter('sarkidefteri', 'ul.song-list li a', 'div.lyrics-body',
+                           artist_url_template='https://sarkidefteri.example/sanatci/{artist}')
+
+
+@pytest.mark.parametrize('href, expected', [
+    ('../lyrics/a/b.html', 'https://www.azlyrics.com/lyrics/a/b.html'),
+    ('/lyrics/a/b.html#comments', 'https://www.azlyrics.com/lyrics/a/b.html'),
+    ('HTTPS://WWW.AZLyrics.COM/lyrics/a/B.html?ref=x', 'https://www.azlyrics.com/lyrics/a/B.html?ref=x'),
+    ('//www.azlyrics.com/lyrics/a/b.html', 'https://www.azlyrics.com/lyrics/a/b.html'),
+])
+def test_normalize_url(href, expected):
+    assert SiteAdapter().normalize_url(href, AZLYRICS_LIST_URL) == expected
+
+
+@pytest.mark.parametrize('artist, expected', [
+    ('Sagopa Kajmer', 'https://www.azlyrics.com/s/sagopakajmer.html'),
+    ('50 Cent', 'https://www.azlyrics.com/19/50cent.html'),
+])
+def test_azlyrics_artist_url(artist, expected):
+    assert AZLyricsAdapter().artist_url(artist) == expected
+
+
+def test_azlyrics_song_list(azlyrics):
+    songs = azlyrics.parse_song_list(read_fixture('azlyrics', 'sagopakajmer.html'), AZLYRICS_LIST_URL)
+    assert songs == AZLYRICS_SONGS
+
+
+@pytest.mark.parametrize('filename', sorted(AZLYRICS_LYRICS))
+def test_azlyrics_lyrics(azlyrics, filename):
+    assert azlyrics.parse_lyrics(read_fixture('azlyrics', filename)) == AZLYRICS_LYRICS[filename]
+
+
+def test_azlyrics_lyrics_missing(azlyrics):
+    assert azlyrics.parse_lyrics(b'<html><body><div>no lyrics</div></body></html>') is None
+
+
+def test_selector_song_list(selector_adapter):
+    songs = selector_adapter.parse_song_list(read_fixture('selector', 'artist.html'), SELECTOR_LIST_URL)
+    assert songs == [
+        {'name': 'Yalnız Gece', 'url': 'https://sarkidefteri.example/sarki-sozu/sagopa-kajmer/yalniz-gece'},
+        {'name': 'Söz & Zaman', 'url': 'https://sarkidefteri.example/sanatci/sarki-sozu/sagopa-kajmer/soz-ve-zaman'},
+        {'name': 'İstanbul 4:00', 'url': 'https://sarkidefteri.example/sarki-sozu/sagopa-kajmer/istanbul-4'},
+    ]
+
+
+def test_selector_lyrics(selector_adapter):
+    assert selector_adapter.parse_lyrics(read_fixture('selector', 'song.html')) == (
+        "Gece çöker şehre, sokak lambası titrek\n"
+        "Cebimde eski bir not, kağıdı yırtık ve çentik\n"
+        "Yalnız gece, yalnız ben, bir de bu ses\n"
+        "Dinle beni, dinle \"dostum\""
+    )
+    assert selector_adapter.parse_lyrics(read_fixture('selector', 'artist.html')) is None
+
+
+def test_selector_artist_url(selector_adapter):
+    assert selector_adapter.artist_url('sagopa-kajmer') == SELECTOR_LIST_URL
+    with pytest.raises(ValueError):
+        SelectorAdapter('x', 'a', 'div').artist_url('sagopa-kajmer')
+
+
+def test_get_adapter():
+    assert isinstance(get_adapter('azlyrics'), AZLyricsAdapter)
+    adapter = get_adapter('sarkidefteri', list_selector='ul a', lyrics_selector='div.lyrics')
+    assert isinstance(adapter, SelectorAdapter) and adapter.name == 'sarkidefteri'
+    assert get_adapter(adapter) is adapter
+    with pytest.raises(ValueError):
+        get_adapter('bilinmeyen')
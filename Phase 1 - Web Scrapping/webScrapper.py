@@ -1,38 +1,140 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 import csv
+import os
+import threading
 import time
 import re
 
+from adapters import SITE_ADAPTERS, get_adapter
+from corpus_store import CorpusWriter
+from parsers import DEFAULT_PARSER, get_parser
+from scrape_manifest import DEFAULT_MANIFEST, ScrapeManifest, conditional_headers, content_hash
+
 # User-Agent ekleyelim (bazı siteler bunu kontrol eder)
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
 
-def get_song_list(url):
-    """Şarkı listesini ve URL'lerini çeker"""
+# Nezaket bütçesi: host başına 2 saniyede 1 istek
+DEFAULT_RATE = 0.5
+DEFAULT_BURST = 1
+DEFAULT_WORKERS = 4
+REQUEST_TIMEOUT = 30
+
+class TokenBucket:
+    """Thread-safe token bucket: saniyede `rate` token, en fazla `capacity` birikir"""
+    
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self):
+        """Token'ı hemen rezerve eder, sırası gelene kadar beklenecek süreyi döner"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Token borca düşebilir; her çağıran kendi sırasını bekler
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0
+    
+    def acquire(self):
+        """Sırası gelene kadar bekler"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+class HostRateLimiter:
+    """Her host için ayrı bir token bucket tutar
+    
+    global_rate verilirse tüm host'lar ayrıca ortak bir bütçeyi paylaşır.
+    """
+    
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, global_rate=None):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.global_bucket = TokenBucket(global_rate, burst) if global_rate else None
+        self.lock = threading.Lock()
+    
+    def acquire(self, url):
+        """URL'in host'u için istek hakkı bekler"""
+        host = urlparse(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        wait = bucket.reserve()
+        if self.global_bucket:
+            wait = max(wait, self.global_bucket.reserve())
+        if wait > 0:
+            time.sleep(wait)
+
+# Limiter verilmeyen çağrılar da siteye yük bindirmesin
+default_limiter = HostRateLimiter()
+
+def create_session(pool_size=DEFAULT_WORKERS):
+    """Bağlantı havuzlu, keep-alive kullanan ortak HTTP oturumu oluşturur"""
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def fetch(url, session=None, limiter=None, extra_headers=None, stream=False):
+    """Rate limit'e uyarak sayfayı indirir (304 yanıtları hata sayılmaz)"""
+    (limiter or default_limiter).acquire(url)
+    http = session or requests
+    request_headers = {**headers, **(extra_headers or {})}
+    response = http.get(url, headers=request_headers, timeout=REQUEST_TIMEOUT, stream=stream)
+    response.raise_for_status()
+    return response
+
+def parse_song_list(content, url, parser=DEFAULT_PARSER):
+    """Liste sayfası HTML'inden şarkı adlarını ve URL'lerini çıkarır"""
+    return get_parser(parser).parse_song_list(content, url)
+
+def read_lyrics(response, backend):
+    """Yanıttan sözleri çıkarır; streaming backend'de gövde parça parça okunur"""
+    if backend.streaming:
+        # Sözler bulununca geri kalan gövde indirilmeden bağlantı bırakılır
+        with response:
+            return backend.parse_lyrics(response.iter_content(chunk_size=16 * 1024))
+    return backend.parse_lyrics(response.content)
+
+def get_song_list(url, session=None, limiter=None, manifest=None, parser=DEFAULT_PARSER):
+    """Şarkı listesini ve URL'lerini çeker
+    
+    Manifest verilirse liste sayfası koşullu istenir; sayfa değişmemişse (304)
+    şarkılar manifest'ten döner.
+    """
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        page = manifest.get_page(url) if manifest else None
+        response = fetch(url, session, limiter, conditional_headers(page))
         
-        songs = []
-        # #listAlbum içindeki tüm linkleri bul
-        list_album = soup.select('#listAlbum a')
+        if response.status_code == 304 and manifest:
+            songs = manifest.songs_for_list(url)
+            print(f"✓ Liste sayfası değişmemiş, {len(songs)} şarkı manifest'ten alındı")
+            return songs
         
-        for link in list_album:
-            song_name = link.text.strip()
-            song_url = link.get('href')
-            
-            # Relative URL ise tam URL'e çevir
-            if song_url and not song_url.startswith('http'):
-                song_url = 'https://www.azlyrics.com' + song_url
-            
-            if song_name and song_url:
-                songs.append({
-                    'name': song_name,
-                    'url': song_url
-                })
+        songs = parse_song_list(response.content, url, parser)
+        
+        if manifest:
+            for song in songs:
+                entry = manifest.get_song(song['url'])
+                if entry is None or entry['list_url'] != url:
+                    manifest.record_song(song['url'], song['name'], list_url=url)
+            manifest.record_page(
+                url, content_hash(response.content),
+                response.headers.get('ETag'), response.headers.get('Last-Modified')
+            )
         
         print(f"✓ {len(songs)} şarkı bulundu")
         return songs
@@ -52,32 +154,53 @@ def save_to_csv(songs, filename='sagopaSongs.csv'):
     except Exception as e:
         print(f"✗ CSV kaydetme hatası: {e}")
 
-def get_lyrics(song_url):
+def parse_lyrics(content, parser=DEFAULT_PARSER):
+    """Şarkı sayfası HTML'inden sözleri çıkarır, bulunamazsa None döner"""
+    return get_parser(parser).parse_lyrics(content)
+
+def get_lyrics(song_url, session=None, limiter=None, parser=DEFAULT_PARSER):
     """Şarkı sözlerini çeker"""
     try:
-        time.sleep(2)  # Rate limiting - siteye yük bindirmemek için
-        response = requests.get(song_url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Rate limiting limiter üzerinden - siteye yük bindirmemek için
+        backend = get_parser(parser)
+        response = fetch(song_url, session, limiter, stream=backend.streaming)
+        lyrics = read_lyrics(response, backend)
         
-        # Belirtilen selector'ı dene
-        lyrics_div = soup.select_one('br + div')
-        
-        if lyrics_div:
-            # Script ve diğer istenmeyen etiketleri temizle
-            for tag in lyrics_div(['script', 'style']):
-                tag.decompose()
-            
-            lyrics = lyrics_div.get_text(strip=True, separator='\n')
-            return lyrics
-        else:
+        if not lyrics:
             print("  ⚠ Şarkı sözleri bulunamadı")
-            return None
+        return lyrics
             
     except Exception as e:
         print(f"  ✗ Hata: {e}")
         return None
 
+def fetch_song(song_url, session=None, limiter=None, entry=None, parser=DEFAULT_PARSER):
+    """Şarkıyı manifest kaydına göre koşullu çeker
+    
+    Returns:
+        dict: status ('modified', 'not_modified', 'missing', 'error'), lyrics,
+        etag, last_modified
+    """
+    result = {'status': 'error', 'lyrics': None, 'etag': None, 'last_modified': None}
+    try:
+        backend = get_parser(parser)
+        response = fetch(song_url, session, limiter, conditional_headers(entry),
+                         stream=backend.streaming)
+        result['etag'] = response.headers.get('ETag')
+        result['last_modified'] = response.headers.get('Last-Modified')
+        
+        if response.status_code == 304:
+            response.close()
+            result['status'] = 'not_modified'
+            return result
+        
+        result['lyrics'] = read_lyrics(response, backend)
+        result['status'] = 'modified' if result['lyrics'] else 'missing'
+        
+    except Exception as e:
+        print(f"  ✗ Hata: {e}")
+    return result
+
 def sanitize_filename(name):
     """Dosya adı için güvenli string oluşturur"""
     # Özel karakterleri temizle
@@ -86,38 +209,202 @@ def sanitize_filename(name):
     name = name.replace(' ', '_')
     return name[:50]  # Maksimum 50 karakter
 
-def scrape_all_lyrics(csv_filename='sagopaSongs.csv'):
-    """CSV'deki tüm şarkıların sözlerini çeker"""
+def scrape_songs(jobs, session, limiter, manifest, max_workers=DEFAULT_WORKERS, refresh=False,
+                 corpus=None):
+    """Şarkı işlerini ortak oturum, limiter ve manifest ile paralel çeker
+    
+    Manifest'te bitmiş görünen şarkılar atlanır; böylece yarıda kalan bir çalışma
+    kaldığı yerden devam eder. refresh=True ise bitmiş şarkılar da koşullu istekle
+    (If-None-Match / If-Modified-Since) kontrol edilir ve yalnızca değişenler yazılır.
+    corpus (CorpusWriter) verilirse sözler .txt dosyaları yerine corpus'a eklenir.
+    
+    Args:
+        jobs: {'name', 'url', 'output_dir', 'parser'} sözlükleri
+        session: Paylaşılan HTTP oturumu
+        limiter: Paylaşılan rate limiter
+        manifest: ScrapeManifest
+        max_workers: Aynı anda çalışan en fazla istek sayısı
+        refresh: Bitmiş şarkıları da değişiklik için kontrol et
+        corpus: Sözlerin ekleneceği CorpusWriter (opsiyonel)
+    
+    Returns:
+        dict: saved, unchanged, failed sayıları
+    """
+    pending = []
+    skipped_count = 0
+    for job in jobs:
+        entry = manifest.get_song(job['url'])
+        if corpus is not None:
+            finished = bool(entry and entry['output_file'] in corpus)
+        else:
+            finished = manifest.is_finished(job['url'], job['output_dir'])
+        if finished:
+            if not refresh:
+                skipped_count += 1
+                continue
+        else:
+            # Çıktısı olmayan kayıt için koşullu istek gönderme
+            entry = None
+        pending.append((job, entry))
+    
+    print(f"\n{len(jobs)} şarkıdan {skipped_count} tanesi zaten indirilmiş, "
+          f"{len(pending)} şarkı için sözler çekiliyor ({max_workers} paralel istek)...\n")
+    
+    stats = {'saved': 0, 'unchanged': skipped_count, 'failed': 0}
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fetch_song, job['url'], session, limiter, entry, job['parser']): (job, entry)
+            for job, entry in pending
+        }
+        
+        for i, future in enumerate(as_completed(futures), 1):
+            job, entry = futures[future]
+            result = future.result()
+            
+            print(f"[{i}/{len(pending)}] {job['name']}")
+            
+            lyrics = result['lyrics']
+            lyrics_hash = content_hash(lyrics) if lyrics else None
+            
+            if result['status'] == 'not_modified' or (
+                    entry and lyrics_hash == entry['content_hash']):
+                # Sadece validator'ları güncelle
+                manifest.record_song(job['url'], job['name'], etag=result['etag'],
+                                     last_modified=result['last_modified'])
+                stats['unchanged'] += 1
+                print("  = Değişiklik yok")
+            elif lyrics:
+                if corpus is not None:
+                    filename = job.get('song_id') or sanitize_filename(job['name'])
+                    corpus.append(filename, lyrics, name=job['name'], url=job['url'],
+                                  artist=job.get('artist'))
+                else:
+                    filename = f"{sanitize_filename(job['name'])}_lyrics_default.txt"
+                    with open(os.path.join(job['output_dir'], filename), 'w', encoding='utf-8') as f:
+                        f.write(lyrics)
+                manifest.record_song(job['url'], job['name'], lyrics_hash,
+                                     result['etag'], result['last_modified'], filename)
+                stats['saved'] += 1
+                print(f"  ✓ {filename} kaydedildi")
+            else:
+                stats['failed'] += 1
+                if result['status'] == 'missing':
+                    print("  ⚠ Şarkı sözleri bulunamadı")
+    
+    return stats
+
+def scrape_all_lyrics(csv_filename='sagopaSongs.csv', max_workers=DEFAULT_WORKERS,
+                      rate=DEFAULT_RATE, burst=DEFAULT_BURST, output_dir='.',
+                      manifest_path=DEFAULT_MANIFEST, refresh=False, parser=DEFAULT_PARSER,
+                      corpus_path=None):
+    """CSV'deki tüm şarkıların sözlerini paralel olarak çeker
+    
+    Args:
+        csv_filename: Şarkı listesi CSV dosyası
+        max_workers: Aynı anda çalışan en fazla istek sayısı
+        rate: Host başına saniyedeki istek bütçesi
+        burst: Host başına biriktirilebilecek en fazla istek hakkı
+        output_dir: Söz dosyalarının yazılacağı klasör
+        manifest_path: Scraping durumunun tutulduğu SQLite dosyası
+        refresh: Bitmiş şarkıları da değişiklik için kontrol et
+        parser: HTML parser backend'i ('html.parser', 'lxml', 'stream') ya da site adapter'ı
+        corpus_path: Verilirse sözler .txt yerine bu corpus dosyasına eklenir
+    
+    Returns:
+        dict: saved, unchanged, failed sayıları; CSV okunamaz ya da işlem hata
+        verirse None
+    """
     try:
         with open(csv_filename, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             songs = list(reader)
         
-        print(f"\n{len(songs)} şarkı için sözler çekiliyor...\n")
+        jobs = [
+            {'name': song['name'], 'url': song['url'], 'output_dir': output_dir, 'parser': parser}
+            for song in songs
+        ]
         
-        for i, song in enumerate(songs, 1):
-            song_name = song['name']
-            song_url = song['url']
-            
-            print(f"[{i}/{len(songs)}] {song_name}")
-            
-            lyrics = get_lyrics(song_url)
-            
-            if lyrics:
-                filename = f"{sanitize_filename(song_name)}_lyrics_default.txt"
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(lyrics)
-                print(f"  ✓ {filename} kaydedildi")
-            
-            # Rate limiting
-            time.sleep(2)
+        print(f"\nHost başına {rate} istek/sn bütçesi kullanılıyor")
+        limiter = HostRateLimiter(rate, burst)
+        
+        corpus = CorpusWriter(corpus_path) if corpus_path else None
+        with ScrapeManifest(manifest_path) as manifest, create_session(max_workers) as session:
+            try:
+                stats = scrape_songs(jobs, session, limiter, manifest, max_workers, refresh, corpus)
+            finally:
+                if corpus is not None:
+                    corpus.close()
         
-        print("\n✓ Tüm işlemler tamamlandı!")
+        print(f"\n✓ Tüm işlemler tamamlandı! ({stats['saved']} kaydedildi, "
+              f"{stats['unchanged']} değişmedi, {stats['failed']} başarısız)")
+        return stats
         
     except FileNotFoundError:
         print(f"✗ {csv_filename} bulunamadı!")
     except Exception as e:
         print(f"✗ Hata: {e}")
+    return None
+
+def scrape_artists(artists, output_dir='songs', max_workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                   burst=DEFAULT_BURST, global_rate=None, manifest_path=DEFAULT_MANIFEST,
+                   refresh=False, parser=DEFAULT_PARSER, corpus_path=None):
+    """Birden çok sanatçıyı (ve siteyi) tek bir toplu işte çeker
+    
+    Tüm sanatçılar tek bağlantı havuzunu, host başına bütçeyi ve (verilirse)
+    global_rate ile ortak bir istek bütçesini paylaşır. Her sanatçının sözleri
+    output_dir/<sanatçı> klasörüne (ya da corpus_path verilirse '<sanatçı>/<şarkı>'
+    id'siyle tek corpus dosyasına), şarkı listesi aynı klasördeki songs.csv'ye yazılır.
+    
+    Args:
+        artists: {'name', 'site', 'url' (opsiyonel), 'options' (opsiyonel)} sözlükleri
+            ya da yalnızca sanatçı adları (azlyrics varsayılır)
+        global_rate: Tüm host'lar için toplam saniyedeki istek bütçesi
+    
+    Returns:
+        dict: sanatçı adı -> bulunan şarkı sayısı
+    """
+    limiter = HostRateLimiter(rate, burst, global_rate)
+    song_counts = {}
+    jobs = []
+    
+    with ScrapeManifest(manifest_path) as manifest, create_session(max_workers) as session:
+        for artist in artists:
+            if isinstance(artist, str):
+                artist = {'name': artist}
+            options = dict(artist.get('options', {}))
+            site = artist.get('site', 'azlyrics')
+            if site in SITE_ADAPTERS:
+                options.setdefault('parser', parser)
+            adapter = get_adapter(site, **options)
+            url = artist.get('url') or adapter.artist_url(artist['name'])
+            
+            print(f"\n🎤 {artist['name']} ({adapter.name}): {url}")
+            songs = get_song_list(url, session, limiter, manifest, adapter)
+            song_counts[artist['name']] = len(songs)
+            
+            artist_dir = os.path.join(output_dir, sanitize_filename(artist['name']))
+            os.makedirs(artist_dir, exist_ok=True)
+            if songs:
+                save_to_csv(songs, os.path.join(artist_dir, 'songs.csv'))
+            
+            artist_id = sanitize_filename(artist['name'])
+            jobs.extend(
+                {'name': song['name'], 'url': song['url'], 'output_dir': artist_dir, 'parser': adapter,
+                 'artist': artist['name'], 'song_id': f"{artist_id}/{sanitize_filename(song['name'])}"}
+                for song in songs
+            )
+        
+        corpus = CorpusWriter(corpus_path) if corpus_path else None
+        try:
+            stats = scrape_songs(jobs, session, limiter, manifest, max_workers, refresh, corpus)
+        finally:
+            if corpus is not None:
+                corpus.close()
+    
+    print(f"\n✓ {len(artists)} sanatçı tamamlandı! ({stats['saved']} kaydedildi, "
+          f"{stats['unchanged']} değişmedi, {stats['failed']} başarısız)")
+    return song_counts
 
 # ============== ANA PROGRAM ==============
 
@@ -133,8 +420,10 @@ if __name__ == "__main__":
     
     # 1. ADIM: Şarkı listesini al
     print("\n[1. ADIM] Şarkı listesi çekiliyor...")
-    base_url = "https://www.azlyrics.com/s/sagopakajmer.html"
-    songs = get_song_list(base_url)
+    base_url = get_adapter('azlyrics').artist_url('sagopakajmer')
+    session = create_session()
+    with ScrapeManifest() as manifest:
+        songs = get_song_list(base_url, session, manifest=manifest)
     
     if not songs:
         print("✗ Şarkı listesi alınamadı. Program sonlandırılıyor.")
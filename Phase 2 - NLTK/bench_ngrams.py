@@ -0,0 +1,144 @@
+"""
+N-gram sayım motorları için benchmark
+
+Sentetik, Zipf dağılımlı çok milyon token'lık bir corpus üzerinde Counter
+tabanlı yol ile NumPy/int id'li yolu süre ve tepe bellek açısından karşılaştırır,
+top N sonuçlarının birebir aynı olduğunu doğrular.
+
+    python bench_ngrams.py --tokens 3000000 --vocab 50000
+
+--scaling ile sentetik corpus bir corpus dosyasına yazılır ve süreç havuzlu
+çıkarım 1/2/4/8 işçiyle (exact ve topk birleştirme) ölçeklenme için ölçülür;
+ayrıca iki birleştirme modunun ana süreçteki tepe belleği karşılaştırılır.
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from ngram_engine import count_ngrams_numpy
+from ngram_parallel import _count_shard, count_ngrams_parallel, make_shards, merge_shards, merge_shards_topk
+
+_spec = importlib.util.spec_from_file_location(
+    'create_ngrams', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'createN-Grams.py')
+)
+create_ngrams = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(create_ngrams)
+
+SYLLABLES = ['ka', 'ra', 'gö', 'nül', 'ya', 'şam', 'za', 'man', 'ses', 'siz', 'ge', 'ce', 'yol', 'ır', 'mak']
+
+
+def synthetic_songs(total_tokens, vocab_size, song_length=300, seed=42):
+    """Zipf dağılımlı kelimelerden oluşan şarkı token listeleri üretir"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < vocab_size:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    words = sorted(words)
+    weights = [1 / (rank + 1) for rank in range(vocab_size)]
+
+    songs = []
+    produced = 0
+    while produced < total_tokens:
+        length = min(song_length, total_tokens - produced)
+        songs.append(rng.choices(words, weights=weights, k=length))
+        produced += length
+    return songs
+
+
+def count(engine, songs, top_n):
+    if engine == 'numpy':
+        counts = count_ngrams_numpy(iter(songs))
+    else:
+        counts = create_ngrams.count_ngrams(iter(songs))
+    return create_ngrams.build_results(counts[0], top_n, *counts[1:])
+
+
+def run(engine, songs, top_n):
+    """(saniye, tepe MB, sonuç) döner; süre tracemalloc kapalıyken ölçülür"""
+    start = time.perf_counter()
+    results = count(engine, songs, top_n)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    count(engine, songs, top_n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, results
+
+
+def run_scaling(songs, top_n, worker_counts=(1, 2, 4, 8)):
+    """Sentetik şarkıları corpus dosyasına yazar, işçi sayısına göre süreleri ölçer"""
+    from corpus_store import CorpusWriter
+
+    with tempfile.TemporaryDirectory(prefix='ngram_bench_') as tmp:
+        corpus_path = os.path.join(tmp, 'bench.corpus')
+        with CorpusWriter(corpus_path) as writer:
+            for i, tokens in enumerate(songs):
+                writer.append(f"song{i:06d}", ' '.join(tokens))
+
+        start = time.perf_counter()
+        counts = create_ngrams.count_ngrams(create_ngrams.iter_song_tokens(corpus_path))
+        baseline_time = time.perf_counter() - start
+        baseline = create_ngrams.build_results(counts[0], top_n, *counts[1:])
+
+        print(f"{'İşçi':>5s} {'birleştirme':>12s} {'süre (sn)':>10s} {'hızlanma':>10s}  sonuç")
+        print("-" * 55)
+        print(f"{1:5d} {'tek süreç':>12s} {baseline_time:10.2f} {1.0:9.1f}x  referans")
+        for workers in worker_counts:
+            for merge in ('exact', 'topk'):
+                start = time.perf_counter()
+                counts = count_ngrams_parallel(corpus_path, top_n, workers, merge)
+                results = create_ngrams.build_results(counts[0], top_n, *counts[1:])
+                elapsed = time.perf_counter() - start
+                same = "✓ aynı" if results == baseline else "✗ FARKLI"
+                print(f"{workers:5d} {merge:>12s} {elapsed:10.2f} {baseline_time / elapsed:9.1f}x  {same}")
+
+        run_merge_memory(corpus_path, top_n, max(worker_counts))
+
+
+def run_merge_memory(corpus_path, top_n, workers):
+    """Shard sonuçlarını bir kez üretip iki birleştirme modunun ana süreçteki tepe belleğini ölçer"""
+    shards = make_shards(create_ngrams.list_song_ids(corpus_path), workers)
+    partials = [_count_shard(corpus_path, shard) for shard in shards]
+    print(f"\n💾 Birleştirme tepe belleği ({len(shards)} shard, shard sonuçları hariç)")
+    for merge, func in (('exact', merge_shards), ('topk', lambda p: merge_shards_topk(p, top_n))):
+        # Birleştirme listeyi tüketir: her mod kendi kopyasını alır
+        copy = list(partials)
+        tracemalloc.start()
+        counts = func(copy)
+        create_ngrams.build_results(counts[0], top_n, *counts[1:])
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"   {merge:6s} {peak / 1024 / 1024:8.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="N-gram motoru benchmark'ı")
+    parser.add_argument('--tokens', type=int, default=3_000_000)
+    parser.add_argument('--vocab', type=int, default=50_000)
+    parser.add_argument('--top-n', type=int, default=1000)
+    parser.add_argument('--scaling', action='store_true', help="İşçi sayısına göre ölçeklenme testi")
+    args = parser.parse_args()
+
+    print(f"🧪 {args.tokens:,} token, {args.vocab:,} kelimelik sentetik corpus üretiliyor...")
+    songs = synthetic_songs(args.tokens, args.vocab)
+    print(f"✓ {len(songs):,} şarkı hazır\n")
+
+    if args.scaling:
+        run_scaling(songs, args.top_n)
+        raise SystemExit
+
+    print(f"{'Motor':10s} {'süre (sn)':>10s} {'tepe bellek':>14s}")
+    print("-" * 40)
+    outputs = {}
+    for engine in ('counter', 'numpy'):
+        elapsed, peak_mb, outputs[engine] = run(engine, songs, args.top_n)
+        print(f"{engine:10s} {elapsed:10.2f} {peak_mb:11.1f} MB")
+
+    same = outputs['counter'] == outputs['numpy']
+    print(f"\n{'✓ Sonuçlar birebir aynı' if same else '✗ SONUÇLAR FARKLI'}")
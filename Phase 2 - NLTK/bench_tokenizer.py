@@ -0,0 +1,80 @@
+"""
+Tokenizer benchmark'ı: eski clean_text/get_tokens ile turkish_text karşılaştırması
+
+Büyük harfli Türkçe kelimeler (IŞIK, İstanbul...) ve noktalama içeren sentetik
+şarkılar üzerinde süreyi ve çıkan kelime dağarcığı boyutunu ölçer.
+
+    python bench_tokenizer.py --songs 20000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from turkish_text import tokenize, tokenize_batch
+
+STOPWORDS = {
+    've', 'bir', 'bu', 'o', 'için', 'ile', 'de', 'da', 'mi', 'mu',
+    'mı', 'mü', 'gibi', 'ki', 'daha', 'ne', 'ya', 'her', 'ben'
+}
+WORDS = ['ışık', 'istanbul', 'gece', 'yalnızlık', 'zaman', 'içimde', 'İçimde', 'IŞIK',
+         'İstanbul', 'Işıl', 'hayat', 'Ölüm', 'şarkı', 'Gönül', 've', 'bir', 'ki', 'ISSIZ']
+PUNCTUATION = ['', '', '', ',', '.', '!', '?', '...']
+
+
+def legacy_clean_text(text):
+    """createN-Grams.py'nin önceki clean_text'i (referans)"""
+    text = text.lower()
+    text = re.sub(r'[^a-züğışöçıİĞŞÖÇÜ\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def legacy_get_tokens(text):
+    return [t for t in legacy_clean_text(text).split() if t not in STOPWORDS and len(t) > 2]
+
+
+def synthetic_songs(count, words_per_song=250, seed=7):
+    rng = random.Random(seed)
+    songs = []
+    for _ in range(count):
+        lines = []
+        for _ in range(words_per_song // 8):
+            lines.append(' '.join(rng.choice(WORDS) + rng.choice(PUNCTUATION) for _ in range(8)))
+        songs.append('\n'.join(lines))
+    return songs
+
+
+def measure(label, func, songs):
+    start = time.perf_counter()
+    token_lists = func(songs)
+    elapsed = time.perf_counter() - start
+    vocab = {t for tokens in token_lists for t in tokens}
+    print(f"{label:28s} {elapsed:8.3f} sn {len(vocab):8d} kelime")
+    return token_lists
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Türkçe tokenizer benchmark'ı")
+    parser.add_argument('--songs', type=int, default=20_000)
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args()
+
+    songs = synthetic_songs(args.songs)
+    print(f"🧪 {len(songs):,} sentetik şarkı\n")
+    print(f"{'Yöntem':28s} {'süre':>11s} {'dağarcık':>14s}")
+    print("-" * 56)
+
+    legacy = measure("clean_text + get_tokens", lambda s: [legacy_get_tokens(t) for t in s], songs)
+    single = measure("tokenize (belge başına)", lambda s: [tokenize(t, STOPWORDS) for t in s], songs)
+    batched = measure(
+        f"tokenize_batch ({args.batch_size})",
+        lambda s: [tokens for i in range(0, len(s), args.batch_size)
+                   for tokens in tokenize_batch(s[i:i + args.batch_size], STOPWORDS)],
+        songs
+    )
+
+    print(f"\n{'✓' if single == batched else '✗'} tokenize ile tokenize_batch aynı sonucu verdi")
+    print("Eski yolda fazladan oluşan kelimeler:",
+          sorted({t for tokens in legacy for t in tokens} - {t for tokens in single for t in tokens}))
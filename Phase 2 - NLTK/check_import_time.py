@@ -0,0 +1,71 @@
+"""
+createN-Grams.py import süresi bütçesi kontrolü
+
+Modül her seferinde temiz bir Python sürecinde yüklenir; ağ bağlantıları
+engellenir. Süre bütçeyi aşarsa, NLTK import edilirse ya da ağa çıkılmaya
+çalışılırsa çıkış kodu 1 olur.
+
+    python check_import_time.py --budget-ms 150
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+IMPORT_BUDGET_MS = 150
+
+CHILD_CODE = r'''
+import importlib.util, json, socket, sys, time
+
+def _no_network(*args, **kwargs):
+    raise RuntimeError("import sırasında ağ erişimi denendi")
+socket.socket.connect = _no_network
+socket.create_connection = _no_network
+
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location('create_ngrams', sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+elapsed = time.perf_counter() - start
+print(json.dumps({"ms": elapsed * 1000, "nltk": "nltk" in sys.modules}))
+'''
+
+
+def measure_import(path, runs):
+    """Her ölçüm ayrı süreçte; (süreler ms, nltk yüklendi mi) döner"""
+    timings = []
+    nltk_loaded = False
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', CHILD_CODE, path],
+            capture_output=True, text=True, check=True
+        )
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(data['ms'])
+        nltk_loaded |= data['nltk']
+    return timings, nltk_loaded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="createN-Grams.py import süresi kontrolü")
+    parser.add_argument('--budget-ms', type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'createN-Grams.py')
+    try:
+        timings, nltk_loaded = measure_import(path, args.runs)
+    except subprocess.CalledProcessError as e:
+        print(f"✗ Import başarısız:\n{e.stderr}")
+        sys.exit(1)
+
+    median = statistics.median(timings)
+    print(f"⏱️  Import süresi (medyan, {args.runs} ölçüm): {median:.1f} ms (bütçe {args.budget_ms:.0f} ms)")
+    if nltk_loaded:
+        print("✗ NLTK import edildi")
+    ok = median <= args.budget_ms and not nltk_loaded
+    print("✓ Bütçe içinde" if ok else "✗ Bütçe aşıldı")
+    sys.exit(0 if ok else 1)
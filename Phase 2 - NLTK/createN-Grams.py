@@ -1,48 +1,41 @@
+import argparse
 import os
-import re
-from collections import Counter
-import nltk
-from nltk import ngrams
+import sys
+from collections import Counter, deque
 import json
 
-# Türkçe için gerekli NLTK verilerini indir
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-# Türkçe stopwords yükle
-try:
-    from nltk.corpus import stopwords
-    turkish_stopwords = set(stopwords.words('turkish'))
-except:
-    print("⚠ Türkçe stopwords yüklenemedi, temel liste kullanılıyor")
-    turkish_stopwords = {
-        've', 'bir', 'bu', 'o', 'için', 'ile', 'de', 'da', 'mi', 'mu', 
-        'mı', 'mü', 'gibi', 'ki', 'daha', 'ne', 'ya', 'her', 'ben'
-    }
+# Phase 1'deki corpus dosyası okuyucusu ve bu klasördeki yardımcı modüller
+PHASE2_DIR = os.path.dirname(os.path.abspath(__file__))
+PHASE1_DIR = os.path.join(os.path.dirname(PHASE2_DIR), 'Phase 1 - Web Scrapping')
+sys.path.insert(0, PHASE1_DIR)
+sys.path.insert(0, PHASE2_DIR)
+from corpus_store import CorpusReader
+from turkish_text import load_stopwords, tokenize, turkish_lower, TOKEN_RE
+
+# Türkçe stopwords modül import edilirken değil, ilk kullanıldığında
+# repodaki turkish_stopwords.txt'den yüklenir (NLTK ve ağ erişimi gerekmez)
+def __getattr__(name):
+    if name == 'turkish_stopwords':
+        return load_stopwords()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def ngrams(tokens, n):
+    """Kayan pencereyle ardışık n'li tuple'lar üretir (nltk.ngrams yerine)"""
+    window = deque(maxlen=n)
+    for token in tokens:
+        window.append(token)
+        if len(window) == n:
+            yield tuple(window)
 
 def clean_text(text):
-    """Metni temizler ve normalize eder"""
-    text = text.lower()
-    text = re.sub(r'[^a-züğışöçıİĞŞÖÇÜ\s]', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    """Metni temizler ve normalize eder (Türkçe küçük harf, yalnızca harfler)"""
+    return ' '.join(TOKEN_RE.findall(turkish_lower(text)))
 
 def get_tokens(text, remove_stopwords=True):
     """Metni token'lara ayırır"""
-    text = clean_text(text)
-    tokens = text.split()
-    
     if remove_stopwords:
-        tokens = [t for t in tokens if t not in turkish_stopwords and len(t) > 2]
-    
-    return tokens
+        return tokenize(text, load_stopwords())
+    return tokenize(text, min_length=1)
 
 def get_ngrams_from_text(text, n=1):
     """Metinden n-gramları çıkarır"""
@@ -53,77 +46,197 @@ def get_ngrams_from_text(text, n=1):
         n_grams = list(ngrams(tokens, n))
         return [' '.join(gram) for gram in n_grams]
 
-def extract_top_ngrams(folder_path, top_n=100):
-    """Klasördeki tüm şarkılardan top N n-gramları çıkarır"""
+def list_song_ids(corpus_path):
+    """Şarkı id'lerini okunma sırasıyla döner (klasörde dosya adları, corpus'ta kayıt id'leri)"""
+    if os.path.isdir(corpus_path):
+        return sorted(f for f in os.listdir(corpus_path) if f.endswith('.txt'))
+    with CorpusReader(corpus_path) as reader:
+        return reader.ids()
+
+def iter_song_texts(corpus_path, song_ids=None):
+    """Şarkıları (id, metin) olarak verir
     
-    print(f"\n{'='*60}")
-    print(f"TOP {top_n} N-GRAM ÇIKARMA")
-    print(f"{'='*60}\n")
+    corpus_path bir klasörse içindeki .txt dosyaları, bir dosyaysa Phase 1'in
+    ürettiği tek dosyalık corpus (memory-map ile) okunur. song_ids verilirse
+    yalnızca o şarkılar o sırayla okunur.
+    """
+    if song_ids is None:
+        song_ids = list_song_ids(corpus_path)
     
-    # Tüm txt dosyalarını oku
-    all_text = ""
-    txt_files = [f for f in os.listdir(folder_path) if f.endswith('.txt')]
+    if os.path.isdir(corpus_path):
+        for filename in song_ids:
+            try:
+                with open(os.path.join(corpus_path, filename), 'r', encoding='utf-8') as f:
+                    yield filename, f.read()
+            except Exception as e:
+                print(f"✗ Dosya okuma hatası ({filename}): {e}")
+    else:
+        with CorpusReader(corpus_path) as reader:
+            for song_id in song_ids:
+                yield song_id, reader[song_id]
+
+def count_songs(corpus_path):
+    """Corpus'taki şarkı sayısı"""
+    return len(list_song_ids(corpus_path))
+
+def iter_song_tokens(corpus_path, song_ids=None):
+    """Her şarkıyı bir kez temizleyip token listesi olarak verir
     
-    if not txt_files:
-        print(f"✗ {folder_path} klasöründe txt dosyası bulunamadı!")
-        return None
+    Belge başına tokenize kullanılır: tokenize_batch'in birleştirme / bölme
+    kopyaları ölçümde daha yavaştı (bkz. bench_tokenizer.py).
+    """
+    stopwords = load_stopwords()
+    for _, text in iter_song_texts(corpus_path, song_ids):
+        yield tokenize(text, stopwords)
+
+def count_ngrams(token_streams):
+    """Şarkı token listelerinden 1/2/3-gram sayaçlarını tek geçişte günceller
     
-    print(f"📁 {len(txt_files)} şarkı dosyası bulundu")
+    N-gramlar şarkı sınırlarını aşmaz; bellek corpus boyutuna değil
+    farklı n-gram sayısına bağlıdır. Anahtarlar token tuple'larıdır,
+    string'e sadece sonuçta tutulan top N için çevrilir.
     
-    for filename in txt_files:
-        filepath = os.path.join(folder_path, filename)
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                all_text += f.read() + " "
-        except Exception as e:
-            print(f"✗ Dosya okuma hatası ({filename}): {e}")
+    Returns:
+        (song_count, unigram_freq, bigram_freq, trigram_freq)
+    """
+    unigram_freq = Counter()
+    bigram_freq = Counter()
+    trigram_freq = Counter()
+    song_count = 0
     
-    if not all_text.strip():
-        print("✗ Hiç metin bulunamadı!")
-        return None
+    for tokens in token_streams:
+        song_count += 1
+        unigram_freq.update(tokens)
+        bigram_freq.update(zip(tokens, tokens[1:]))
+        trigram_freq.update(zip(tokens, tokens[1:], tokens[2:]))
     
-    print("🔍 N-gramlar çıkarılıyor...\n")
+    return song_count, unigram_freq, bigram_freq, trigram_freq
+
+def update_ngram_store(corpus_path, store_path):
+    """Kalıcı sayım tablolarını yalnızca eklenen/değişen/silinen şarkılarla günceller
     
-    # N-gramları çıkar
-    unigrams = get_ngrams_from_text(all_text, n=1)
-    bigrams = get_ngrams_from_text(all_text, n=2)
-    trigrams = get_ngrams_from_text(all_text, n=3)
+    Tüm şarkıların metin özeti çıkarılır (tokenize etmekten çok daha ucuz), yalnızca
+    özeti değişen şarkılar tokenize edilip sayılır.
+    
+    Returns:
+        (store, stats): güncel NgramStore ve eklenen/değişen/silinen şarkı sayıları
+    """
+    from ngram_store import NgramStore, fingerprint
+    
+    store = NgramStore.load(store_path) if os.path.exists(store_path) else NgramStore()
     
-    # Frekansları hesapla
-    unigram_freq = Counter(unigrams)
-    bigram_freq = Counter(bigrams)
-    trigram_freq = Counter(trigrams)
+    fingerprints = {}
+    pending = []
+    for song_id, text in iter_song_texts(corpus_path):
+        fp = fingerprints[song_id] = fingerprint(text)
+        known = store.songs.get(song_id)
+        if known is None or known[0] != fp:
+            pending.append((song_id, fp, get_tokens(text)))
     
-    # Top N'i al
-    top_unigrams = unigram_freq.most_common(top_n)
-    top_bigrams = bigram_freq.most_common(top_n)
-    top_trigrams = trigram_freq.most_common(top_n)
+    added, changed, removed = store.diff(fingerprints)
+    if added or changed or removed:
+        store.update(removed + changed, pending)
+        store.save(store_path)
     
-    # Sonuçları hazırla
+    return store, {"added": len(added), "changed": len(changed), "removed": len(removed)}
+
+def _ranked_items(freq, top_n, field):
+    """Top N öğeyi JSON kayıtlarına çevirir; yaklaşık tablolarda tahmini hata da eklenir"""
+    error_of = getattr(freq, 'error_of', None)
+    items = []
+    for i, (gram, count) in enumerate(freq.most_common(top_n)):
+        item = {"rank": i+1, field: gram if field == "word" else ' '.join(gram), "frequency": count}
+        if error_of:
+            item["error"] = error_of(gram)
+        items.append(item)
+    return items
+
+def build_results(song_count, top_n, unigram_freq, bigram_freq, trigram_freq):
+    """Sayaçlardan top_1000_* JSON yapısını oluşturur"""
     results = {
         "metadata": {
-            "total_songs": len(txt_files),
+            "total_songs": song_count,
             "top_n": top_n,
             "total_unique_unigrams": len(unigram_freq),
             "total_unique_bigrams": len(bigram_freq),
             "total_unique_trigrams": len(trigram_freq)
         },
-        "top_1000_unigrams": [
-            {"rank": i+1, "word": word, "frequency": count}
-            for i, (word, count) in enumerate(top_unigrams)
-        ],
-        "top_1000_bigrams": [
-            {"rank": i+1, "phrase": phrase, "frequency": count}
-            for i, (phrase, count) in enumerate(top_bigrams)
-        ],
-        "top_1000_trigrams": [
-            {"rank": i+1, "phrase": phrase, "frequency": count}
-            for i, (phrase, count) in enumerate(top_trigrams)
-        ]
+        "top_1000_unigrams": _ranked_items(unigram_freq, top_n, "word"),
+        "top_1000_bigrams": _ranked_items(bigram_freq, top_n, "phrase"),
+        "top_1000_trigrams": _ranked_items(trigram_freq, top_n, "phrase")
     }
     
+    if hasattr(unigram_freq, 'error_bound'):
+        # Yaklaşık mod: frekanslar üst sınırdır, gerçek değer [frequency - error, frequency]
+        results["metadata"]["approximate"] = {
+            "method": type(unigram_freq).__name__,
+            "epsilon": unigram_freq.epsilon,
+            "unique_counts_estimated": True,
+            "max_error_unigrams": unigram_freq.error_bound(),
+            "max_error_bigrams": bigram_freq.error_bound(),
+            "max_error_trigrams": trigram_freq.error_bound()
+        }
+    
     return results
 
+def extract_top_ngrams(folder_path, top_n=100, engine='counter', workers=1, merge='exact',
+                       approx=None, epsilon=1e-5, delta=0.01, store_path=None):
+    """Klasördeki (ya da corpus dosyasındaki) tüm şarkılardan top N n-gramları çıkarır
+    
+    Args:
+        folder_path: Şarkı klasörü ya da corpus dosyası
+        top_n: Her n için tutulacak en sık n-gram sayısı
+        engine: 'counter' (Python Counter) ya da 'numpy' (int id'li diziler, büyük corpus'lar için)
+        workers: 1'den büyükse şarkılar shard'lanıp süreç havuzunda sayılır; işçiler her zaman
+            numpy motorunu kullanır (sonuç iki motorla da birebir aynıdır)
+        merge: Çok süreçte kısmi sayıların birleştirilmesi: 'exact' ya da 'topk'
+        approx: Sınırlı bellekli yaklaşık mod: 'spacesaving' ya da 'cms' (None = tam sayım)
+        epsilon: Yaklaşık modda toplam n-gram sayısına oranla izin verilen en büyük hata
+        delta: 'cms' için hata sınırının aşılma olasılığı
+        store_path: Verilirse tam sayım tabloları bu dosyada tutulur ve yalnızca
+            değişen şarkılar yeniden sayılır (artımlı güncelleme)
+    """
+    
+    print(f"\n{'='*60}")
+    print(f"TOP {top_n} N-GRAM ÇIKARMA")
+    print(f"{'='*60}\n")
+    
+    song_count = count_songs(folder_path)
+    
+    if not song_count:
+        print(f"✗ {folder_path} içinde şarkı bulunamadı!")
+        return None
+    
+    print(f"📁 {song_count} şarkı bulundu")
+    print("🔍 N-gramlar çıkarılıyor...\n")
+    
+    # Her şarkı bir kez tokenize edilir, sayaçlar akış halinde güncellenir
+    if store_path:
+        store, stats = update_ngram_store(folder_path, store_path)
+        print(f"♻️  Artımlı güncelleme: {stats['added']} yeni, {stats['changed']} değişen, "
+              f"{stats['removed']} silinen şarkı ({store_path})")
+        counts = store.ngram_tables()
+    elif approx:
+        from heavy_hitters import count_ngrams_approx
+        print(f"⚙️  Yaklaşık mod: {approx} (epsilon={epsilon})")
+        counts = count_ngrams_approx(iter_song_tokens(folder_path), top_n, approx, epsilon, delta)
+    elif workers > 1:
+        from ngram_parallel import count_ngrams_parallel
+        print(f"⚙️  {workers} süreç (numpy motoru), '{merge}' birleştirme")
+        counts = count_ngrams_parallel(folder_path, top_n, workers, merge)
+    elif engine == 'numpy':
+        from ngram_engine import count_ngrams_numpy
+        counts = count_ngrams_numpy(iter_song_tokens(folder_path))
+    else:
+        counts = count_ngrams(iter_song_tokens(folder_path))
+    song_count, unigram_freq, bigram_freq, trigram_freq = counts
+    
+    if not unigram_freq:
+        print("✗ Hiç metin bulunamadı!")
+        return None
+    
+    return build_results(song_count, top_n, unigram_freq, bigram_freq, trigram_freq)
+
 def save_results(results, output_file='top_1000_ngrams.json'):
     """Sonuçları JSON ve TXT olarak kaydet"""
     
@@ -197,32 +310,58 @@ def print_summary(results):
 # ============== ANA PROGRAM ==============
 
 if __name__ == "__main__":
-    # Klasör yolu
-    FOLDER_PATH = r"C:\Users\Hp\Desktop\LoRA Finetune\Phase 1 - Web Scrapping\song"
+    # Varsayılan klasör yolu (Phase 1 çıktısı)
+    FOLDER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'Phase 1 - Web Scrapping', 'song')
+    
+    parser = argparse.ArgumentParser(description="Şarkı sözlerinden top N n-gram çıkarır")
+    parser.add_argument('folder', nargs='?', default=FOLDER_PATH, help="Şarkı klasörü ya da corpus dosyası")
+    parser.add_argument('--top-n', type=int, default=1000)
+    parser.add_argument('--engine', choices=['counter', 'numpy'], default='counter',
+                        help="Tek süreçte sayım motoru (--workers > 1 her zaman numpy kullanır)")
+    parser.add_argument('--workers', type=int, default=1, help="Paralel süreç sayısı (numpy motoruyla)")
+    parser.add_argument('--merge', choices=['exact', 'topk'], default='exact',
+                        help="Çok süreçte kısmi sayıların birleştirme yöntemi")
+    parser.add_argument('--approx', choices=['spacesaving', 'cms'],
+                        help="Sınırlı bellekli yaklaşık top N (tam sayım yerine)")
+    parser.add_argument('--epsilon', type=float, default=1e-5,
+                        help="Yaklaşık modda toplam n-gram sayısına oranla en büyük hata")
+    parser.add_argument('--delta', type=float, default=0.01,
+                        help="cms: hata sınırının aşılma olasılığı")
+    parser.add_argument('--update', action='store_true',
+                        help="Kalıcı sayım tablolarını yalnızca değişen şarkılarla güncelle")
+    parser.add_argument('--store', default='ngram_counts.npz',
+                        help="--update için tam sayım tablolarının dosyası")
+    parser.add_argument('--output', default='top_1000_ngrams.json')
+    args = parser.parse_args()
     
     print("\n" + "="*60)
     print("TOP 1000 N-GRAM ÇIKARICI")
     print("="*60)
     
     # Klasör kontrolü
-    if not os.path.exists(FOLDER_PATH):
-        print(f"✗ HATA: '{FOLDER_PATH}' klasörü bulunamadı!")
+    if not os.path.exists(args.folder):
+        print(f"✗ HATA: '{args.folder}' klasörü bulunamadı!")
         print("Lütfen klasör yolunu kontrol edin.")
         exit()
     
     # N-gramları çıkar
-    results = extract_top_ngrams(FOLDER_PATH, top_n=1000)
+    results = extract_top_ngrams(args.folder, top_n=args.top_n, engine=args.engine,
+                                 workers=args.workers, merge=args.merge,
+                                 approx=args.approx, epsilon=args.epsilon, delta=args.delta,
+                                 store_path=args.store if args.update else None)
     
     if results:
         # Sonuçları kaydet
-        save_results(results)
+        save_results(results, args.output)
         
         # Özet göster
         print_summary(results)
         
+        txt_output = args.output.replace('.json', '.txt')
         print("\n✓ Tüm işlemler tamamlandı!")
         print("\n📄 Oluşturulan dosyalar:")
-        print("   1. top_1000_ngrams.json - JSON formatında veri")
-        print("   2. top_1000_ngrams.txt - Okunabilir metin formatı")
+        print(f"   1. {args.output} - JSON formatında veri")
+        print(f"   2. {txt_output} - Okunabilir metin formatı")
     else:
-        print("\n✗ İşlem başarısız!")
\ No newline at end of file
+        print("\n✗ İşlem başarısız!")
@@ -0,0 +1,222 @@
+"""
+Sınırlı bellekli, yaklaşık top N n-gram sayımı
+
+Tüm benzersiz trigram'lar için tam Counter tutmak yerine:
+
+- spacesaving: ceil(1/epsilon) sayaçlık Space-Saving. Her tahmin gerçek
+  sayıdan en fazla `error` kadar büyüktür ve error <= epsilon * N (N: toplam n-gram).
+- cms:         Count-Min Sketch (genişlik e/epsilon, derinlik ln(1/delta)) + en
+  sık adaylar için sınırlı bir tablo. 1 - delta olasılıkla hata <= epsilon * N.
+
+Benzersiz n-gram sayısı sabit boyutlu bir bitmap ile (linear counting) tahmin edilir.
+Hash'ler anahtarın UTF-8 baytlarının crc32'sidir: Python'un hash()'i str/tuple için
+her süreçte farklı tohumlandığından sonuçlar çalıştırmadan çalıştırmaya değişirdi.
+"""
+
+import heapq
+import math
+import zlib
+from array import array
+
+DEFAULT_EPSILON = 1e-5
+DEFAULT_DELTA = 0.01
+APPROX_METHODS = ('spacesaving', 'cms')
+LINEAR_COUNTING_BITS = 1 << 22
+MERSENNE_PRIME = (1 << 61) - 1
+# n-gram tuple'ının token'larını birleştiren ayraç (token'larda geçmez)
+KEY_SEPARATOR = '\x1f'
+
+
+def stable_hash(key):
+    """Token ya da token tuple'ı için süreçten bağımsız 32 bitlik hash"""
+    if isinstance(key, tuple):
+        key = KEY_SEPARATOR.join(key)
+    return zlib.crc32(key.encode('utf-8'))
+
+
+class _TopTracker:
+    """Sınırlı sayıda anahtarın değerini tutar; en küçüğü lazy min-heap ile bulur"""
+
+    def __init__(self):
+        self.values = {}
+        self.errors = {}
+        self.first_seen = {}
+        self.heap = []
+        self.sequence = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, key):
+        return key in self.values
+
+    def add(self, key, value, error=0):
+        self.values[key] = value
+        self.errors[key] = error
+        self.first_seen[key] = self.sequence
+        heapq.heappush(self.heap, (value, self.sequence, key))
+        self.sequence += 1
+
+    def _settle(self):
+        """Heap'in tepesindeki eski (güncellenmiş ya da silinmiş) kayıtları düzeltir"""
+        while self.heap:
+            value, sequence, key = self.heap[0]
+            is_live = self.first_seen.get(key) == sequence
+            current = self.values.get(key)
+            if is_live and current == value:
+                return
+            heapq.heappop(self.heap)
+            if is_live:
+                heapq.heappush(self.heap, (current, sequence, key))
+
+    def min_value(self):
+        self._settle()
+        return self.heap[0][0]
+
+    def pop_min(self):
+        self._settle()
+        value, _, key = heapq.heappop(self.heap)
+        del self.values[key], self.errors[key], self.first_seen[key]
+        return key, value
+
+    def ranked(self):
+        """(anahtar, değer, hata) listesi: değere göre azalan, eşitlikte önce görülen önce"""
+        keys = sorted(self.values, key=lambda k: (-self.values[k], self.first_seen[k]))
+        return [(k, self.values[k], self.errors[k]) for k in keys]
+
+
+class LinearCounter:
+    """Sabit boyutlu bitmap ile benzersiz eleman sayısı tahmini"""
+
+    def __init__(self, bits=LINEAR_COUNTING_BITS):
+        self.bits = bits
+        self.bitmap = bytearray(bits // 8)
+
+    def add(self, key):
+        self.add_hash(stable_hash(key))
+
+    def add_hash(self, key_hash):
+        h = key_hash % self.bits
+        self.bitmap[h >> 3] |= 1 << (h & 7)
+
+    def estimate(self):
+        zeros = self.bits - int.from_bytes(self.bitmap, 'little').bit_count()
+        if zeros == 0:
+            return self.bits
+        return round(self.bits * math.log(self.bits / zeros))
+
+
+class SpaceSaving:
+    """Space-Saving heavy hitters; Counter'ın most_common/len arayüzünü taklit eder"""
+
+    def __init__(self, epsilon=DEFAULT_EPSILON, min_capacity=0):
+        self.epsilon = epsilon
+        self.capacity = max(math.ceil(1 / epsilon), min_capacity)
+        self.tracker = _TopTracker()
+        self.distinct = LinearCounter()
+        self.total = 0
+
+    def update(self, keys):
+        tracker = self.tracker
+        values = tracker.values
+        for key in keys:
+            self.total += 1
+            self.distinct.add(key)
+            if key in values:
+                values[key] += 1
+            elif len(tracker) < self.capacity:
+                tracker.add(key, 1)
+            else:
+                # En küçük sayacı devral: tahmin min+1, olası fazlalık min
+                _, minimum = tracker.pop_min()
+                tracker.add(key, minimum + 1, error=minimum)
+
+    def __len__(self):
+        return self.distinct.estimate()
+
+    def most_common(self, top_n=None):
+        return [(key, value) for key, value, _ in self.tracker.ranked()[:top_n]]
+
+    def error_of(self, key):
+        return self.tracker.errors.get(key, 0)
+
+    def error_bound(self):
+        return math.floor(self.epsilon * self.total)
+
+
+class CountMinSketch:
+    """Count-Min Sketch + en sık adaylar tablosu; Counter arayüzünü taklit eder"""
+
+    def __init__(self, epsilon=DEFAULT_EPSILON, delta=DEFAULT_DELTA, candidates=1000):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.rows = [array('q', bytes(8 * self.width)) for _ in range(self.depth)]
+        # Satır başına (a, b) çiftli ikili bağımsız hash
+        self.hash_params = [(2 * i + 1 + (i << 32), i * 7919 + 1) for i in range(self.depth)]
+        self.capacity = candidates
+        self.tracker = _TopTracker()
+        self.distinct = LinearCounter()
+        self.total = 0
+
+    def _add(self, h):
+        """Anahtarın stable_hash değerini sayar, güncel tahmini döner"""
+        estimate = None
+        for row, (a, b) in zip(self.rows, self.hash_params):
+            index = ((a * h + b) % MERSENNE_PRIME) % self.width
+            row[index] += 1
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        return estimate
+
+    def update(self, keys):
+        tracker = self.tracker
+        for key in keys:
+            self.total += 1
+            key_hash = stable_hash(key)
+            self.distinct.add_hash(key_hash)
+            estimate = self._add(key_hash)
+            if key in tracker:
+                tracker.values[key] = estimate
+            elif len(tracker) < self.capacity:
+                tracker.add(key, estimate)
+            elif estimate > tracker.min_value():
+                tracker.pop_min()
+                tracker.add(key, estimate)
+
+    def __len__(self):
+        return self.distinct.estimate()
+
+    def most_common(self, top_n=None):
+        return [(key, value) for key, value, _ in self.tracker.ranked()[:top_n]]
+
+    def error_of(self, key):
+        return self.error_bound()
+
+    def error_bound(self):
+        return math.floor(self.epsilon * self.total)
+
+
+def count_ngrams_approx(token_streams, top_n, method='spacesaving', epsilon=DEFAULT_EPSILON,
+                        delta=DEFAULT_DELTA):
+    """count_ngrams ile aynı dönüş düzeni; tablolar her öğe için error_of() sunar
+
+    Returns:
+        (song_count, unigram_table, bigram_table, trigram_table)
+    """
+    if method == 'spacesaving':
+        tables = [SpaceSaving(epsilon, min_capacity=top_n) for _ in range(3)]
+    elif method == 'cms':
+        tables = [CountMinSketch(epsilon, delta, candidates=top_n) for _ in range(3)]
+    else:
+        raise ValueError(f"Bilinmeyen yöntem: {method} (seçenekler: {', '.join(APPROX_METHODS)})")
+
+    song_count = 0
+    unigrams, bigrams, trigrams = tables
+    for tokens in token_streams:
+        song_count += 1
+        unigrams.update(tokens)
+        bigrams.update(zip(tokens, tokens[1:]))
+        trigrams.update(zip(tokens, tokens[1:], tokens[2:]))
+    return (song_count, *tables)
@@ -0,0 +1,177 @@
+"""
+Tamsayı id'li vocabulary ve NumPy dizileriyle n-gram sayımı
+
+Token'lar int32 id'lere çevrilir, bigram/trigram'lar tek bir int64 anahtara
+paketlenir (id başına 21 bit), sıralanıp reduceat ile sayılır. String'ler yalnızca
+sonuçta tutulan top N için geri çözülür.
+
+Sıralama Counter.most_common ile aynıdır: frekansa göre azalan, eşitlikte
+corpus'ta ilk görülen önce gelir.
+"""
+
+import numpy as np
+
+ID_BITS = 21
+MAX_VOCAB = 1 << ID_BITS
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+class Vocabulary:
+    """Token <-> int32 id eşlemesi (id'ler ilk görülme sırasıyla verilir)"""
+
+    def __init__(self):
+        self.index = {}
+        self.tokens = []
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def _add(self, token):
+        token_id = self.index[token] = len(self.tokens)
+        if token_id >= MAX_VOCAB:
+            raise OverflowError(f"Vocabulary {MAX_VOCAB} token sınırını aştı")
+        self.tokens.append(token)
+        return token_id
+
+    def encode(self, tokens):
+        index = self.index
+        return np.array(
+            [index[t] if t in index else self._add(t) for t in tokens],
+            dtype=np.int32
+        )
+
+    def decode(self, token_id):
+        return self.tokens[token_id]
+
+
+def pack_ngrams(ids, n):
+    """Ardışık n id'yi tek int64 anahtara paketler"""
+    ids = ids.astype(np.int64)
+    length = len(ids) - n + 1
+    keys = ids[:length].copy()
+    for offset in range(1, n):
+        keys <<= ID_BITS
+        keys |= ids[offset:offset + length]
+    return keys
+
+
+def unpack_ngram(key, n):
+    """int64 anahtarı id tuple'ına geri çevirir"""
+    mask = MAX_VOCAB - 1
+    return tuple(int(key >> (ID_BITS * (n - 1 - i))) & mask for i in range(n))
+
+
+def _reduce(keys, counts, first):
+    """Aynı anahtarları birleştirir: sayıları toplar, ilk görülme konumunun minimumunu alır"""
+    order = np.argsort(keys, kind='stable')
+    keys, counts, first = keys[order], counts[order], first[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return keys[starts], np.add.reduceat(counts, starts), np.minimum.reduceat(first, starts)
+
+
+class NgramTable:
+    """Bir n değeri için (anahtar, sayı, ilk konum) dizileri; Counter arayüzünü taklit eder"""
+
+    def __init__(self, n, vocab):
+        self.n = n
+        self.vocab = vocab
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.first = np.empty(0, dtype=np.int64)
+        self.pending_keys = []
+        self.pending_first = []
+        self.pending_size = 0
+
+    def add(self, keys, positions):
+        self.pending_keys.append(keys)
+        self.pending_first.append(positions)
+        self.pending_size += len(keys)
+
+    def flush(self):
+        if not self.pending_keys:
+            return
+        keys = np.concatenate([self.keys] + self.pending_keys)
+        counts = np.concatenate([self.counts, np.ones(self.pending_size, dtype=np.int64)])
+        first = np.concatenate([self.first] + self.pending_first)
+        self.pending_keys, self.pending_first, self.pending_size = [], [], 0
+        if len(keys):
+            self.keys, self.counts, self.first = _reduce(keys, counts, first)
+
+    def __len__(self):
+        self.flush()
+        return len(self.keys)
+
+    def decode(self, key):
+        if self.n == 1:
+            return self.vocab.decode(int(key))
+        return tuple(self.vocab.decode(i) for i in unpack_ngram(int(key), self.n))
+
+    def most_common(self, top_n=None):
+        """[(kelime ya da tuple, sayı)] - Counter.most_common ile aynı sıralama"""
+        self.flush()
+        order = np.lexsort((self.first, -self.counts))
+        if top_n is not None:
+            order = order[:top_n]
+        return [(self.decode(self.keys[i]), int(self.counts[i])) for i in order]
+
+
+class NgramCounter:
+    """Şarkı şarkı beslenen, 1/2/3-gram'ları NumPy ile sayan motor"""
+
+    def __init__(self, max_n=3, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.vocab = Vocabulary()
+        self.max_n = max_n
+        self.chunk_size = chunk_size
+        self.tables = {n: NgramTable(n, self.vocab) for n in range(2, max_n + 1)}
+        self.unigram_counts = np.zeros(0, dtype=np.int64)
+        self.pending_ids = []
+        self.position = 0
+        self.song_count = 0
+
+    def add_tokens(self, tokens):
+        """Bir şarkının token'larını ekler (n-gramlar şarkı sınırını aşmaz)"""
+        self.song_count += 1
+        ids = self.vocab.encode(tokens)
+        if len(ids) == 0:
+            return
+        self.pending_ids.append(ids)
+        for n, table in self.tables.items():
+            if len(ids) >= n:
+                positions = np.arange(self.position, self.position + len(ids) - n + 1, dtype=np.int64)
+                table.add(pack_ngrams(ids, n), positions)
+        self.position += len(ids)
+        if sum(table.pending_size for table in self.tables.values()) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending_ids:
+            ids = np.concatenate(self.pending_ids)
+            self.pending_ids = []
+            counts = np.bincount(ids, minlength=len(self.vocab))
+            counts[:len(self.unigram_counts)] += self.unigram_counts
+            self.unigram_counts = counts
+        for table in self.tables.values():
+            table.flush()
+
+    def unigram_table(self):
+        """Unigram'lar için Counter benzeri tablo (id sırası = ilk görülme sırası)"""
+        self.flush()
+        table = NgramTable(1, self.vocab)
+        present = np.flatnonzero(self.unigram_counts)
+        table.keys = present.astype(np.int64)
+        table.counts = self.unigram_counts[present]
+        table.first = present.astype(np.int64)
+        return table
+
+
+def count_ngrams_numpy(token_streams, chunk_size=DEFAULT_CHUNK_SIZE):
+    """count_ngrams ile aynı dönüş değeri; sayaçlar yerine NgramTable'lar döner
+
+    Returns:
+        (song_count, unigram_table, bigram_table, trigram_table)
+    """
+    counter = NgramCounter(chunk_size=chunk_size)
+    for tokens in token_streams:
+        counter.add_tokens(tokens)
+    counter.flush()
+    return counter.song_count, counter.unigram_table(), counter.tables[2], counter.tables[3]
@@ -0,0 +1,192 @@
+"""
+Çok çekirdekli, shard'lanmış n-gram çıkarımı (map-reduce)
+
+Şarkılar sıralarını koruyan ardışık shard'lara bölünür; her işçi süreç kendi
+shard'ını okuyup tokenize eder ve ngram_engine (NumPy, int64 paketli anahtarlar)
+ile sayar. İşçi ana sürece Counter değil, kendi vocabulary'sini ve tablo başına
+(anahtar, sayı, ilk konum) dizilerini döner; bunlar ucuz serileştirilir.
+
+Ana süreç yerel token id'lerini shard sırasıyla kurulan ortak vocabulary'ye
+çevirir (id sırası = corpus'ta ilk görülme sırası) ve ilk konumları shard'ın
+corpus'taki başlangıcına kaydırır. Sonra:
+
+- exact: Tüm shard'lar tek bir sıralama + reduceat ile birleştirilir, tam
+         NgramTable'lar döner (tüm n-gramlar, Counter arayüzü).
+- topk:  Shard dizileri anahtara göre TOPK_PARTITIONS bölüme ayrılır (bir anahtar
+         tek bir bölüme düşer); her bölüm ayrı birleştirilip en iyi N adayla
+         karşılaştırılır, yalnızca N aday ve benzersiz anahtar sayısı taşınır.
+         Birleşik tam tablo hiç oluşmaz, tüketilen shard dizileri bırakılır;
+         çalışma belleği bir bölüm + N satırdır.
+
+İki mod da tek süreçli sonuçla birebir aynı çıktıyı üretir (eşitlikte corpus'ta
+ilk görülen n-gram önce gelir). workers <= 1 ise süreç havuzu hiç kurulmaz.
+"""
+
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ngram_engine import ID_BITS, MAX_VOCAB, NgramTable, Vocabulary, _reduce, count_ngrams_numpy
+
+MERGE_MODES = ('exact', 'topk')
+TOPK_PARTITIONS = 16
+
+_create_ngrams = None
+
+
+def _load_create_ngrams():
+    """createN-Grams.py'yi (tire içerdiği için importlib ile) bir kez yükler"""
+    global _create_ngrams
+    if _create_ngrams is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'createN-Grams.py')
+        spec = importlib.util.spec_from_file_location('create_ngrams', path)
+        _create_ngrams = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_create_ngrams)
+    return _create_ngrams
+
+
+def make_shards(song_ids, workers):
+    """Sırayı koruyarak şarkıları yaklaşık eşit ardışık parçalara böler"""
+    size, extra = divmod(len(song_ids), workers)
+    shards = []
+    start = 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            shards.append(song_ids[start:end])
+        start = end
+    return shards
+
+
+def _count_shard(corpus_path, song_ids):
+    """İşçi: shard'ı NumPy motoruyla sayar
+
+    Returns:
+        (şarkı sayısı, vocabulary token'ları, token sayısı, {n: (anahtarlar, sayılar, ilk konumlar)})
+    """
+    create_ngrams = _load_create_ngrams()
+    song_count, *tables = count_ngrams_numpy(create_ngrams.iter_song_tokens(corpus_path, song_ids))
+    arrays = {table.n: (table.keys, table.counts, table.first) for table in tables}
+    token_count = int(arrays[1][1].sum())
+    return song_count, tables[0].vocab.tokens, token_count, arrays
+
+
+def _remap_keys(keys, mapping, n):
+    """Paketli anahtarlardaki yerel id'leri ortak id'lere çevirip yeniden paketler"""
+    remapped = np.zeros_like(keys)
+    for i in range(n):
+        ids = (keys >> (ID_BITS * (n - 1 - i))) & (MAX_VOCAB - 1)
+        remapped <<= ID_BITS
+        remapped |= mapping[ids]
+    return remapped
+
+
+def _remap_shards(partials):
+    """Shard sonuçlarını (shard sırasıyla tüketerek) ortak vocabulary'ye çevirir
+
+    Returns:
+        (song_count, vocabulary, {n: [(anahtarlar, sayılar, ilk konumlar), ...]})
+    """
+    vocab = Vocabulary()
+    parts = {n: [] for n in (1, 2, 3)}
+    song_count = offset = 0
+    while partials:
+        shard_songs, tokens, token_count, arrays = partials.pop(0)
+        song_count += shard_songs
+        # Shard sırasıyla kodlamak ortak id'lerin ilk görülme sırasını korur
+        mapping = vocab.encode(tokens).astype(np.int64)
+        for n, (keys, counts, first) in arrays.items():
+            keys = _remap_keys(keys, mapping, n)
+            # Unigram'larda ilk konum id'nin kendisidir
+            parts[n].append((keys, counts, keys if n == 1 else first + offset))
+        offset += token_count
+    return song_count, vocab, parts
+
+
+def merge_shards(partials):
+    """Shard sonuçlarını (shard sırasıyla) tek bir (song_count, unigram, bigram, trigram) tablosuna birleştirir"""
+    song_count, vocab, parts = _remap_shards(partials)
+    tables = []
+    for n, arrays in parts.items():
+        table = NgramTable(n, vocab)
+        if arrays:
+            table.keys, table.counts, table.first = _reduce(*(np.concatenate(column) for column in zip(*arrays)))
+        tables.append(table)
+    return (song_count, *tables)
+
+
+def _partition(arrays, partitions):
+    """Shard dizilerini anahtar % partitions'a göre böler; tüketilen shard bırakılır"""
+    pieces = [[] for _ in range(partitions)]
+    while arrays:
+        keys, counts, first = arrays.pop()
+        bucket = keys % partitions
+        order = np.argsort(bucket, kind='stable')
+        bounds = np.searchsorted(bucket[order], np.arange(partitions + 1))
+        for number in range(partitions):
+            index = order[bounds[number]:bounds[number + 1]]
+            if len(index):
+                pieces[number].append((keys[index], counts[index], first[index]))
+    return pieces
+
+
+def merge_shards_topk(partials, top_n, partitions=TOPK_PARTITIONS):
+    """Shard sonuçlarını bölüm bölüm birleştirip her n için yalnızca top N'i tutar (MergedTable)"""
+    song_count, vocab, parts = _remap_shards(partials)
+    tables = []
+    for n, arrays in parts.items():
+        pieces = _partition(arrays, partitions)
+        best = tuple(np.empty(0, dtype=np.int64) for _ in range(3))
+        unique_count = 0
+        for number in range(partitions):
+            group, pieces[number] = pieces[number], None
+            if not group:
+                continue
+            merged = _reduce(*(np.concatenate(column) for column in zip(*group)))
+            unique_count += len(merged[0])
+            keys, counts, first = (np.concatenate(pair) for pair in zip(best, merged))
+            # Counter.most_common sırası: sayıya göre azalan, eşitlikte önce görülen
+            order = np.lexsort((first, -counts))[:top_n]
+            best = keys[order], counts[order], first[order]
+        table = NgramTable(n, vocab)
+        table.keys, table.counts, table.first = best
+        tables.append(MergedTable(table.most_common(top_n), unique_count))
+    return (song_count, *tables)
+
+
+class MergedTable:
+    """Birleşik tablodan seçilen top N ve benzersiz anahtar sayısı (Counter arayüzü)"""
+
+    def __init__(self, top_items, unique_count):
+        self.top_items = top_items
+        self.unique_count = unique_count
+
+    def __len__(self):
+        return self.unique_count
+
+    def most_common(self, top_n=None):
+        return self.top_items[:top_n]
+
+
+def count_ngrams_parallel(corpus_path, top_n, workers, merge='exact'):
+    """count_ngrams ile aynı dönüş düzeni: (song_count, unigram, bigram, trigram)"""
+    if merge not in MERGE_MODES:
+        raise ValueError(f"Bilinmeyen birleştirme modu: {merge} (seçenekler: {', '.join(MERGE_MODES)})")
+
+    create_ngrams = _load_create_ngrams()
+    if workers <= 1:
+        # Birleştirilecek kısmi sonuç yok: tek süreçli NumPy sayımı
+        song_count, *tables = count_ngrams_numpy(create_ngrams.iter_song_tokens(corpus_path))
+        if merge == 'exact':
+            return (song_count, *tables)
+        return (song_count, *(MergedTable(table.most_common(top_n), len(table)) for table in tables))
+
+    shards = make_shards(create_ngrams.list_song_ids(corpus_path), workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_count_shard, corpus_path, shard) for shard in shards]
+        partials = [future.result() for future in futures]
+    if merge == 'exact':
+        return merge_shards(partials)
+    return merge_shards_topk(partials, top_n)
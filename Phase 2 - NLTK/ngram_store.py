@@ -0,0 +1,173 @@
+"""
+Artımlı n-gram istatistikleri için kalıcı sayım tabloları
+
+Tüm 1/2/3-gram sayıları (yalnızca top N değil) tek bir ikili .npz dosyasında
+tutulur:
+
+- vocab:         Token'lar ('\\n' ile birleştirilmiş UTF-8); id = satır sırası
+- keys/counts/first{n}: Anahtara göre sıralı paketlenmiş n-gram'lar (ngram_engine
+  ile aynı int64 paketleme), sayıları ve ilk görülme konumları
+- song_ids, fingerprints, song_lengths, song_tokens: Her şarkının metin özeti ve
+  token id dizisi; değişen ya da silinen şarkının eski katkısı bunlardan çıkarılır
+
+update() yalnızca eklenen/değişen/silinen şarkıları sayar, farkları tablolara
+uygular. Sayılar ve benzersiz n-gram sayıları baştan hesaplamayla birebir aynıdır;
+eşit frekanslı n-gram'ların sırası, yeni şarkılar corpus'un sonuna eklendiği
+sürece (scraper'ın normal akışı) aynı kalır.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from ngram_engine import NgramTable, Vocabulary, _reduce, pack_ngrams
+
+STORE_VERSION = 1
+MAX_N = 3
+_NEVER = np.iinfo(np.int64).max
+
+
+def fingerprint(text):
+    """Şarkı metninin 16 baytlık özeti"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class NgramStore:
+    """Tüm n-gram sayıları + şarkı başına özet ve token id'leri"""
+
+    def __init__(self):
+        self.vocab = Vocabulary()
+        self.tables = {
+            n: (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+            for n in range(1, MAX_N + 1)
+        }
+        # song_id -> (fingerprint, token id dizisi); sıra = eklenme sırası
+        self.songs = {}
+        self.position = 0
+
+    def __len__(self):
+        return len(self.songs)
+
+    @classmethod
+    def load(cls, path):
+        store = cls()
+        with np.load(path) as data:
+            if int(data['version']) != STORE_VERSION:
+                raise ValueError(f"{path}: desteklenmeyen sürüm {int(data['version'])}")
+            vocab_blob = data['vocab'].tobytes().decode('utf-8')
+            for token in vocab_blob.split('\n') if vocab_blob else []:
+                store.vocab._add(token)
+            for n in store.tables:
+                store.tables[n] = (data[f'keys{n}'], data[f'counts{n}'], data[f'first{n}'])
+            song_ids = json.loads(data['song_ids'].tobytes().decode('utf-8'))
+            fingerprints = data['fingerprints']
+            tokens = np.split(data['song_tokens'], np.cumsum(data['song_lengths'])[:-1]) if song_ids else []
+            for song_id, fp, ids in zip(song_ids, fingerprints, tokens):
+                store.songs[song_id] = (fp.tobytes(), ids)
+            store.position = int(data['position'])
+        return store
+
+    def save(self, path):
+        """Atomik yazım: önce geçici dosya, sonra yer değiştirme"""
+        arrays = {
+            'version': np.array(STORE_VERSION),
+            'position': np.array(self.position),
+            'vocab': np.frombuffer('\n'.join(self.vocab.tokens).encode('utf-8'), dtype=np.uint8),
+            'song_ids': np.frombuffer(json.dumps(list(self.songs), ensure_ascii=False).encode('utf-8'), dtype=np.uint8),
+            'fingerprints': np.array(
+                [np.frombuffer(fp, dtype=np.uint8) for fp, _ in self.songs.values()], dtype=np.uint8
+            ).reshape(-1, 16),
+            'song_lengths': np.array([len(ids) for _, ids in self.songs.values()], dtype=np.int64),
+            'song_tokens': np.concatenate(
+                [np.empty(0, dtype=np.int32)] + [ids for _, ids in self.songs.values()]
+            ),
+        }
+        for n, (keys, counts, first) in self.tables.items():
+            arrays[f'keys{n}'], arrays[f'counts{n}'], arrays[f'first{n}'] = keys, counts, first
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    def diff(self, fingerprints):
+        """Verilen {song_id: fingerprint} ile kayıtlı durumu karşılaştırır
+
+        Returns:
+            (added, changed, removed) id listeleri
+        """
+        added, changed = [], []
+        for song_id, fp in fingerprints.items():
+            if song_id not in self.songs:
+                added.append(song_id)
+            elif self.songs[song_id][0] != fp:
+                changed.append(song_id)
+        removed = [song_id for song_id in self.songs if song_id not in fingerprints]
+        return added, changed, removed
+
+    def update(self, removed, added):
+        """Şarkı katkılarını çıkarır/ekler
+
+        Args:
+            removed: Çıkarılacak song_id'ler (değişen şarkıların eski hali dahil)
+            added: (song_id, fingerprint, tokens) listesi, corpus sırasıyla
+        """
+        deltas = {n: ([], [], []) for n in self.tables}
+
+        def collect(ids, sign, start):
+            for n, (keys, counts, first) in deltas.items():
+                if len(ids) < n:
+                    continue
+                length = len(ids) - n + 1
+                keys.append(pack_ngrams(ids, n))
+                counts.append(np.full(length, sign, dtype=np.int64))
+                if start is None:
+                    first.append(np.full(length, _NEVER, dtype=np.int64))
+                else:
+                    first.append(np.arange(start, start + length, dtype=np.int64))
+
+        for song_id in removed:
+            _, ids = self.songs.pop(song_id)
+            collect(ids, -1, None)
+
+        for song_id, fp, tokens in added:
+            ids = self.vocab.encode(tokens)
+            self.songs[song_id] = (fp, ids)
+            collect(ids, 1, self.position)
+            self.position += len(ids)
+
+        for n, (keys, counts, first) in deltas.items():
+            if keys:
+                self._apply(n, *_reduce(np.concatenate(keys), np.concatenate(counts), np.concatenate(first)))
+
+    def _apply(self, n, keys, deltas, first):
+        """Sıralı, tekil delta anahtarlarını tabloya birleştirir; sayısı 0'a düşenleri atar"""
+        table_keys, table_counts, table_first = self.tables[n]
+        pos = np.searchsorted(table_keys, keys)
+        found = np.zeros(len(keys), dtype=bool)
+        inside = pos < len(table_keys)
+        found[inside] = table_keys[pos[inside]] == keys[inside]
+
+        table_counts = table_counts.copy()
+        table_counts[pos[found]] += deltas[found]
+        table_first = table_first.copy()
+        table_first[pos[found]] = np.minimum(table_first[pos[found]], first[found])
+
+        new = ~found & (deltas > 0)
+        table_keys = np.insert(table_keys, pos[new], keys[new])
+        table_counts = np.insert(table_counts, pos[new], deltas[new])
+        table_first = np.insert(table_first, pos[new], first[new])
+
+        alive = table_counts > 0
+        self.tables[n] = (table_keys[alive], table_counts[alive], table_first[alive])
+
+    def ngram_tables(self):
+        """count_ngrams ile aynı dönüş düzeni: (song_count, unigram, bigram, trigram)"""
+        tables = []
+        for n, (keys, counts, first) in self.tables.items():
+            table = NgramTable(n, self.vocab)
+            table.keys, table.counts, table.first = keys, counts, first
+            tables.append(table)
+        return (len(self.songs), *tables)
@@ -1,6 +1,20 @@
+import asyncio
 import json
+import os
+import sys
 import time
-import requests
+
+# Phase 2'deki ortak Türkçe metin katmanı
+PHASE2_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Phase 2 - NLTK')
+sys.path.insert(0, PHASE2_DIR)
+from turkish_text import normalize_text
+
+from generation_checkpoint import GenerationCheckpoint
+from generation_backends import (BACKENDS, DEFAULT_LOCAL_BATCH_SIZE, DEFAULT_LOCAL_MODEL, LOCAL, OPENROUTER,
+                                 create_backend)
+from generation_engine import DEFAULT_CONCURRENCY, OPENROUTER_BASE_URL, GenerationEngine
+from prompt_builder import DEFAULT_LIMITS, build_prompt, get_token_counter
+from response_cache import DEFAULT_CACHE, DEFAULT_MAX_MB, ResponseCache, occurrence_indices
 
 def load_ngrams(ngram_file_path):
     """N-gram frekanslarını yükle"""
@@ -10,41 +24,40 @@ def load_ngrams(ngram_file_path):
     print(f"✓ {data['metadata']['total_songs']} şarkıdan analiz edilmiş veri yüklendi\n")
     return data
 
-def create_system_prompt(ngrams):
-    """N-gram frekanslarından sistem promptu oluştur"""
-    
-    # Top 30 kelime
-    top_words = [item['word'] for item in ngrams['top_1000_unigrams'][:300]]
-    words_str = ', '.join(top_words)
-    
-    # Top 20 bigram
-    bigrams_str = '\n'.join([f'- "{item["phrase"]}" ({item["frequency"]}x)' 
-                             for item in ngrams['top_1000_bigrams'][:200]])
-    
-    # Top 15 trigram
-    trigrams_str = '\n'.join([f'- "{item["phrase"]}" ({item["frequency"]}x)' 
-                              for item in ngrams['top_1000_trigrams'][:150]])
-    
-    prompt = f"""Sen Sagopa Kajmer'sin. İşte senin dil kullanımın ve tarzın:
+def unique_items(items, field, limit):
+    """Büyük/küçük harf farkıyla tekrarlanan öğeleri (eski n-gram çıktıları) ayıklar, ilk limit tanesini döner"""
+    seen = set()
+    result = []
+    for item in items:
+        key = normalize_text(item[field])
+        if key in seen:
+            continue
+        seen.add(key)
+        result.append(item)
+        if len(result) == limit:
+            break
+    return result
+
+SYSTEM_PROMPT_TEMPLATE = """Sen Sagopa Kajmer'sin. İşte senin dil kullanımın ve tarzın:
 
 ## EN SIK KULLANDIĞIN KELİMELER (Sıklık Sırasına Göre)
-{words_str}
+{words}
 
 ## EN SIK KULLANDIĞIN 2'Lİ İFADELER
-{bigrams_str}
+{bigrams}
 
 ## EN SIK KULLANDIĞIN 3'LÜ İFADELER
-{trigrams_str}
+{trigrams}
 
 ## STİL KURALLARI
 1. **Ruh Hali**: Derin düşünen, melankolik ama samimi - robotik değil, gerçek bir insan gibi
 2. **Dil Kullanımı**: Yukarıdaki kelime ve ifadeleri ZORLAMADAN, konuşmanın doğal akışında kullan
-3. **İfade Şekli**: 
+3. **İfade Şekli**:
    - Bazen kısa ve keskin, bazen uzun ve düşünceli ol
    - Her zaman aynı kalıpları kullanma - çeşitlilik önemli
    - Soru tipine göre tonunu ayarla (samimi sohbet vs derin felsefe)
 4. **Temalar**: Hayat, zaman, yalnızlık, varoluş - ama bunları DAYATMA, soruya uygunsa kullan
-5. **Doğallık**: 
+5. **Doğallık**:
    - Ezbere cümleler kurma, soru ne istiyorsa ona odaklan
    - Bazen tek kelimeyle bile cevap verebilirsin
    - Bazen 2-3 cümle gerekebilir, esneklik önemli
@@ -59,65 +72,97 @@ def create_system_prompt(ngrams):
 
 Şimdi soruları Sagopa Kajmer'in RUHUNDAKİ bir insan gibi yanıtla - ezbere değil, içten."""
 
-    return prompt
+def prompt_sections(ngrams):
+    """Sistem promptu bölümleri: en sık kullanılandan başlayarak sıralı satırlar"""
+    return {
+        'words': [item['word'] for item in unique_items(ngrams['top_1000_unigrams'], 'word', DEFAULT_LIMITS['words'])],
+        'bigrams': [f'- "{item["phrase"]}" ({item["frequency"]}x)'
+                    for item in unique_items(ngrams['top_1000_bigrams'], 'phrase', DEFAULT_LIMITS['bigrams'])],
+        'trigrams': [f'- "{item["phrase"]}" ({item["frequency"]}x)'
+                     for item in unique_items(ngrams['top_1000_trigrams'], 'phrase', DEFAULT_LIMITS['trigrams'])],
+    }
 
-def generate_answer(api_key, model, system_prompt, question):
-    """OpenRouter API'den cevap al"""
-    try:
-        response = requests.post(
-            url="https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": model,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": question
-                    }
-                ],
-                "max_tokens": 400,
-                "temperature": 0.9
-            }
-        )
-        
-        response.raise_for_status()
-        result = response.json()
-        
-        return result['choices'][0]['message']['content'].strip()
-    
-    except requests.exceptions.RequestException as e:
-        print(f"  ✗ API Hatası: {e}")
-        if hasattr(e.response, 'text'):
-            print(f"  ✗ Detay: {e.response.text}")
-        return None
-    except Exception as e:
-        print(f"  ✗ Beklenmeyen hata: {e}")
-        return None
+def build_system_prompt(ngrams, token_budget=None, tokenizer=None):
+    """N-gram frekanslarından token bütçeli sistem promptu oluştur (PromptBuild döner)
+
+    Args:
+        token_budget: Promptun en fazla token'ı (None = tüm bölümler)
+        tokenizer: 'estimate', HF tokenizer adı (örn. vngrs-ai/Kumru-2B) ya da sayaç fonksiyonu
+    """
+    return build_prompt(SYSTEM_PROMPT_TEMPLATE, prompt_sections(ngrams), token_budget=token_budget,
+                        counter=get_token_counter(tokenizer), joiners={'words': ', '})
+
+def create_system_prompt(ngrams):
+    """N-gram frekanslarından sistem promptu oluştur"""
+    return build_system_prompt(ngrams).text
+
+def generate_answer(api_key, model, system_prompt, question, base_url=OPENROUTER_BASE_URL):
+    """OpenRouter API'den tek bir cevap al (tekrar deneme politikası GenerationEngine'de)"""
+    with GenerationEngine(api_key, model, system_prompt, base_url=base_url, concurrency=1) as engine:
+        answer, error = asyncio.run(engine.generate(question))
+    if error:
+        print(f"  ✗ {error}")
+    return answer
 
-def process_dataset(input_jsonl, ngram_json, output_jsonl, api_key, model, delay=1.0):
-    """Dataset'i işle ve her satırı anında yaz"""
+def process_dataset(input_jsonl, ngram_json, output_jsonl, api_key, model,
+                    concurrency=DEFAULT_CONCURRENCY, rpm=None, tpm=None, ordered=True,
+                    base_url=OPENROUTER_BASE_URL, resume=True, cache_path=DEFAULT_CACHE,
+                    cache_max_mb=DEFAULT_MAX_MB, refresh_cache=False,
+                    prompt_token_budget=None, prompt_tokenizer=None, batch_size=1,
+                    backend=OPENROUTER, torch_threads=None):
+    """Dataset'i eşzamanlı işle ve her satırı hazır olur olmaz yaz
+    
+    Args:
+        concurrency: Aynı anda uçuşta tutulacak en fazla istek
+        rpm / tpm: İstemci tarafı dakikalık istek / token sınırı (None = sınırsız)
+        ordered: True ise çıktı girdi sırasıyla yazılır, değilse cevaplar geldikçe
+        base_url: OpenAI uyumlu API adresi (yerel deneme için mock_openai_server)
+        resume: True ise mevcut çıktıdaki cevaplanmış sorular atlanır ve dosyanın
+            sonuna eklenir; False ise çıktı baştan yazılır. Başarısız sorular
+            <çıktı>.retry.jsonl kuyruğuna yazılır.
+        cache_path: Cevap önbelleği (SQLite); None ise önbellek kullanılmaz
+        cache_max_mb: Önbellek boyut sınırı, aşılınca en eski kullanılanlar silinir
+        refresh_cache: True ise önbellekten okunmaz, cevaplar yeniden üretilip yazılır
+        prompt_token_budget: Sistem promptunun en fazla token'ı; n-gram bölümleri
+            sıralarına göre bu bütçeye sığdırılır (None = tüm bölümler)
+        prompt_tokenizer: Token sayacı ('estimate' ya da HF tokenizer adı, örn. vngrs-ai/Kumru-2B)
+        batch_size: Tek istekte sorulacak soru sayısı; cevabı okunamayan sorular
+            tek tek tekrar sorulur (1 = her soru ayrı istek). Yerel arka uçta
+            tek model.generate çağrısındaki soru sayısı
+        backend: 'openrouter' ya da 'local' (model = Hugging Face model adı/yolu,
+            api_key / base_url / concurrency / rpm / tpm kullanılmaz)
+        torch_threads: Yerel arka uçta CPU thread sayısı (None = torch varsayılanı)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Bilinmeyen arka uç: {backend} (seçenekler: {', '.join(BACKENDS)})")
     
     print(f"\n{'='*70}")
-    print("SAGOPA KAJMER QA DATASET GENERATOR (OpenRouter)")
+    print(f"SAGOPA KAJMER QA DATASET GENERATOR ({'Yerel model' if backend == LOCAL else 'OpenRouter'})")
     print(f"{'='*70}\n")
     
-    print(f"✓ OpenRouter API bağlantısı hazır")
-    print(f"✓ Model: {model}\n")
+    if backend == LOCAL:
+        print(f"✓ Yerel model: {model} (CPU thread: {torch_threads or 'varsayılan'})")
+        print(f"✓ Batch boyutu: {batch_size}\n")
+    else:
+        print(f"✓ API: {base_url}")
+        print(f"✓ Model: {model}")
+        print(f"✓ Eşzamanlı istek: {concurrency}, RPM: {rpm or 'sınırsız'}, TPM: {tpm or 'sınırsız'}")
+        print(f"✓ İstek başına soru: {batch_size}\n")
     
     # N-gramları yükle
     ngrams = load_ngrams(ngram_json)
     
     # Sistem promptunu oluştur
     print("🎨 Sagopa Kajmer stili sistem promptu oluşturuluyor...")
-    system_prompt = create_system_prompt(ngrams)
-    print("✓ Sistem promptu hazır\n")
+    prompt_build = build_system_prompt(ngrams, prompt_token_budget, prompt_tokenizer)
+    system_prompt = prompt_build.text
+    included = ', '.join(f"{name}: {count}" for name, count in prompt_build.included.items())
+    print(f"✓ Sistem promptu hazır: {prompt_build.tokens:,} token ({included}), özet: {prompt_build.digest}")
+    if prompt_token_budget and prompt_build.tokens > prompt_token_budget:
+        print(f"⚠ Şablon tek başına bütçeyi ({prompt_token_budget:,}) aşıyor, n-gram bölümleri boş")
+    elif prompt_build.saved_tokens:
+        print(f"✂️  Tam prompta göre istek başına {prompt_build.saved_tokens:,} token daha az")
+    print()
     
     # Input dosyasını oku
     print(f"📄 Input dosyası okunuyor: {input_jsonl}")
@@ -127,93 +172,118 @@ def process_dataset(input_jsonl, ngram_json, output_jsonl, api_key, model, delay
     total = len(lines)
     print(f"✓ {total} soru bulundu\n")
     
-    # Output dosyasını aç (write mode)
-    print(f"💾 Output dosyası: {output_jsonl}")
-    print(f"\n{'='*70}")
-    print("İŞLEM BAŞLIYOR - HER SATIR ANINDA KAYDEDİLECEK")
-    print(f"{'='*70}\n")
-    
     success_count = 0
     failed_count = 0
     
-    with open(output_jsonl, 'w', encoding='utf-8') as output_file:
-        for i, line in enumerate(lines, 1):
-            try:
-                # JSON parse
-                item = json.loads(line.strip())
-                instruction = item.get('instruction', '')
-                user_input = item.get('input', '')
-                
-                print(f"[{i}/{total}] İşleniyor...")
-                print(f"  📥 Soru: {user_input[:70]}...")
-                
-                # LLM'den cevap al
-                output = generate_answer(api_key, model, system_prompt, user_input)
-                
+    items = []
+    for i, line in enumerate(lines, 1):
+        try:
+            items.append(json.loads(line.strip()))
+        except json.JSONDecodeError as e:
+            print(f"  ✗ Satır {i}: JSON parse hatası: {e} (atlanıyor)")
+            failed_count += 1
+    
+    print(f"💾 Output dosyası: {output_jsonl}")
+    
+    cache = ResponseCache(cache_path, cache_max_mb, refresh_cache) if cache_path else None
+    if cache is not None:
+        print(f"🗄️  Cevap önbelleği: {cache_path} ({len(cache)} kayıt{', yenileme modu' if refresh_cache else ''})")
+    
+    with GenerationCheckpoint(output_jsonl, resume=resume) as checkpoint:
+        if checkpoint.repaired:
+            print(f"🔧 Çıktıdan {checkpoint.repaired} yarım/boş kayıt temizlendi")
+        pending_indices = checkpoint.pending_indices(items)
+        pending = [items[index] for index in pending_indices]
+        # Geçiş sırası tüm girdiye göre: devam ederken de tekrarlanan soru önbellekten
+        # önceki geçişin cevabını almaz
+        occurrences = occurrence_indices([item.get('input', '') for item in items])
+        skipped = len(items) - len(pending)
+        if skipped:
+            print(f"♻️  {skipped} soru zaten cevaplanmış, atlanıyor")
+        
+        print(f"\n{'='*70}")
+        print(f"İŞLEM BAŞLIYOR - {len(pending)} SORU, HER SATIR ANINDA KAYDEDİLECEK")
+        print(f"{'='*70}\n")
+        
+        start = time.perf_counter()
+        done = 0
+        
+        if backend == LOCAL:
+            options = {"model": model, "torch_threads": torch_threads}
+        else:
+            options = {"api_key": api_key, "model": model, "base_url": base_url,
+                       "concurrency": concurrency, "rpm": rpm, "tpm": tpm}
+        with create_backend(backend, system_prompt, cache=cache, batch_size=batch_size, **options) as engine:
+            
+            def write_result(index, item, output, error):
+                nonlocal success_count, failed_count, done
+                done += 1
                 if output:
-                    # Output'u ekle
-                    item['output'] = output
-                    success_count += 1
-                    
                     # ANINDA DOSYAYA YAZ
-                    output_file.write(json.dumps(item, ensure_ascii=False) + '\n')
-                    output_file.flush()  # Disk'e hemen yaz
-                    
-                    print(f"  ✓ Cevap oluşturuldu ({len(output)} karakter)")
-                    print(f"  💬 Önizleme: {output[:90]}...")
-                    print(f"  💾 Dosyaya kaydedildi!\n")
+                    checkpoint.record_success(item, output)
+                    success_count += 1
+                    print(f"[{done}/{len(pending)}] ✓ {item.get('input', '')[:50]}... ({len(output)} karakter)")
                 else:
+                    # Başarısız sorular dataset'e değil tekrar deneme kuyruğuna
+                    checkpoint.record_failure(item, error)
                     failed_count += 1
-                    # Başarısız olsa bile boş output ile kaydet
-                    item['output'] = ""
-                    output_file.write(json.dumps(item, ensure_ascii=False) + '\n')
-                    output_file.flush()
-                    print(f"  ✗ Cevap oluşturulamadı (boş kayıt yazıldı)\n")
-                
-                # Rate limiting - son satır değilse bekle
-                if i < total:
-                    time.sleep(delay)
-            
-            except json.JSONDecodeError as e:
-                print(f"  ✗ JSON parse hatası: {e}")
-                print(f"  ⚠ Satır atlanıyor\n")
-                failed_count += 1
-                continue
+                    print(f"[{done}/{len(pending)}] ✗ {item.get('input', '')[:50]}... ({error})")
             
+            try:
+                engine.run_sync(pending, write_result, ordered=ordered,
+                                occurrences=[occurrences[index] for index in pending_indices])
             except KeyboardInterrupt:
                 print(f"\n\n⚠ Kullanıcı tarafından durduruldu!")
                 print(f"✓ {success_count} satır başarıyla kaydedildi")
                 print(f"✗ {failed_count} satır başarısız")
-                print(f"📊 İlerleme: {i}/{total} satır işlendi\n")
+                print(f"📊 İlerleme: {done}/{len(pending)} satır işlendi")
+                print(f"♻️  Aynı komutla kaldığı yerden devam edebilirsiniz\n")
+                if cache is not None:
+                    cache.close()
                 return
-            
-            except Exception as e:
-                print(f"  ✗ Beklenmeyen hata: {e}")
-                print(f"  ⚠ Satır atlanıyor\n")
-                failed_count += 1
-                continue
+            stats = engine.stats
+            breaker = getattr(engine, 'breaker', None)
+    
+    elapsed = time.perf_counter() - start
+    processed = max(len(pending), 1)
     
     # Özet bilgi
     print(f"\n{'='*70}")
     print("İŞLEM TAMAMLANDI!")
     print(f"{'='*70}")
-    print(f"✓ Başarılı: {success_count}/{total}")
-    print(f"✗ Başarısız: {failed_count}/{total}")
-    print(f"📊 Başarı Oranı: {(success_count/total)*100:.1f}%")
+    print(f"✓ Başarılı: {success_count}/{len(pending)}")
+    print(f"✗ Başarısız: {failed_count}/{len(pending)}")
+    if skipped:
+        print(f"♻️  Önceden cevaplanmış: {skipped}")
+    print(f"📊 Başarı Oranı: {(success_count/processed)*100:.1f}%")
+    if failed_count:
+        print(f"🔁 Tekrar deneme kuyruğu: {checkpoint.retry_path}")
+    print(f"⏱️ Süre: {elapsed:.1f} sn ({len(pending)/max(elapsed, 1e-9):.2f} soru/sn)")
+    print(f"🔁 İstek: {stats['requests']} (429: {stats['rate_limited']}), "
+          f"token: {stats['prompt_tokens'] + stats['completion_tokens']:,}")
+    if prompt_build.saved_tokens:
+        print(f"✂️  Prompt bütçesiyle kazanılan (tahmini): {prompt_build.saved_tokens * stats['requests']:,} token")
+    if stats['batches']:
+        print(f"📦 Toplu istek: {stats['batches']}, cevabı okunamayıp tek tek sorulan: {stats['batch_fallbacks']}")
+    if stats['retries']:
+        by_class = ', '.join(f"{name}: {count}" for name, count in stats['retries_by_class'].items())
+        print(f"🔁 Tekrar deneme: {stats['retries']} ({by_class}), "
+              f"geri çekilme: {stats['backoff_seconds']:.1f} sn")
+    if breaker is not None and breaker.stats['opens']:
+        print(f"⛔ Devre kesici: {breaker.stats['opens']} kez açıldı, "
+              f"işçiler toplam {breaker.stats['wait_seconds']:.1f} sn bekledi")
+    if stats.get('generate_calls'):
+        total_tokens = stats['prompt_tokens'] + stats['padding_tokens']
+        print(f"⚙️  Yerel model: {stats['generate_calls']} generate çağrısı, "
+              f"dolgu oranı %{stats['padding_tokens'] / max(total_tokens, 1) * 100:.1f}")
+    if cache is not None:
+        print(f"🗄️  Önbellek: {cache.summary()}")
+        cache.close()
     print(f"💾 Çıktı: {output_jsonl}")
     print(f"{'='*70}\n")
 
-# ============== ANA PROGRAM ==============
-
-if __name__ == "__main__":
-    print("\n" + "="*70)
-    print("SAGOPA KAJMER QA DATASET GENERATOR (OpenRouter)")
-    print("="*70)
-    print("\n🎤 N-gram frekanslarına göre Sagopa Kajmer tarzında cevaplar üret\n")
-    
-    # Input al
-    print("Lütfen gerekli bilgileri girin:\n")
-    
+def ask_openrouter_model():
+    """OpenRouter API anahtarı ve model seçimini sorar"""
     api_key = input("🔑 OpenRouter API Key: ").strip()
     
     print("\n📋 Popüler OpenRouter modelleri:")
@@ -237,6 +307,26 @@ if __name__ == "__main__":
     }
     
     model = model_map.get(model_choice, model_choice if model_choice else 'anthropic/claude-3.5-sonnet')
+    return api_key, model
+
+# ============== ANA PROGRAM ==============
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("SAGOPA KAJMER QA DATASET GENERATOR")
+    print("="*70)
+    print("\n🎤 N-gram frekanslarına göre Sagopa Kajmer tarzında cevaplar üret\n")
+    
+    # Input al
+    print("Lütfen gerekli bilgileri girin:\n")
+    
+    backend = input("🧠 Arka uç (openrouter / local, varsayılan openrouter): ").strip().lower() or OPENROUTER
+    
+    if backend == LOCAL:
+        api_key = None
+        model = input(f"🤖 Yerel model (HF adı/yolu, varsayılan {DEFAULT_LOCAL_MODEL}): ").strip() or DEFAULT_LOCAL_MODEL
+    else:
+        api_key, model = ask_openrouter_model()
     
     input_jsonl = input("\n📄 Input JSONL (output'u boş olan sorular): ").strip()
     ngram_json = input("📊 N-gram JSON dosyası: ").strip()
@@ -245,18 +335,36 @@ if __name__ == "__main__":
     if not output_jsonl:
         output_jsonl = "LLMQADataSet.jsonl"
     
-    delay = input("\n⏱️ İstekler arası bekleme (saniye, varsayılan 1.5): ").strip()
-    delay = float(delay) if delay else 1.5
+    concurrency, rpm = DEFAULT_CONCURRENCY, None
+    if backend == LOCAL:
+        batch_size = input(f"\n📦 Batch boyutu (varsayılan {DEFAULT_LOCAL_BATCH_SIZE}): ").strip()
+        batch_size = int(batch_size) if batch_size else DEFAULT_LOCAL_BATCH_SIZE
+    else:
+        concurrency = input(f"\n⚡ Eşzamanlı istek sayısı (varsayılan {DEFAULT_CONCURRENCY}): ").strip()
+        concurrency = int(concurrency) if concurrency else DEFAULT_CONCURRENCY
+        
+        rpm = input("⏱️ Dakikalık istek sınırı (RPM, boş = sınırsız): ").strip()
+        rpm = int(rpm) if rpm else None
+        
+        batch_size = input("📦 İstek başına soru sayısı (varsayılan 1): ").strip()
+        batch_size = int(batch_size) if batch_size else 1
+    
+    prompt_token_budget = input("🧮 Sistem promptu token bütçesi (boş = sınırsız): ").strip()
+    prompt_token_budget = int(prompt_token_budget) if prompt_token_budget else None
     
     # Özet göster
     print(f"\n{'='*70}")
     print("AYARLAR ÖZETİ")
     print(f"{'='*70}")
+    print(f"🧠 Arka uç: {backend}")
     print(f"🤖 Model: {model}")
     print(f"📥 Input: {input_jsonl}")
     print(f"📊 N-gram: {ngram_json}")
     print(f"💾 Output: {output_jsonl}")
-    print(f"⏱️ Bekleme: {delay} saniye")
+    if backend != LOCAL:
+        print(f"⚡ Eşzamanlı istek: {concurrency}, RPM: {rpm or 'sınırsız'}")
+    print(f"📦 İstek başına soru: {batch_size}")
+    print(f"🧮 Prompt token bütçesi: {prompt_token_budget or 'sınırsız'}")
     print(f"{'='*70}\n")
     
     confirm = input("❓ Başlatmak istiyor musunuz? (e/h): ").strip().lower()
@@ -268,7 +376,11 @@ if __name__ == "__main__":
             output_jsonl=output_jsonl,
             api_key=api_key,
             model=model,
-            delay=delay
+            concurrency=concurrency,
+            rpm=rpm,
+            prompt_token_budget=prompt_token_budget,
+            batch_size=batch_size,
+            backend=backend
         )
     else:
         print("\n✗ İşlem iptal edildi.\n")
\ No newline at end of file
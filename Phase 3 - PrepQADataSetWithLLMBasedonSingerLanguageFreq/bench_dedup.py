@@ -0,0 +1,92 @@
+"""
+dedup_dataset benchmark'ı: MinHash + LSH ile tüm çiftlerin gerçek Jaccard karşılaştırması
+
+Sentetik veri setinde kayıtların bir kısmı önceki bir kaydın birkaç kelimesi
+değiştirilmiş kopyasıdır (LLM'in kalıp cevaplarını taklit eder). Aynı "asıl önce
+gelir" kuralıyla tam (O(n^2)) yöntem referans alınır; LSH'nin süresi, attığı
+kayıtların isabeti (precision) ve yakalama oranı (recall) raporlanır.
+
+    python bench_dedup.py --records 3000 --threshold 0.7
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+
+from dedup_dataset import DEFAULT_SHINGLE_SIZE, dedup_dataset, record_shingles
+
+WORDS = ('hayat zaman yalnızlık gece şehir ışık gölge yağmur sokak kalem kağıt söz müzik ruh yol '
+         'sessizlik umut karanlık sabah yürek acı düş rüzgar deniz duvar pencere yıldız toprak').split()
+
+
+def write_synthetic(path, records, duplicate_ratio, edits, seed=7):
+    rng = random.Random(seed)
+    items = []
+    for i in range(records):
+        if items and rng.random() < duplicate_ratio:
+            base = rng.choice(items)
+            words = base['output'].split()
+            for _ in range(edits):
+                words[rng.randrange(len(words))] = rng.choice(WORDS)
+            item = {'instruction': base['instruction'], 'input': base['input'], 'output': ' '.join(words)}
+        else:
+            item = {'instruction': 'Sagopa Kajmer gibi cevap ver',
+                    'input': ' '.join(rng.choice(WORDS) for _ in range(8)) + '?',
+                    'output': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 80)))}
+        items.append(item)
+    with open(path, 'w', encoding='utf-8') as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False) + '\n')
+    return items
+
+
+def exact_duplicates(items, threshold, shingle_size=DEFAULT_SHINGLE_SIZE):
+    """Tüm tutulan kayıtlarla gerçek Jaccard; atılacak kayıt numaraları"""
+    kept, dropped = [], set()
+    for i, item in enumerate(items):
+        current = record_shingles(item, shingle_size)
+        if any(len(current & other) / len(current | other) >= threshold for other in kept):
+            dropped.add(i)
+        else:
+            kept.append(current)
+    return dropped
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MinHash/LSH yakın tekrar benchmark'ı")
+    parser.add_argument('--records', type=int, default=3000)
+    parser.add_argument('--duplicate-ratio', type=float, default=0.3)
+    parser.add_argument('--edits', type=int, default=3, help="Tekrar kayıtlarda değiştirilen kelime sayısı")
+    parser.add_argument('--threshold', type=float, default=0.7)
+    parser.add_argument('--num-perm', type=int, default=128)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, 'dataset.jsonl'), os.path.join(tmp, 'flagged.jsonl')
+        items = write_synthetic(src, args.records, args.duplicate_ratio, args.edits)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = dedup_dataset(src, dst, args.threshold, 'flag', args.num_perm)
+        lsh_time = time.perf_counter() - start
+        with open(dst, 'r', encoding='utf-8') as f:
+            lsh = {i for i, line in enumerate(f) if 'near_duplicate_of' in json.loads(line)}
+
+        start = time.perf_counter()
+        exact = exact_duplicates(items, args.threshold)
+        exact_time = time.perf_counter() - start
+
+    hits = len(lsh & exact)
+    print(f"🧪 {args.records} kayıt, eşik {args.threshold}, imza {args.num_perm} "
+          f"(bant {stats['bands']} x {stats['rows']})\n")
+    print(f"{'Yöntem':16s} {'süre':>9s} {'atılan':>8s} {'karşılaştırma':>14s}")
+    print("-" * 50)
+    print(f"{'tam (O(n^2))':16s} {exact_time:7.2f} sn {len(exact):8d} {'-':>14s}")
+    print(f"{'MinHash + LSH':16s} {lsh_time:7.2f} sn {len(lsh):8d} {stats['candidates_checked']:14d}")
+    print()
+    print(f"Precision: {hits / len(lsh) if lsh else 1.0:.3f}   Recall: {hits / len(exact) if exact else 1.0:.3f}")
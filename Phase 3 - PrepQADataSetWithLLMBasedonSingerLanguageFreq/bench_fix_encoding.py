@@ -0,0 +1,163 @@
+"""
+fix_dataset_encoding benchmark'ı: eski (readlines + replace zinciri) ile akış halindeki temizleyici
+
+Sentetik bir veri seti üretir: kayıtların bir kısmı mojibake (UTF-8 baytları
+cp1252 diye okunmuş), bir kısmı Windows-1254 ile kodlanmış, bir kısmı boş /
+kısa / tekrar. İlk kayıt temizdir (eski yöntem encoding'i yalnızca ilk satıra
+bakarak seçiyordu). Süre, tepe bellek ve çıktıda kalan bozuk kayıt sayısı ölçülür.
+Önce repair_mojibake / fix_encoding için regresyon kontrolleri çalıştırılır.
+
+    python bench_fix_encoding.py --records 200000 --corrupt 0.3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from fix_dataset_encoding import MOJIBAKE_BYTES, MOJIBAKE_RE, fix_encoding, repair_mojibake
+
+WORDS = ['yalnızlık', 'ışık', 'gece', 'şarkı', 'gönül', 'İstanbul', 'zaman', 'hayat', 'ölüm',
+         'içimde', 'çığlık', 'Ümit', 'ŞEHİR', 'düş', 'yağmur', 'söz', 'ağaç', 'ruh']
+TO_MOJIBAKE = {byte: char for char, byte in MOJIBAKE_BYTES.items()}
+# Temiz metin: büyük Türkçe harf + cp1252 noktalaması mojibake sanılmamalı
+CLEAN_SAMPLES = ['«GÜÇ» dedi', 'Ç… bitti', 'ŞİİR’İ “ÖZGÜR” yazdı', 'naïve café', 'ığüşöç İĞÜŞÖÇ']
+
+
+def legacy_fix_encoding(input_file, output_file, min_output_length=20):
+    """fix_dataset_encoding.py'nin önceki algoritması (referans, çıktısız)"""
+    encodings_to_try = ['utf-8', 'latin-1', 'windows-1254', 'iso-8859-9']
+    successful_encoding = None
+    for enc in encodings_to_try:
+        try:
+            with open(input_file, 'r', encoding=enc) as f:
+                lines = f.readlines()
+                test_data = json.loads(lines[0])
+                text = test_data['input'] + test_data['output']
+                if 'Ã' in text or 'Ä' in text or 'Å' in text:
+                    continue
+                successful_encoding = enc
+                break
+        except Exception:
+            continue
+    manual_fix = not successful_encoding
+    successful_encoding = successful_encoding or 'utf-8'
+
+    with open(input_file, 'r', encoding=successful_encoding) as f:
+        lines = f.readlines()
+    replacements = {
+        'Ä±': 'ı', 'Ä°': 'İ', 'ÅŸ': 'ş', 'Åž': 'Ş', 'Ã§': 'ç', 'Ã‡': 'Ç', 'ÄŸ': 'ğ',
+        'Äž': 'Ğ', 'Ã¶': 'ö', 'Ã–': 'Ö', 'Ã¼': 'ü', 'Ãœ': 'Ü', 'Ä±m': 'ım', 'Ä±n': 'ın',
+    }
+    dataset = []
+    for line in lines:
+        try:
+            data = json.loads(line.strip())
+        except json.JSONDecodeError:
+            continue
+        instruction, user_input, output = data.get('instruction', ''), data.get('input', ''), data.get('output', '')
+        if manual_fix:
+            for wrong, correct in replacements.items():
+                instruction = instruction.replace(wrong, correct)
+                user_input = user_input.replace(wrong, correct)
+                output = output.replace(wrong, correct)
+        if not output.strip() or len(output.strip()) < min_output_length:
+            continue
+        dataset.append({'instruction': instruction.strip(), 'input': user_input.strip(), 'output': output.strip()})
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for item in dataset:
+            f.write(json.dumps(item, ensure_ascii=False) + '\n')
+
+
+def mojibake(text):
+    return ''.join(TO_MOJIBAKE[b] for b in text.encode('utf-8'))
+
+
+def write_synthetic(path, records, corrupt, legacy, seed=7):
+    rng = random.Random(seed)
+    with open(path, 'wb') as f:
+        for i in range(records):
+            question = ' '.join(rng.choice(WORDS) for _ in range(6)) + f' {i}?'
+            answer = ' '.join(rng.choice(WORDS) for _ in range(rng.choice([0, 3, 30, 40])))
+            if rng.random() < 0.02 and i:
+                question = question.replace(f' {i}?', f' {i - 1}?')
+            item = {'instruction': 'Sagopa Kajmer gibi cevap ver', 'input': question, 'output': answer}
+            roll = rng.random() if i else 1.0
+            if roll < corrupt:
+                item = {key: mojibake(value) for key, value in item.items()}
+            line = json.dumps(item, ensure_ascii=False) + '\n'
+            if corrupt <= roll < corrupt + legacy:
+                f.write(line.encode('windows-1254', errors='replace'))
+            else:
+                f.write(line.encode('utf-8'))
+
+
+def residual(path):
+    """Çıktıda hâlâ mojibake içeren kayıt sayısı"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return sum(1 for line in f if MOJIBAKE_RE.search(line))
+
+
+def check_regressions(tmp):
+    """repair_mojibake ve fix_encoding için bilinen hatalı durumlar; hata varsa AssertionError"""
+    for text in CLEAN_SAMPLES:
+        assert repair_mojibake(text) == text, f"temiz metin bozuldu: {text!r} -> {repair_mojibake(text)!r}"
+        broken = mojibake(text)
+        assert repair_mojibake(broken) == text, f"geri çevrilemedi: {broken!r} -> {repair_mojibake(broken)!r}"
+        mixed = f"{text} / {broken}"
+        assert repair_mojibake(mixed) == f"{text} / {text}", f"karışık alan: {mixed!r} -> {repair_mojibake(mixed)!r}"
+    # null alanlar çalışmayı durdurmamalı, boş output sayılmalı; aynı sorunun farklı cevapları korunmalı
+    src, dst = os.path.join(tmp, 'nulls.jsonl'), os.path.join(tmp, 'nulls.out.jsonl')
+    with open(src, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'instruction': None, 'input': 'soru?', 'output': None}) + '\n')
+        f.write(json.dumps({'instruction': 'x', 'input': None, 'output': 'yeterince uzun bir cevap metni'}) + '\n')
+        for answer in ('birinci uzun cevap metni burada', 'ikinci uzun cevap metni burada'):
+            f.write(json.dumps({'instruction': 'x', 'input': 'Nasılsın?', 'output': answer}) + '\n')
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = fix_encoding(src, dst)
+    assert stats['empty_output'] == 1 and stats['valid'] == 3 and stats['json_error'] == 0, stats
+    print(f"✓ Regresyon kontrolleri ({len(CLEAN_SAMPLES)} temiz metin, null alanlar, tekrarlanan soru)\n")
+
+
+def measure(label, func, src, dst):
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func(src, dst)
+            elapsed = time.perf_counter() - start
+            tracemalloc.start()
+            func(src, dst)
+            peak = tracemalloc.get_traced_memory()[1]
+    except UnicodeDecodeError as e:
+        # Eski yöntem karışık encoding'li dosyada tüm dosyayı okuyamıyordu
+        print(f"{label:24s} ❌ {type(e).__name__}: {e.reason} (bayt {e.start})")
+        return
+    finally:
+        tracemalloc.stop()
+    with open(dst, 'rb') as f:
+        rows = sum(1 for _ in f)
+    print(f"{label:24s} {elapsed:8.2f} sn {peak / 1024 / 1024:9.1f} MB {rows:9d} {residual(dst):9d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Encoding düzeltici benchmark'ı")
+    parser.add_argument('--records', type=int, default=200_000)
+    parser.add_argument('--corrupt', type=float, default=0.3, help="Mojibake kayıt oranı")
+    parser.add_argument('--legacy', type=float, default=0.05, help="Windows-1254 ile yazılmış kayıt oranı")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_regressions(tmp)
+        src = os.path.join(tmp, 'dataset.jsonl')
+        write_synthetic(src, args.records, args.corrupt, args.legacy)
+        print(f"🧪 {args.records:,} kayıt, {os.path.getsize(src) / 1024 / 1024:.1f} MB "
+              f"(%{args.corrupt * 100:.0f} mojibake, %{args.legacy * 100:.0f} Windows-1254)\n")
+        print(f"{'Yöntem':24s} {'süre':>11s} {'tepe bellek':>12s} {'satır':>9s} {'bozuk':>9s}")
+        print("-" * 70)
+        measure("eski (readlines)", legacy_fix_encoding, src, os.path.join(tmp, 'legacy.jsonl'))
+        measure("akış (tek geçiş)", fix_encoding, src, os.path.join(tmp, 'stream.jsonl'))
@@ -0,0 +1,83 @@
+"""
+Üretim motorunu hata enjekte eden sahte sunucuya karşı çalıştırır
+
+Tekrar deneme politikası ve devre kesicinin davranışını gerçek API'ye gitmeden
+ölçer: başarı oranı, tekrar deneme sayıları, geri çekilmede ve devre açıkken
+geçen süre.
+
+    python bench_generation.py --questions 200 --rate-429 0.1 --rate-5xx 0.05 --rate-drop 0.02
+    python bench_generation.py --questions 100 --outage-start 1 --outage-seconds 3
+    python bench_generation.py --questions 200 --batch-size 5 --rate-bad-batch 0.1 --rate-garbage-batch 0.05
+"""
+
+import argparse
+import time
+
+from generation_engine import GenerationEngine
+from mock_openai_server import start_server
+from retry_policy import CircuitBreaker, RetryPolicy
+
+
+def run(args):
+    outage = (args.outage_start, args.outage_seconds) if args.outage_start is not None else None
+    server, base_url = start_server(
+        latency=args.latency, rate_429=args.rate_429, retry_after=args.retry_after,
+        rate_5xx=args.rate_5xx, rate_drop=args.rate_drop, rate_garbage=args.rate_garbage,
+        rate_slow=args.rate_slow, slow_seconds=args.timeout * 2, outage=outage,
+        rate_bad_batch=args.rate_bad_batch, rate_garbage_batch=args.rate_garbage_batch
+    )
+    items = [{"input": f"soru {i}"} for i in range(args.questions)]
+    results = []
+
+    policy = RetryPolicy(base_delay=args.base_delay, max_delay=args.max_delay, seed=0)
+    breaker = CircuitBreaker(failure_threshold=args.breaker_threshold, cooldown=args.breaker_cooldown)
+    start = time.perf_counter()
+    with GenerationEngine('test', 'mock', 'Sen bir test asistanısın.', base_url=base_url,
+                          concurrency=args.concurrency, retry_policy=policy, breaker=breaker,
+                          timeout=args.timeout, batch_size=args.batch_size) as engine:
+        engine.run_sync(items, lambda index, item, answer, error: results.append((answer, error)))
+        stats = engine.stats
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    succeeded = sum(1 for answer, _ in results if answer)
+    print(f"✓ Başarılı: {succeeded}/{len(items)} ({succeeded / len(items) * 100:.1f}%)")
+    print(f"⏱️ Süre: {elapsed:.1f} sn, istek: {stats['requests']}")
+    if stats['batches']:
+        print(f"📦 Toplu istek: {stats['batches']}, tek tek tekrar sorulan: {stats['batch_fallbacks']}")
+    print(f"🔁 Tekrar deneme: {stats['retries']} {stats['retries_by_class']}, "
+          f"geri çekilme: {stats['backoff_seconds']:.1f} sn")
+    print(f"⛔ Devre kesici: {breaker.stats['opens']} kez açıldı, "
+          f"işçiler toplam {breaker.stats['wait_seconds']:.1f} sn bekledi")
+    errors = {}
+    for _, error in results:
+        if error:
+            key = error.split(':')[0]
+            errors[key] = errors.get(key, 0) + 1
+    if errors:
+        print(f"✗ Başarısız: {errors}")
+    return succeeded, stats, breaker.stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tekrar deneme / devre kesici denemesi")
+    parser.add_argument('--questions', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--timeout', type=float, default=1.0)
+    parser.add_argument('--rate-429', type=float, default=0.1)
+    parser.add_argument('--retry-after', type=int, default=0)
+    parser.add_argument('--rate-5xx', type=float, default=0.05)
+    parser.add_argument('--rate-drop', type=float, default=0.02)
+    parser.add_argument('--rate-garbage', type=float, default=0.02)
+    parser.add_argument('--rate-slow', type=float, default=0.01)
+    parser.add_argument('--batch-size', type=int, default=1)
+    parser.add_argument('--rate-bad-batch', type=float, default=0.0)
+    parser.add_argument('--rate-garbage-batch', type=float, default=0.0)
+    parser.add_argument('--outage-start', type=float)
+    parser.add_argument('--outage-seconds', type=float, default=3.0)
+    parser.add_argument('--base-delay', type=float, default=0.1)
+    parser.add_argument('--max-delay', type=float, default=2.0)
+    parser.add_argument('--breaker-threshold', type=int, default=5)
+    parser.add_argument('--breaker-cooldown', type=float, default=1.0)
+    run(parser.parse_args())
@@ -0,0 +1,274 @@
+"""
+QA veri setinde yakın tekrarları (near-duplicate) MinHash + LSH ile bulur
+
+LLM cevapları aynı kalıp cümleleri çok tekrarlar; fix_dataset_encoding tekrar
+eden kayıtları atmaz. Bu adım:
+
+- Her kaydı kelime shingle'larına böler (soru 'q:', cevap 'a:' önekiyle, Türkçe
+  küçük harf, phase 2 tokenizer'ı)
+- num_perm hash fonksiyonuyla MinHash imzası çıkarır (numpy, tek vektör işlemi);
+  iki imzanın eşit konum oranı Jaccard benzerliğinin tahminidir
+- İmzayı b banda (her biri r satır) böler: aynı bantta birebir eşleşen kayıtlar
+  aday olur. Her kayıt yalnızca kendi kovasındakilerle karşılaştırılır, yani süre
+  kayıt sayısıyla ~doğrusaldır (tüm çiftler yerine)
+- Adaylar shingle hash'leri üzerinden gerçek Jaccard ile doğrulanır; bu yüzden
+  (b, r) yanlış negatifi daha ağır cezalandıran ağırlıklı hata alanına göre seçilir
+  (fazladan aday yalnızca süre harcar, kaçan tekrar ise veri setinde kalır)
+- Eşiğin üstündeki en benzer kayıt "asıl" sayılır. Yalnızca asıl kayıtlar indekse
+  girer; böylece A~B~C zinciri C'yi A'dan uzaklaştırıp kümeyi kaydırmaz
+- Hiç shingle'ı olmayan (harfsiz) kayıtlar indekse girmez: hepsinin imzası aynı
+  olurdu ve her biri öncekilerin tümüyle karşılaştırılırdı. İlki tutulur, sonrakiler
+  onun birebir tekrarı (benzerlik 1) sayılır
+
+Dosya akış halinde işlenir; bellekte yalnızca tutulan kayıtların shingle hash'leri
+(kayıt başına birkaç yüz bayt) ve LSH kovaları vardır.
+
+    python dedup_dataset.py LoRAReadyToUseDataSet_FIXED.jsonl LoRAReadyToUseDataSet_DEDUP.jsonl --threshold 0.7
+    python dedup_dataset.py in.jsonl flagged.jsonl --mode flag
+"""
+
+import json
+import os
+import sys
+import zlib
+
+import numpy as np
+
+# Phase 2'deki ortak Türkçe metin katmanı
+PHASE2_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Phase 2 - NLTK')
+sys.path.insert(0, PHASE2_DIR)
+from turkish_text import tokenize
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 3
+DEFAULT_SEED = 1
+# optimal_bands'te yanlış negatif alanının ağırlığı (yanlış pozitif: 1 - bu)
+FALSE_NEGATIVE_WEIGHT = 0.8
+MODES = ('drop', 'flag')
+PREVIEW_COUNT = 3
+
+# 2^32'den küçük en büyük asal: a*x + b (a, x < 2^32) uint64'e taşmadan sığar
+PRIME = np.uint64(4294967291)
+
+
+def shingles(text, size=DEFAULT_SHINGLE_SIZE):
+    """Metnin kelime size-gram kümesi (daha kısa metin tek shingle olur)"""
+    tokens = tokenize(text, min_length=1)
+    if len(tokens) <= size:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def record_shingles(item, size=DEFAULT_SHINGLE_SIZE):
+    """Soru ve cevap shingle'larının birleşimi (alan önekiyle ayrı tutulur)"""
+    return ({'q:' + s for s in shingles(item.get('input') or '', size)}
+            | {'a:' + s for s in shingles(item.get('output') or '', size)})
+
+
+def shingle_hashes(shingle_set):
+    """Shingle kümesinin sıralı, tekil 32-bit hash dizisi"""
+    return np.unique(np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingle_set),
+                                 dtype=np.uint64, count=len(shingle_set)))
+
+
+def jaccard(hashes, other):
+    """İki sıralı, tekil hash dizisinin Jaccard benzerliği"""
+    if not len(hashes) or not len(other):
+        return 0.0
+    common = len(np.intersect1d(hashes, other, assume_unique=True))
+    return common / (len(hashes) + len(other) - common)
+
+
+class MinHasher:
+    """num_perm adet (a*x + b) mod p hash fonksiyonuyla MinHash imzası"""
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, seed=DEFAULT_SEED):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, int(PRIME), size=(num_perm, 1), dtype=np.uint64)
+        self.b = rng.integers(0, int(PRIME), size=(num_perm, 1), dtype=np.uint64)
+
+    def signature(self, hashes):
+        """shingle_hashes çıktısından uint32 imza (boş dizi için tümü en büyük değer)"""
+        if not len(hashes):
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        return ((self.a * hashes + self.b) % PRIME).min(axis=1).astype(np.uint32)
+
+
+def _collision_probability(s, bands, rows):
+    return 1 - (1 - s ** rows) ** bands
+
+
+def optimal_bands(threshold, num_perm=DEFAULT_NUM_PERM, false_negative_weight=FALSE_NEGATIVE_WEIGHT, steps=200):
+    """Eşik için (bant, satır): ağırlıklı yanlış pozitif + yanlış negatif alanı en küçük olan
+
+    Yanlış pozitif alanı: benzerlik < eşik iken aday olma olasılığının integrali;
+    yanlış negatif: benzerlik >= eşik iken aday olmama olasılığının integrali.
+    """
+    low = np.linspace(0, threshold, steps)
+    high = np.linspace(threshold, 1, steps)
+    best, best_error = None, float('inf')
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_pos = _collision_probability(low, bands, rows).mean() * threshold
+            false_neg = (1 - _collision_probability(high, bands, rows)).mean() * (1 - threshold)
+            error = (1 - false_negative_weight) * false_pos + false_negative_weight * false_neg
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class LSHIndex:
+    """Bantlı LSH: her bant için imza dilimi -> kayıt listesi"""
+
+    def __init__(self, bands, rows):
+        self.bands = bands
+        self.rows = rows
+        self.buckets = [{} for _ in range(bands)]
+
+    def _keys(self, signature):
+        r = self.rows
+        return [signature[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def query(self, signature):
+        """Herhangi bir bantta aynı kovaya düşen kayıtlar"""
+        candidates = set()
+        for bucket, key in zip(self.buckets, self._keys(signature)):
+            candidates.update(bucket.get(key, ()))
+        return candidates
+
+    def insert(self, key, signature):
+        for bucket, band_key in zip(self.buckets, self._keys(signature)):
+            bucket.setdefault(band_key, []).append(key)
+
+
+class NearDuplicateFinder:
+    """Kayıtları sırayla alır; her biri için (asıl kaydın numarası, benzerlik) ya da None döner"""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                 shingle_size=DEFAULT_SHINGLE_SIZE, seed=DEFAULT_SEED):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self.index = LSHIndex(self.bands, self.rows)
+        self.hashes = {}
+        self.empty_key = None
+        self.candidates_checked = 0
+
+    def add(self, key, item):
+        hashes = shingle_hashes(record_shingles(item, self.shingle_size))
+        if not len(hashes):
+            if self.empty_key is None:
+                self.empty_key = key
+                return None
+            return self.empty_key, 1.0
+        signature = self.hasher.signature(hashes)
+        best = None
+        candidates = self.index.query(signature)
+        self.candidates_checked += len(candidates)
+        for other in sorted(candidates):
+            similarity = jaccard(hashes, self.hashes[other])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (other, similarity)
+        if best is None:
+            self.hashes[key] = hashes
+            self.index.insert(key, signature)
+        return best
+
+
+def dedup_dataset(input_file, output_file, threshold=DEFAULT_THRESHOLD, mode='drop',
+                  num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE, seed=DEFAULT_SEED):
+    """
+    Yakın tekrarları atar (mode='drop') ya da işaretler (mode='flag')
+
+    flag modunda tüm kayıtlar yazılır; tekrar olanlara 'near_duplicate_of'
+    (asıl kaydın 0'dan başlayan sıra numarası) ve 'similarity' alanları eklenir.
+
+    Args:
+        input_file: JSONL veri seti (instruction / input / output)
+        output_file: Çıktı JSONL
+        threshold: Jaccard benzerliği eşiği (0-1)
+        mode: 'drop' ya da 'flag'
+        num_perm: MinHash imza uzunluğu (büyüdükçe daha çok bant, daha az kaçan tekrar)
+        shingle_size: Shingle kelime sayısı
+
+    Returns:
+        dict: İstatistikler
+    """
+    if mode not in MODES:
+        raise ValueError(f"Bilinmeyen mod: {mode} (seçenekler: {', '.join(MODES)})")
+    finder = NearDuplicateFinder(threshold, num_perm, shingle_size, seed)
+    stats = {'total': 0, 'kept': 0, 'near_duplicate': 0, 'json_error': 0}
+    preview = []
+
+    print("=" * 80)
+    print("YAKIN TEKRAR TEMİZLİĞİ (MinHash + LSH)")
+    print("=" * 80)
+    print(f"📖 Okunuyor: {input_file}")
+    print(f"⚙️  Eşik: {threshold}, imza: {num_perm}, bant: {finder.bands} x {finder.rows} satır, "
+          f"shingle: {shingle_size} kelime, mod: {mode}")
+
+    originals = {}
+    with open(input_file, 'r', encoding='utf-8') as src, open(output_file, 'w', encoding='utf-8') as dst:
+        for line in src:
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                stats['json_error'] += 1
+                continue
+            key = stats['total']
+            stats['total'] += 1
+
+            match = finder.add(key, item)
+            if match is None:
+                stats['kept'] += 1
+                originals[key] = item.get('input') or ''
+                dst.write(json.dumps(item, ensure_ascii=False) + '\n')
+                continue
+
+            stats['near_duplicate'] += 1
+            original, similarity = match
+            if len(preview) < PREVIEW_COUNT:
+                preview.append((originals[original], item.get('input') or '', similarity))
+            if mode == 'flag':
+                item = {**item, 'near_duplicate_of': original, 'similarity': round(similarity, 3)}
+                dst.write(json.dumps(item, ensure_ascii=False) + '\n')
+
+    stats['candidates_checked'] = finder.candidates_checked
+    stats['bands'], stats['rows'] = finder.bands, finder.rows
+
+    print("-" * 80)
+    print(f"Toplam kayıt:           {stats['total']}")
+    print(f"Tutulan:                {stats['kept']} ✓")
+    print(f"Yakın tekrar:           {stats['near_duplicate']}" + (" (işaretlendi)" if mode == 'flag' else " (atıldı)"))
+    print(f"JSON parse hatası:      {stats['json_error']}")
+    if stats['total']:
+        print(f"Karşılaştırma:          {stats['candidates_checked']} aday "
+              f"(tüm çiftler: {stats['total'] * (stats['total'] - 1) // 2})")
+    for original, duplicate, similarity in preview:
+        print(f"\n  ≈ {similarity:.2f}")
+        print(f"  Asıl:   {original[:80]}")
+        print(f"  Tekrar: {duplicate[:80]}")
+    print()
+    print(f"✅ {output_file}")
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="QA veri setinde MinHash/LSH ile yakın tekrar temizliği")
+    parser.add_argument('input', help="JSONL veri seti (örn. fix_dataset_encoding çıktısı)")
+    parser.add_argument('output', help="Çıktı JSONL")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Jaccard benzerlik eşiği")
+    parser.add_argument('--mode', choices=MODES, default='drop', help="drop: at, flag: işaretleyip tut")
+    parser.add_argument('--num-perm', type=int, default=DEFAULT_NUM_PERM, help="MinHash imza uzunluğu")
+    parser.add_argument('--shingle-size', type=int, default=DEFAULT_SHINGLE_SIZE, help="Shingle kelime sayısı")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    dedup_dataset(args.input, args.output, args.threshold, args.mode, args.num_perm, args.shingle_size, args.seed)
@@ -2,20 +2,97 @@
 # -*- coding: utf-8 -*-
 """
 Sagopa Kajmer Dataset Encoding Düzeltme ve Temizleme Script'i
+
+Dosya satır satır, tek geçişte işlenir (bellek kullanımı dosya boyutundan bağımsız):
+
+- Her satır önce UTF-8, olmazsa Windows-1254 (Türkçe) olarak çözülür
+- Her alanda mojibake (UTF-8 baytlarının cp1252/latin-1 diye okunmuş hali,
+  örn. 'Ä±' -> 'ı', 'ÅŸ' -> 'ş') önceden derlenmiş regex ile bulunur; alanın
+  tamamı bozuksa tek seferde, değilse yalnızca bozuk parçalar bayta geri
+  çevrilip UTF-8 olarak çözülür
+- Geçerli satırlar okundukça çıktıya yazılır; aynı sorunun farklı cevapları
+  korunur (yakın tekrar temizliği dedup_dataset.py'nin işidir)
 """
 
 import json
+import os
+import re
 import sys
-from pathlib import Path
+from functools import lru_cache
+
+LEGACY_ENCODING = 'windows-1254'
+PREVIEW_COUNT = 3
+
+
+def _byte_table():
+    """Karakter -> bayt: cp1252'nin tanımlı baytları, tanımsız olanlar latin-1 gibi"""
+    table = {}
+    for byte in range(256):
+        try:
+            char = bytes([byte]).decode('cp1252')
+        except UnicodeDecodeError:
+            char = chr(byte)
+        table[char] = byte
+    return table
+
+
+MOJIBAKE_BYTES = _byte_table()
+# UTF-8 devam baytlarının (0x80-0xBF) mojibake karşılıkları
+_CONT = '[' + re.escape(''.join(c for c, b in MOJIBAKE_BYTES.items() if 0x80 <= b <= 0xBF)) + ']'
+# Yalnızca Türkçe/Latin metnin gerçekten ürettiği öncü baytlar kabul edilir:
+# Â/Ã/Ä/Å (U+0080-U+017F: ç ğ ı ö ş ü İ ...), â (U+2000-U+2FFF: ’ “ … €), ð (emoji).
+# Diğerleri (Ç, Ü, à ...) temiz metinde noktalamadan önce de geçer: "«GÜÇ»" bozulmamalı
+MOJIBAKE_RE = re.compile(
+    f'(?:[\u00c2-\u00c5]{_CONT}|\u00e2{_CONT}{{2}}|\u00f0{_CONT}{{3}})+'
+)
+# Ön kontrol: temiz alanların çoğu (düzgün Türkçe dahil) bununla hiç eşleşmez
+_SUSPECT_RE = re.compile(f'[\u00c2-\u00c5\u00e2\u00f0]{_CONT}')
+# Geri çevrilmiş metinde bu aralıkların dışındaki karakter, çevirinin yanlış olduğunu gösterir
+_IMPLAUSIBLE_RE = re.compile('[^\u0000-\u017f\u2000-\u2fff\U00010000-\U0003ffff]')
+
+
+@lru_cache(maxsize=4096)
+def _decode_run(run):
+    try:
+        return bytes(MOJIBAKE_BYTES[c] for c in run).decode('utf-8')
+    except UnicodeDecodeError:
+        return run
+
+
+def repair_mojibake(text):
+    """Metindeki mojibake parçalarını düzeltir (bozuk parça yoksa metni aynen döner)"""
+    if not _SUSPECT_RE.search(text):
+        return text
+    # Alanın tamamı bozuksa tek seferde (C hızında) geri çevrilir
+    try:
+        fixed = text.encode('cp1252').decode('utf-8')
+        if not _IMPLAUSIBLE_RE.search(fixed):
+            return fixed
+    except UnicodeError:
+        pass
+    # Karışık alan: yalnızca bozuk parçalar
+    return MOJIBAKE_RE.sub(lambda m: _decode_run(m.group(0)), text)
+
+
+def decode_line(raw):
+    """Satırı UTF-8, olmazsa Windows-1254 ile çözer; (metin, eski_encoding_mi) döner"""
+    try:
+        return raw.decode('utf-8'), False
+    except UnicodeDecodeError:
+        return raw.decode(LEGACY_ENCODING, errors='replace'), True
+
 
 def fix_encoding(input_file, output_file, min_output_length=20):
     """
-    Dataset'teki encoding sorununu düzelt ve temizle
+    Dataset'teki encoding sorununu düzelt ve temizle (akış halinde, tek geçiş)
     
     Args:
         input_file: Bozuk dataset dosyası
         output_file: Düzeltilmiş dataset dosyası
         min_output_length: Minimum output uzunluğu (daha kısa olanlar atılır)
+    
+    Returns:
+        dict: İstatistikler
     """
     
     print("=" * 80)
@@ -23,50 +100,6 @@ def fix_encoding(input_file, output_file, min_output_length=20):
     print("=" * 80)
     print()
     
-    # Farklı encoding'leri dene
-    encodings_to_try = ['utf-8', 'latin-1', 'windows-1254', 'iso-8859-9']
-    
-    dataset = []
-    successful_encoding = None
-    
-    # Encoding'i bul
-    print("🔍 Doğru encoding bulunuyor...")
-    for enc in encodings_to_try:
-        try:
-            with open(input_file, 'r', encoding=enc) as f:
-                lines = f.readlines()
-                # İlk satırı test et
-                test_data = json.loads(lines[0])
-                # Türkçe karakter kontrolü
-                text = test_data['input'] + test_data['output']
-                if 'Ã' in text or 'Ä' in text or 'Å' in text:
-                    # Hala bozuk karakterler var, doğru encoding değil
-                    continue
-                successful_encoding = enc
-                print(f"✓ Doğru encoding bulundu: {enc}")
-                break
-        except:
-            continue
-    
-    if not successful_encoding:
-        # Hiçbir encoding çalışmadı, manuel düzeltme yap
-        print("⚠️  Otomatik encoding bulunamadı, manuel düzeltme yapılacak...")
-        successful_encoding = 'utf-8'
-        manual_fix = True
-    else:
-        manual_fix = False
-    
-    print()
-    print(f"📖 Dataset okunuyor: {input_file}")
-    
-    # Dataset'i oku
-    with open(input_file, 'r', encoding=successful_encoding) as f:
-        lines = f.readlines()
-    
-    total = len(lines)
-    print(f"✓ {total} satır okundu")
-    print()
-    
     # İstatistikler
     stats = {
         'total': 0,
@@ -74,82 +107,65 @@ def fix_encoding(input_file, output_file, min_output_length=20):
         'empty_output': 0,
         'short_output': 0,
         'encoding_fixed': 0,
+        'legacy_encoding': 0,
         'json_error': 0
     }
+    preview = []
     
+    print(f"📖 Dataset okunuyor: {input_file}")
+    print(f"💾 Düzeltilmiş dataset yazılıyor: {output_file}")
     print("🔧 Dataset işleniyor...")
     print("-" * 80)
     
-    for i, line in enumerate(lines, 1):
-        stats['total'] += 1
-        
-        try:
-            # JSON parse
-            data = json.loads(line.strip())
-            
-            instruction = data.get('instruction', '')
-            user_input = data.get('input', '')
-            output = data.get('output', '')
+    with open(input_file, 'rb') as src, open(output_file, 'w', encoding='utf-8') as dst:
+        for i, raw in enumerate(src, 1):
+            if not raw.strip():
+                continue
+            stats['total'] += 1
             
-            # Manuel düzeltme gerekiyorsa
-            if manual_fix:
-                # UTF-8 karakterleri düzelt
-                replacements = {
-                    'Ä±': 'ı', 'Ä°': 'İ',
-                    'ÅŸ': 'ş', 'Åž': 'Ş',
-                    'Ã§': 'ç', 'Ã‡': 'Ç',
-                    'ÄŸ': 'ğ', 'Äž': 'Ğ',
-                    'Ã¶': 'ö', 'Ã–': 'Ö',
-                    'Ã¼': 'ü', 'Ãœ': 'Ü',
-                    'Ä±m': 'ım', 'Ä±n': 'ın',
-                }
+            try:
+                line, legacy = decode_line(raw)
+                if legacy:
+                    stats['legacy_encoding'] += 1
                 
-                for wrong, correct in replacements.items():
-                    instruction = instruction.replace(wrong, correct)
-                    user_input = user_input.replace(wrong, correct)
-                    output = output.replace(wrong, correct)
+                # JSON parse
+                data = json.loads(line)
                 
-                stats['encoding_fixed'] += 1
-            
-            # Boş output kontrolü
-            if not output or output.strip() == '':
-                stats['empty_output'] += 1
-                if i <= 5:  # İlk 5'i göster
-                    print(f"  ⚠️  Satır {i}: Boş output (atlandı)")
-                continue
-            
-            # Kısa output kontrolü
-            if len(output.strip()) < min_output_length:
-                stats['short_output'] += 1
-                if i <= 5:
-                    print(f"  ⚠️  Satır {i}: Çok kısa output ({len(output)} < {min_output_length} karakter)")
+                # null / sayı gibi metin olmayan alanlar boş sayılır (boş output olarak elenir)
+                fields = [value if isinstance(value, str) else ''
+                          for value in (data.get('instruction'), data.get('input'), data.get('output'))]
+                repaired = [repair_mojibake(field) for field in fields]
+                if repaired != fields:
+                    stats['encoding_fixed'] += 1
+                instruction, user_input, output = (field.strip() for field in repaired)
+                
+                # Boş output kontrolü
+                if not output:
+                    stats['empty_output'] += 1
+                    if i <= 5:  # İlk 5'i göster
+                        print(f"  ⚠️  Satır {i}: Boş output (atlandı)")
+                    continue
+                
+                # Kısa output kontrolü
+                if len(output) < min_output_length:
+                    stats['short_output'] += 1
+                    if i <= 5:
+                        print(f"  ⚠️  Satır {i}: Çok kısa output ({len(output)} < {min_output_length} karakter)")
+                    continue
+                
+                # Geçerli veri - anında yaz
+                stats['valid'] += 1
+                item = {'instruction': instruction, 'input': user_input, 'output': output}
+                dst.write(json.dumps(item, ensure_ascii=False) + '\n')
+                if len(preview) < PREVIEW_COUNT:
+                    preview.append(item)
+                
+            except (json.JSONDecodeError, AttributeError) as e:
+                stats['json_error'] += 1
+                print(f"  ✗ Satır {i}: JSON parse hatası")
                 continue
-            
-            # Geçerli veri
-            stats['valid'] += 1
-            dataset.append({
-                'instruction': instruction.strip(),
-                'input': user_input.strip(),
-                'output': output.strip()
-            })
-            
-        except json.JSONDecodeError as e:
-            stats['json_error'] += 1
-            print(f"  ✗ Satır {i}: JSON parse hatası")
-            continue
-        except Exception as e:
-            print(f"  ✗ Satır {i}: Beklenmeyen hata - {str(e)}")
-            continue
     
     print("-" * 80)
-    print()
-    
-    # Düzeltilmiş dataset'i kaydet
-    print(f"💾 Düzeltilmiş dataset kaydediliyor: {output_file}")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        for item in dataset:
-            f.write(json.dumps(item, ensure_ascii=False) + '\n')
-    
     print("✓ Kayıt tamamlandı!")
     print()
     
@@ -162,19 +178,21 @@ def fix_encoding(input_file, output_file, min_output_length=20):
     print(f"Boş output:             {stats['empty_output']}")
     print(f"Çok kısa output:        {stats['short_output']}")
     print(f"JSON parse hatası:      {stats['json_error']}")
-    if manual_fix:
-        print(f"Encoding düzeltildi:    {stats['encoding_fixed']} satır")
+    print(f"Encoding düzeltildi:    {stats['encoding_fixed']} satır")
+    if stats['legacy_encoding']:
+        print(f"Windows-1254 satır:     {stats['legacy_encoding']}")
     print()
-    print(f"Başarı oranı:           {(stats['valid']/stats['total'])*100:.1f}%")
+    if stats['total']:
+        print(f"Başarı oranı:           {(stats['valid']/stats['total'])*100:.1f}%")
     print(f"Kaybedilen veri:        {stats['total'] - stats['valid']} örnek")
     print()
     
     # Önizleme
     print("=" * 80)
-    print("📋 DÜZELTİLMİŞ VERİ ÖRNEKLERİ (İlk 3)")
+    print(f"📋 DÜZELTİLMİŞ VERİ ÖRNEKLERİ (İlk {PREVIEW_COUNT})")
     print("=" * 80)
     
-    for i, item in enumerate(dataset[:3], 1):
+    for i, item in enumerate(preview, 1):
         print(f"\n[Örnek {i}]")
         print(f"Soru:  {item['input'][:80]}...")
         print(f"Cevap: {item['output'][:100]}...")
@@ -185,14 +203,25 @@ def fix_encoding(input_file, output_file, min_output_length=20):
     print(f"✅ {stats['valid']} temiz örnek hazır!")
     print(f"✅ Artık LoRA eğitimi için kullanabilirsiniz!")
     print()
+    return stats
 
 if __name__ == "__main__":
+    import argparse
+    
+    # Varsayılan dosyalar script'in klasöründe
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Dataset encoding düzeltme ve temizleme")
+    parser.add_argument('input', nargs='?', default=os.path.join(script_dir, 'LoRAReadyToUseDataSet.jsonl'))
+    parser.add_argument('output', nargs='?', default=os.path.join(script_dir, 'LoRAReadyToUseDataSet_FIXED.jsonl'))
+    parser.add_argument('--min-output-length', type=int, default=20, help="Minimum output uzunluğu (karakter)")
+    args = parser.parse_args()
+    
     # Dosya yolları
-    input_file = r"C:\Users\Hp\Desktop\LoRA Finetune\Phase 3 - PrepQADataSetWithLLMBasedonSingerLanguageFreq\LoRAReadyToUseDataSet.jsonl"
-    output_file = r"C:\Users\Hp\Desktop\LoRA Finetune\Phase 3 - PrepQADataSetWithLLMBasedonSingerLanguageFreq\LoRAReadyToUseDataSet_FIXED.jsonl"
+    input_file = args.input
+    output_file = args.output
     
     # Parametreler
-    min_output_length = 20  # Minimum 20 karakter output
+    min_output_length = args.min_output_length
     
     print()
     print("⚙️  AYARLAR:")
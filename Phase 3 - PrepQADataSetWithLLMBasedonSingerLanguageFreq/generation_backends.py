@@ -0,0 +1,59 @@
+"""
+Cevap üretim arka uçları (backend)
+
+DataSetCreator hangi modelin cevap ürettiğini bilmez; yalnızca şu arayüzü kullanır:
+
+- run_sync(items, on_result, ordered=True, occurrences=None): 'input' alanlı her
+  öğe için on_result(index, item, answer, error) çağırır. occurrences, her sorunun
+  girdideki geçiş sırasıdır; önbellek anahtarına girer, tekrarlanan sorunun her
+  geçişine ayrı cevap üretilir
+- stats: istek / token / toplu istek sayaçları (GenerationEngine ile aynı anahtarlar)
+- close() ve context manager
+
+Uygulamalar:
+- 'openrouter': OpenAI uyumlu API'ye eşzamanlı istek (generation_engine.GenerationEngine)
+- 'local':      Hugging Face causal LM ile CPU'da toplu generate (local_backend.LocalHFBackend)
+"""
+
+OPENROUTER = 'openrouter'
+LOCAL = 'local'
+BACKENDS = (OPENROUTER, LOCAL)
+
+DEFAULT_LOCAL_MODEL = "vngrs-ai/Kumru-2B"
+DEFAULT_LOCAL_BATCH_SIZE = 8
+
+
+class GenerationBackend:
+    """Arka uç arayüzü"""
+
+    name = None
+
+    def run_sync(self, items, on_result, ordered=True, occurrences=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def create_backend(backend, system_prompt, **options):
+    """Seçilen arka ucu oluşturur
+
+    Args:
+        backend: 'openrouter' ya da 'local'
+        options: Arka uca özgü ayarlar (openrouter: api_key, model, base_url,
+            concurrency, rpm, tpm...; local: model, device, torch_threads...).
+            cache ve batch_size ikisinde de ortaktır.
+    """
+    if backend == OPENROUTER:
+        from generation_engine import GenerationEngine
+        return GenerationEngine(system_prompt=system_prompt, **options)
+    if backend == LOCAL:
+        from local_backend import LocalHFBackend
+        return LocalHFBackend(system_prompt=system_prompt, **options)
+    raise ValueError(f"Bilinmeyen arka uç: {backend} (seçenekler: {', '.join(BACKENDS)})")
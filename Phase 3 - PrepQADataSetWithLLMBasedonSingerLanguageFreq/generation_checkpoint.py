@@ -0,0 +1,174 @@
+"""
+Dataset üretimi için çökmeye dayanıklı checkpoint / devam etme
+
+Çıktı dosyasının kendisi günlük (journal) olarak kullanılır:
+
+- Açılışta mevcut çıktı taranır, cevabı dolu soruların hash'leri kaçar kez
+  cevaplandıklarıyla sayılır; girdide aynı soru k kez geçiyorsa k. geçişi, çıktıda
+  o sorunun en az k cevabı varsa bitmiş sayılır (satır = soru + kaçıncı geçiş).
+  Yalnızca eksik satırlar API'ye gönderilir, üretilen satır sayısı değişmez
+- Çökme anında yarım kalmış son satır ve eski sürümlerin yazdığı boş cevaplı
+  kayıtlar atılarak dosya atomik olarak (geçici dosya + yer değiştirme) onarılır
+- Her kayıt O_APPEND ile tek bir write çağrısında eklenir; belirli sayıda kayıtta
+  ya da sürede bir fsync yapılır
+- Başarısız sorular dataset'e karışmaz, hata mesajıyla birlikte ayrı bir tekrar
+  deneme kuyruğuna (<çıktı>.retry.jsonl) yazılır
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+
+FSYNC_EVERY = 20
+FSYNC_INTERVAL = 5.0
+
+
+def question_key(item):
+    """Sorunun kimliği: instruction + input içeriğinin hash'i"""
+    data = json.dumps([item.get('instruction', ''), item.get('input', '')], ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def retry_path_for(output_path):
+    root, _ = os.path.splitext(output_path)
+    return root + '.retry.jsonl'
+
+
+def _atomic_rewrite(path, lines):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.writelines(line + b'\n' for line in lines)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def scan_output(path):
+    """Mevcut çıktıdaki bitmiş soruları bulur, gerekirse dosyayı onarır
+
+    Returns:
+        (soru hash'i -> bitmiş kayıt sayısı Counter'ı, atılan kayıt sayısı)
+    """
+    if not os.path.exists(path):
+        return Counter(), 0
+
+    with open(path, 'rb') as f:
+        lines = f.read().split(b'\n')
+    # Son '\n'den sonrası boş değilse yazımı yarım kalmış bir kayıttır
+    partial_tail = lines.pop()
+
+    finished = Counter()
+    keep = []
+    dropped = 1 if partial_tail else 0
+    for raw in lines:
+        try:
+            item = json.loads(raw)
+        except ValueError:
+            dropped += 1
+            continue
+        if not item.get('output'):
+            dropped += 1
+            continue
+        finished[question_key(item)] += 1
+        keep.append(raw)
+
+    if dropped:
+        _atomic_rewrite(path, keep)
+    return finished, dropped
+
+
+class AppendLog:
+    """JSONL kayıtlarını satır satır atomik ekler, periyodik olarak fsync yapar"""
+
+    def __init__(self, path, fsync_every=FSYNC_EVERY, fsync_interval=FSYNC_INTERVAL):
+        self.path = path
+        self.fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def append(self, record):
+        data = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        while data:
+            written = os.write(self.fd, data)
+            data = data[written:]
+        self.unsynced += 1
+        if self.unsynced >= self.fsync_every or time.monotonic() - self.last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        if self.unsynced:
+            os.fsync(self.fd)
+            self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        self.sync()
+        os.close(self.fd)
+
+
+class GenerationCheckpoint:
+    """Çıktı dosyası + tekrar deneme kuyruğu; hangi soruların bittiğini bilir"""
+
+    def __init__(self, output_path, retry_path=None, resume=True,
+                 fsync_every=FSYNC_EVERY, fsync_interval=FSYNC_INTERVAL):
+        self.output_path = output_path
+        self.retry_path = retry_path or retry_path_for(output_path)
+
+        if not resume and os.path.exists(output_path):
+            os.remove(output_path)
+        self.finished, self.repaired = scan_output(output_path)
+
+        # Kuyruk her çalıştırmada baştan yazılır: bitmemiş sorular zaten tekrar gönderilir
+        if os.path.exists(self.retry_path):
+            os.remove(self.retry_path)
+        self.output = AppendLog(output_path, fsync_every, fsync_interval)
+        self.retry = AppendLog(self.retry_path, fsync_every, fsync_interval)
+        self.failed = 0
+
+    def __contains__(self, item):
+        return question_key(item) in self.finished
+
+    def pending_indices(self, items):
+        """Henüz cevaplanmamış satırların items içindeki sıra numaraları"""
+        remaining = Counter(self.finished)
+        result = []
+        for index, item in enumerate(items):
+            key = question_key(item)
+            if remaining[key] > 0:
+                remaining[key] -= 1
+            else:
+                result.append(index)
+        return result
+
+    def pending(self, items):
+        """Henüz cevaplanmamış satırları sırasıyla döner (girdideki tekrarlanan sorular da ayrı satırdır)"""
+        return [items[index] for index in self.pending_indices(items)]
+
+    def record_success(self, item, output):
+        record = {k: v for k, v in item.items() if k != 'error'}
+        record['output'] = output
+        self.output.append(record)
+        self.finished[question_key(item)] += 1
+
+    def record_failure(self, item, error):
+        record = {k: v for k, v in item.items() if k != 'output'}
+        record['error'] = error or "bilinmeyen hata"
+        self.retry.append(record)
+        self.failed += 1
+
+    def close(self):
+        self.output.close()
+        self.retry.close()
+        # Hiç hata yoksa boş kuyruk dosyası bırakma
+        if not self.failed and os.path.getsize(self.retry_path) == 0:
+            os.remove(self.retry_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
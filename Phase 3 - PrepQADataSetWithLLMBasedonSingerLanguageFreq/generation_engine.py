@@ -0,0 +1,375 @@
+"""
+Eşzamanlı (asyncio) dataset üretim motoru
+
+Soruları tek tek bekleyerek sormak yerine:
+
+- Aynı anda en fazla `concurrency` istek uçuşta tutulur
+- İstemci tarafında dakikalık istek (RPM) ve token (TPM) sınırı uygulanır;
+  token bucket'lar rezervasyon tabanlıdır, her istek kendi sırasını bekler
+- Tüm istekler tek bir bağlantı havuzlu, keep-alive requests.Session'dan geçer
+  (bloklayan çağrılar bir thread havuzunda, event loop'u tıkamadan çalışır)
+- Hatalar RetryPolicy'ye göre (Retry-After, üstel geri çekilme + jitter, hata
+  sınıfı başına deneme sınırı) tekrar denenir; sağlayıcı art arda hata verirse
+  CircuitBreaker tüm işçileri bir süre durdurur
+- Sonuçlar girdi sırasıyla (ordered) ya da bittikçe (unordered) yazılır
+- İsteğe bağlı ResponseCache ile aynı istek gövdesi API'ye ikinci kez gitmez;
+  girdide tekrarlanan soruların her geçişi ayrı anahtarla önbelleğe yazılır
+- batch_size > 1 ise N soru tek istekte, JSON cevap sözleşmesiyle sorulur; sistem
+  promptu ve istek sayısı N'e bölünür. Cevabı okunamayan / eksik gelen sorular
+  tek tek tekrar sorulur
+
+Yerel deneme için mock_openai_server.py ile birlikte kullanılabilir.
+"""
+
+import asyncio
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from generation_backends import OPENROUTER, GenerationBackend
+from response_cache import occurrence_indices, request_key
+from retry_policy import (BAD_RESPONSE, CircuitBreaker, RetryPolicy, classify_exception,
+                          classify_response, parse_retry_after)
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_TOKENS = 400
+DEFAULT_TEMPERATURE = 0.9
+REQUEST_TIMEOUT = 120
+
+# Toplu (batch) istek sözleşmesi: sorular ve cevaplar kullanıcı mesajında JSON olarak
+# taşınır; sistem promptu aynı kalır (prefix cache bozulmaz)
+BATCH_INSTRUCTION = (
+    "Aşağıdaki JSON'daki her soruyu ayrı ayrı, birbirinden bağımsız olarak cevapla. "
+    "Yalnızca şu biçimde geçerli bir JSON döndür, başka hiçbir şey yazma:\n"
+    '{"cevaplar": [{"id": <sorunun id değeri>, "cevap": "<cevap metni>"}]}'
+)
+JSON_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+
+def estimate_tokens(text):
+    """Kaba token tahmini (~4 karakter = 1 token)"""
+    return max(1, len(text) // 4)
+
+
+def build_batch_message(questions):
+    """Soruları toplu istek kullanıcı mesajına çevirir (id = listedeki sıra, 1'den başlar)"""
+    payload = {"sorular": [{"id": i, "soru": q} for i, q in enumerate(questions, 1)]}
+    return BATCH_INSTRUCTION + "\n\n" + json.dumps(payload, ensure_ascii=False)
+
+
+def parse_batch_answers(content, count):
+    """Toplu cevabı doğrular, soru sırasıyla cevap listesi döner (okunamayan öğe None)
+
+    Model JSON'u kod bloğuna sarabilir ya da öncesine/sonrasına metin ekleyebilir;
+    ilk '{' ile son '}' arası okunur. id'si geçersiz, tekrarlanan ya da cevabı boş
+    olan öğeler yok sayılır.
+    """
+    answers = [None] * count
+    text = JSON_FENCE_RE.sub('', content.strip())
+    start, end = text.find('{'), text.rfind('}')
+    if start < 0 or end < start:
+        return answers
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return answers
+    entries = data.get('cevaplar') if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        return answers
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get('id')) - 1
+        except (TypeError, ValueError):
+            continue
+        answer = entry.get('cevap')
+        if 0 <= index < count and answers[index] is None and isinstance(answer, str) and answer.strip():
+            answers[index] = answer.strip()
+    return answers
+
+
+def create_session(api_key, pool_size=DEFAULT_CONCURRENCY):
+    """Bağlantı havuzlu, keep-alive kullanan ortak HTTP oturumu"""
+    session = requests.Session()
+    session.headers.update({
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    })
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class AsyncTokenBucket:
+    """Dakikalık bütçe: saniyede per_minute/60 token dolar, en fazla per_minute birikir
+
+    Tek event loop içinde kullanıldığı için kilit gerekmez. Token borca düşebilir;
+    her çağıran kendi rezervasyonunun ödenmesini bekler.
+    """
+
+    def __init__(self, per_minute):
+        self.rate = per_minute / 60
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount):
+        """amount kadar token ayırır, beklenmesi gereken süreyi döner"""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+        return -self.tokens / self.rate if self.tokens < 0 else 0
+
+    def adjust(self, amount):
+        """Tahmin ile gerçek kullanım arasındaki farkı düzeltir (negatif = iade)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class RateLimiter:
+    """İstemci tarafı RPM + TPM sınırı (ikisi de isteğe bağlı)"""
+
+    def __init__(self, rpm=None, tpm=None):
+        self.requests = AsyncTokenBucket(rpm) if rpm else None
+        self.tokens = AsyncTokenBucket(tpm) if tpm else None
+
+    async def acquire(self, estimated_tokens):
+        wait = 0
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens:
+            wait = max(wait, self.tokens.reserve(estimated_tokens))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def settle(self, estimated_tokens, actual_tokens):
+        if self.tokens:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+
+class GenerationEngine(GenerationBackend):
+    """OpenAI uyumlu chat completions API'sine eşzamanlı istek gönderen motor"""
+
+    name = OPENROUTER
+
+    def __init__(self, api_key, model, system_prompt, base_url=OPENROUTER_BASE_URL,
+                 concurrency=DEFAULT_CONCURRENCY, rpm=None, tpm=None,
+                 max_tokens=DEFAULT_MAX_TOKENS, temperature=DEFAULT_TEMPERATURE, cache=None,
+                 retry_policy=None, breaker=None, timeout=REQUEST_TIMEOUT, batch_size=1):
+        self.model = model
+        self.system_prompt = system_prompt
+        self.url = base_url.rstrip('/') + '/chat/completions'
+        self.concurrency = concurrency
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        self.session = create_session(api_key, concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.limiter = RateLimiter(rpm, tpm)
+        self.cache = cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = {
+            "requests": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "retries_by_class": {},
+            "backoff_seconds": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "batches": 0,
+            "batch_fallbacks": 0
+        }
+
+    def build_payload(self, question, max_tokens=None):
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": question}
+            ],
+            "max_tokens": max_tokens or self.max_tokens,
+            "temperature": self.temperature
+        }
+
+    def _post(self, payload):
+        return self.session.post(self.url, json=payload, timeout=self.timeout)
+
+    async def generate(self, question, occurrence=0):
+        """Tek soru için cevap üretir
+
+        Args:
+            occurrence: Sorunun girdideki kaçıncı geçişi (önbellek anahtarına girer)
+
+        Returns:
+            (cevap ya da None, hata mesajı ya da None)
+        """
+        return await self._complete(self.build_payload(question), occurrence=occurrence)
+
+    async def generate_batch(self, questions, occurrences=None):
+        """Birden çok soruyu tek istekte cevaplatır
+
+        Toplu cevapta okunamayan / eksik gelen sorular tek tek tekrar sorulur.
+
+        Returns:
+            Soru sırasıyla (cevap ya da None, hata mesajı ya da None) listesi
+        """
+        occurrences = occurrences or [0] * len(questions)
+        if len(questions) == 1:
+            return [await self.generate(questions[0], occurrences[0])]
+
+        payload = self.build_payload(build_batch_message(questions), self.max_tokens * len(questions))
+        content, error = await self._complete(
+            payload, validate=lambda text: any(parse_batch_answers(text, len(questions))),
+            occurrence=occurrences if any(occurrences) else 0)
+        self.stats["batches"] += 1
+        answers = parse_batch_answers(content, len(questions)) if content else [None] * len(questions)
+
+        results = [(answer, None) for answer in answers]
+        missing = [i for i, answer in enumerate(answers) if answer is None]
+        if missing:
+            self.stats["batch_fallbacks"] += len(missing)
+            fallback = await asyncio.gather(*(self.generate(questions[i], occurrences[i]) for i in missing))
+            for i, result in zip(missing, fallback):
+                results[i] = result
+        return results
+
+    async def _complete(self, payload, validate=None, occurrence=0):
+        """İsteği tekrar deneme / devre kesici / önbellek ile gönderir
+
+        Args:
+            validate: Cevabın önbelleğe yazılmaya uygun olup olmadığını söyleyen fonksiyon
+            occurrence: Önbellek anahtarına eklenen geçiş sırası (request_key)
+
+        Returns:
+            (cevap ya da None, hata mesajı ya da None)
+        """
+        loop = asyncio.get_running_loop()
+        cache_key = request_key(payload, occurrence) if self.cache is not None else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached, None
+        prompt_text = ''.join(message['content'] for message in payload['messages'])
+        estimated = estimate_tokens(prompt_text) + payload['max_tokens']
+
+        attempts = 0
+        class_attempts = {}
+        while True:
+            await self.breaker.acquire()
+            await self.limiter.acquire(estimated)
+            self.stats["requests"] += 1
+            attempts += 1
+            answer, error_class, error, retry_after = await self._attempt(loop, payload, estimated)
+            if error_class is None:
+                self.breaker.record_success()
+                if cache_key and answer and (validate is None or validate(answer)):
+                    self.cache.put(cache_key, answer, self.model)
+                return answer, None
+
+            self.breaker.record_failure(error_class)
+            class_attempts[error_class] = class_attempts.get(error_class, 0) + 1
+            if not self.retry_policy.should_retry(error_class, class_attempts[error_class], attempts):
+                return None, f"{error} ({attempts} deneme)"
+
+            delay = self.retry_policy.delay(attempts, retry_after)
+            self.stats["retries"] += 1
+            self.stats["retries_by_class"][error_class] = self.stats["retries_by_class"].get(error_class, 0) + 1
+            self.stats["backoff_seconds"] += delay
+            await asyncio.sleep(delay)
+
+    async def _attempt(self, loop, payload, estimated):
+        """Tek HTTP denemesi
+
+        Returns:
+            (cevap, hata sınıfı, hata mesajı, Retry-After sn) - başarıda hata sınıfı None
+        """
+        try:
+            response = await loop.run_in_executor(self.executor, self._post, payload)
+        except requests.exceptions.RequestException as e:
+            return None, classify_exception(e), f"API Hatası: {e}", None
+
+        if not response.ok:
+            error_class = classify_response(response)
+            if response.status_code == 429:
+                self.stats["rate_limited"] += 1
+            return (None, error_class, f"HTTP {response.status_code}: {response.text[:200]}",
+                    parse_retry_after(response.headers.get('Retry-After')))
+
+        try:
+            result = response.json()
+            answer = result['choices'][0]['message']['content'].strip()
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            return None, BAD_RESPONSE, f"Beklenmeyen yanıt: {e}", None
+
+        usage = result.get('usage') or {}
+        self.stats["prompt_tokens"] += usage.get('prompt_tokens', 0)
+        self.stats["completion_tokens"] += usage.get('completion_tokens', 0)
+        if 'total_tokens' in usage:
+            self.limiter.settle(estimated, usage['total_tokens'])
+        return answer, None, None, None
+
+    async def run(self, items, on_result, ordered=True, occurrences=None):
+        """Tüm öğeleri işler, her sonuç için on_result(index, item, answer, error) çağırır
+
+        Args:
+            items: 'input' alanı olan sözlükler
+            on_result: Senkron geri çağırma (dosyaya yazma vb.)
+            ordered: True ise sonuçlar girdi sırasıyla, değilse bittikçe verilir
+            occurrences: Her öğenin sorusunun girdideki geçiş sırası (devam ederken
+                tüm girdiye göre); None ise items içinde sayılır
+        """
+        items = list(items)
+        if occurrences is None:
+            occurrences = occurrence_indices([item.get('input', '') for item in items])
+        iterator = enumerate(items)
+        pending = {}
+        next_index = 0
+
+        def take_batch():
+            batch = []
+            for entry in iterator:
+                batch.append(entry)
+                if len(batch) == self.batch_size:
+                    break
+            return batch
+
+        async def worker():
+            nonlocal next_index
+            # Ortak iterator: tek event loop'ta next() atomik, uçuştaki istek sayısı = worker sayısı
+            while batch := take_batch():
+                if self.batch_size == 1:
+                    index, item = batch[0]
+                    results = [await self.generate(item.get('input', ''), occurrences[index])]
+                else:
+                    results = await self.generate_batch([item.get('input', '') for _, item in batch],
+                                                        [occurrences[index] for index, _ in batch])
+                for (index, item), (answer, error) in zip(batch, results):
+                    if not ordered:
+                        on_result(index, item, answer, error)
+                        continue
+                    pending[index] = (item, answer, error)
+                while next_index in pending:
+                    on_result(next_index, *pending.pop(next_index))
+                    next_index += 1
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    def run_sync(self, items, on_result, ordered=True, occurrences=None):
+        asyncio.run(self.run(items, on_result, ordered, occurrences))
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
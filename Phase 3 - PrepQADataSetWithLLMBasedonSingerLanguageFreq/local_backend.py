@@ -0,0 +1,206 @@
+"""
+Yerel Hugging Face modeliyle (örn. vngrs-ai/Kumru-2B) çevrimdışı cevap üretimi
+
+API'ye gitmeden veri üretmek / çoğaltmak için:
+
+- Sorular sohbet şablonuyla (tokenizer'da yoksa ChatML) prompta çevrilir
+- batch_size soruluk gruplar sola dolgulu (left padding) tek tensörde
+  model.generate'e verilir; CPU'da verim batch_size ile ayarlanır
+- Dolgu israfını azaltmak için sorular SORT_WINDOW batch'lik pencerelerde
+  prompt uzunluğuna göre sıralanıp gruplanır; sonuçlar yine girdi sırasıyla verilir
+- Bir batch hata verirse sorular tek tek denenir
+- İsteğe bağlı ResponseCache ile aynı prompt + ayarlar ikinci kez üretilmez
+  (tekrarlanan sorunun her geçişi ayrı anahtar alır)
+"""
+
+from itertools import islice
+
+try:
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+except ImportError:
+    torch = None
+    AutoModelForCausalLM = AutoTokenizer = None
+
+from generation_backends import DEFAULT_LOCAL_BATCH_SIZE, DEFAULT_LOCAL_MODEL, LOCAL, GenerationBackend
+from generation_engine import DEFAULT_MAX_TOKENS, DEFAULT_TEMPERATURE
+from response_cache import occurrence_indices, request_key
+
+# Uzunluğa göre sıralamanın yapıldığı pencere (batch sayısı)
+SORT_WINDOW = 16
+DEFAULT_TOP_P = 0.9
+DEFAULT_REPETITION_PENALTY = 1.1
+
+# Tokenizer'da sohbet şablonu yoksa kullanılan ChatML biçimi (Phase 6 testiyle aynı)
+CHATML_TEMPLATE = "<|im_start|>system\n{system}\n<|im_end|>\n<|im_start|>user\n{question}\n<|im_end|>\n<|im_start|>assistant\n"
+END_MARKER = "<|im_end|>"
+
+
+class LocalHFBackend(GenerationBackend):
+    """Hugging Face causal LM ile toplu (batched) cevap üretimi"""
+
+    name = LOCAL
+
+    def __init__(self, system_prompt, model=DEFAULT_LOCAL_MODEL, batch_size=DEFAULT_LOCAL_BATCH_SIZE,
+                 max_tokens=DEFAULT_MAX_TOKENS, temperature=DEFAULT_TEMPERATURE, top_p=DEFAULT_TOP_P,
+                 repetition_penalty=DEFAULT_REPETITION_PENALTY, device='cpu', torch_threads=None,
+                 cache=None, seed=None):
+        if torch is None:
+            raise ImportError("Yerel arka uç için 'torch' ve 'transformers' paketleri gerekli "
+                              "(pip install torch transformers)")
+        if torch_threads:
+            torch.set_num_threads(torch_threads)
+        if seed is not None:
+            torch.manual_seed(seed)
+
+        self.system_prompt = system_prompt
+        self.model_name = model
+        self.batch_size = max(1, batch_size)
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.top_p = top_p
+        self.repetition_penalty = repetition_penalty
+        self.cache = cache
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model)
+        # Decoder-only modellerde toplu üretim için dolgu solda olmalı
+        self.tokenizer.padding_side = 'left'
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.model = AutoModelForCausalLM.from_pretrained(model, torch_dtype=torch.float32).to(device)
+        self.model.eval()
+        self.device = device
+
+        self.stats = {
+            "requests": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "retries_by_class": {},
+            "backoff_seconds": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "batches": 0,
+            "batch_fallbacks": 0,
+            "generate_calls": 0,
+            "padding_tokens": 0
+        }
+
+    def build_prompt(self, question):
+        if self.tokenizer.chat_template:
+            messages = [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": question}
+            ]
+            return self.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+        return CHATML_TEMPLATE.format(system=self.system_prompt, question=question)
+
+    def _cache_key(self, prompt, occurrence=0):
+        return request_key({
+            "backend": self.name,
+            "model": self.model_name,
+            "prompt": prompt,
+            "max_new_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "repetition_penalty": self.repetition_penalty
+        }, occurrence)
+
+    def _generate(self, prompts):
+        """Tek model.generate çağrısı, prompt sırasıyla cevap listesi döner"""
+        inputs = self.tokenizer(prompts, return_tensors='pt', padding=True)
+        inputs.pop('token_type_ids', None)
+        inputs = inputs.to(self.device)
+        sampling = {"do_sample": False}
+        if self.temperature:
+            sampling = {"do_sample": True, "temperature": self.temperature, "top_p": self.top_p}
+
+        with torch.inference_mode():
+            outputs = self.model.generate(
+                **inputs,
+                max_new_tokens=self.max_tokens,
+                repetition_penalty=self.repetition_penalty,
+                pad_token_id=self.tokenizer.pad_token_id,
+                eos_token_id=self.tokenizer.eos_token_id,
+                **sampling
+            )
+
+        mask = inputs['attention_mask']
+        generated = outputs[:, mask.shape[1]:]
+        self.stats["generate_calls"] += 1
+        self.stats["prompt_tokens"] += int(mask.sum())
+        self.stats["padding_tokens"] += int(mask.numel() - mask.sum())
+        self.stats["completion_tokens"] += int((generated != self.tokenizer.pad_token_id).sum())
+
+        texts = self.tokenizer.batch_decode(generated, skip_special_tokens=True)
+        return [text.split(END_MARKER)[0].strip() for text in texts]
+
+    def generate_batch(self, prompts, occurrences=None):
+        """Prompt listesi için [(cevap ya da None, hata ya da None), ...] döner"""
+        results = [None] * len(prompts)
+        occurrences = occurrences or [0] * len(prompts)
+        keys = None
+        if self.cache is not None:
+            keys = [self._cache_key(prompt, occurrence) for prompt, occurrence in zip(prompts, occurrences)]
+        missing = []
+        for i, prompt in enumerate(prompts):
+            cached = self.cache.get(keys[i]) if keys else None
+            if cached is not None:
+                results[i] = (cached, None)
+            else:
+                missing.append(i)
+        if not missing:
+            return results
+
+        self.stats["requests"] += len(missing)
+        if len(missing) > 1:
+            self.stats["batches"] += 1
+        try:
+            answers = self._generate([prompts[i] for i in missing])
+        except (RuntimeError, ValueError) as e:
+            if len(missing) == 1:
+                results[missing[0]] = (None, f"Yerel model hatası: {e}")
+                return results
+            # Batch başarısızsa (örn. bellek) sorular tek tek denenir
+            self.stats["batch_fallbacks"] += len(missing)
+            self.stats["requests"] -= len(missing)
+            for i in missing:
+                results[i] = self.generate_batch([prompts[i]], [occurrences[i]])[0]
+            return results
+
+        for i, answer in zip(missing, answers):
+            if answer:
+                results[i] = (answer, None)
+                if keys:
+                    self.cache.put(keys[i], answer, self.model_name)
+            else:
+                results[i] = (None, "Boş cevap")
+        return results
+
+    def run_sync(self, items, on_result, ordered=True, occurrences=None):
+        """Tüm öğeleri işler, her sonuç için on_result(index, item, answer, error) çağırır
+
+        occurrences: Her sorunun girdideki geçiş sırası; None ise items içinde sayılır
+        """
+        items = list(items)
+        if occurrences is None:
+            occurrences = occurrence_indices([item.get('input', '') for item in items])
+        iterator = iter(items)
+        offset = 0
+        while window := list(islice(iterator, self.batch_size * SORT_WINDOW)):
+            prompts = [self.build_prompt(item.get('input', '')) for item in window]
+            lengths = [len(ids) for ids in self.tokenizer(prompts)['input_ids']]
+            order = sorted(range(len(window)), key=lambda i: lengths[i])
+
+            results = {}
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                batch_prompts = [prompts[i] for i in batch]
+                batch_occurrences = [occurrences[offset + i] for i in batch]
+                for i, result in zip(batch, self.generate_batch(batch_prompts, batch_occurrences)):
+                    results[i] = result
+                    if not ordered:
+                        on_result(offset + i, window[i], *result)
+            if ordered:
+                for i, item in enumerate(window):
+                    on_result(offset + i, item, *results[i])
+            offset += len(window)
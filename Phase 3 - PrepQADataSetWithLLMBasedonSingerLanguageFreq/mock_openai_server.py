@@ -0,0 +1,250 @@
+"""
+OpenAI uyumlu sahte chat completions sunucusu
+
+Dataset üretimini gerçek API'ye (ve paraya) gitmeden denemek için kullanılır.
+Her istek yapay gecikmeyle yanıtlanır; istenirse belirli bir oranda ya da
+dakikalık istek sınırı aşıldığında Retry-After başlıklı 429 döner.
+
+Tekrar deneme / devre kesici denemeleri için hata enjeksiyonu:
+- --rate-5xx:     503 dönme olasılığı
+- --rate-drop:    bağlantıyı yanıt vermeden kapatma olasılığı
+- --rate-garbage: 200 ile bozuk JSON dönme olasılığı
+- --rate-slow:    --slow-seconds kadar bekletme (istemci zaman aşımı) olasılığı
+- --outage-start / --outage-seconds: bu aralıkta tüm isteklere 503 (kesinti)
+
+Toplu (batch) istekler ({"sorular": [...]} içeren kullanıcı mesajı) JSON
+{"cevaplar": [...]} ile yanıtlanır. --rate-bad-batch olasılığıyla cevaplardan
+biri eksik bırakılır, --rate-garbage-batch olasılığıyla JSON yerine düz metin
+döner (tek tek sorma fallback'ini denemek için).
+
+    python mock_openai_server.py --port 8001 --latency 0.5 --rate-429 0.1 --rate-5xx 0.05
+
+Ardından istemci base_url olarak http://127.0.0.1:8001/v1 kullanılır.
+"""
+
+import argparse
+import json
+import re
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_PATHS = ('/v1/chat/completions', '/api/v1/chat/completions')
+BATCH_RE = re.compile(r'\{"sorular":.*\}', re.DOTALL)
+
+
+def estimate_tokens(text):
+    """Kaba token tahmini (~4 karakter = 1 token)"""
+    return max(1, len(text) // 4)
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    """Gecikme, rastgele 429, dakikalık istek sınırı ve enjekte edilen hataları simüle eder"""
+
+    latency = 0.0
+    jitter = 0.0
+    rate_429 = 0.0
+    server_rpm = None
+    retry_after = 1
+    rate_5xx = 0.0
+    rate_drop = 0.0
+    rate_garbage = 0.0
+    rate_slow = 0.0
+    slow_seconds = 5.0
+    outage = None
+    rate_bad_batch = 0.0
+    rate_garbage_batch = 0.0
+    started = 0.0
+    request_log = []
+    log_lock = threading.Lock()
+    rng = random.Random(0)
+
+    def _send_json(self, status, payload, extra_headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _rate_limited(self, now):
+        """Rastgele ya da son 60 sn'deki istek sayısı sınırı aşıldıysa True"""
+        with self.log_lock:
+            if self.rng.random() < self.rate_429:
+                return True
+            if self.server_rpm:
+                recent = [t for t, status, _ in self.request_log if status == 200 and now - t < 60]
+                return len(recent) >= self.server_rpm
+        return False
+
+    def _pick_fault(self, now):
+        """Bu istek için enjekte edilecek hata ('outage', 'drop', 'garbage', 'slow', '5xx' ya da None)"""
+        if self.outage:
+            start, duration = self.outage
+            if start <= now - self.started < start + duration:
+                return 'outage'
+        with self.log_lock:
+            roll = self.rng.random()
+        for fault, rate in (('5xx', self.rate_5xx), ('drop', self.rate_drop),
+                            ('garbage', self.rate_garbage), ('slow', self.rate_slow)):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def do_POST(self):
+        if self.path not in CHAT_PATHS:
+            self._send_json(404, {"error": {"message": f"Bilinmeyen yol: {self.path}"}})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        now = time.monotonic()
+
+        fault = self._pick_fault(now)
+        if fault:
+            with self.log_lock:
+                self.request_log.append((now, fault, request))
+            if fault == 'drop':
+                # Yanıt vermeden bağlantıyı kapat
+                self.close_connection = True
+                self.connection.shutdown(2)
+                return
+            if fault == 'garbage':
+                self.close_connection = True
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.wfile.write(b'{"choices": [')
+                return
+            if fault == 'slow':
+                time.sleep(self.slow_seconds)
+            else:
+                self._send_json(503, {"error": {"message": "Service unavailable", "type": "server_error"}})
+                return
+
+        if self._rate_limited(now):
+            with self.log_lock:
+                self.request_log.append((now, 429, request))
+            self._send_json(429, {"error": {"message": "Rate limit exceeded", "type": "rate_limit"}},
+                            {'Retry-After': str(self.retry_after)})
+            return
+
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        messages = request.get('messages', [])
+        question = messages[-1]['content'] if messages else ''
+        answer = self._batch_answer(question) or f"Sahte cevap: {question}"
+        prompt_tokens = sum(estimate_tokens(m.get('content', '')) for m in messages)
+        completion_tokens = estimate_tokens(answer)
+
+        with self.log_lock:
+            self.request_log.append((now, 200, request))
+        self._send_json(200, {
+            "id": f"mock-{len(self.request_log)}",
+            "object": "chat.completion",
+            "model": request.get('model', 'mock'),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": answer},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    def _batch_answer(self, content):
+        """Toplu istekse JSON cevap metni, değilse None"""
+        match = BATCH_RE.search(content)
+        if not match:
+            return None
+        questions = json.loads(match.group(0))['sorular']
+        with self.log_lock:
+            bad, garbage = self.rng.random(), self.rng.random()
+        if garbage < self.rate_garbage_batch:
+            return "Tabii, işte cevaplar: " + ' / '.join(q['soru'] for q in questions)
+        answers = [{"id": q['id'], "cevap": f"Sahte cevap: {q['soru']}"} for q in questions]
+        if bad < self.rate_bad_batch:
+            answers.pop(self.rng.randrange(len(answers)))
+        return "```json\n" + json.dumps({"cevaplar": answers}, ensure_ascii=False) + "\n```"
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host='127.0.0.1', port=0, latency=0.0, jitter=0.0, rate_429=0.0,
+                 server_rpm=None, retry_after=1, seed=0, rate_5xx=0.0, rate_drop=0.0,
+                 rate_garbage=0.0, rate_slow=0.0, slow_seconds=5.0, outage=None,
+                 rate_bad_batch=0.0, rate_garbage_batch=0.0):
+    """Sunucuyu arka planda başlatır, (server, base_url) döner"""
+    handler = type('BoundMockOpenAIHandler', (MockOpenAIHandler,), {
+        'latency': latency,
+        'jitter': jitter,
+        'rate_429': rate_429,
+        'server_rpm': server_rpm,
+        'retry_after': retry_after,
+        'rate_5xx': rate_5xx,
+        'rate_drop': rate_drop,
+        'rate_garbage': rate_garbage,
+        'rate_slow': rate_slow,
+        'slow_seconds': slow_seconds,
+        'outage': outage,
+        'rate_bad_batch': rate_bad_batch,
+        'rate_garbage_batch': rate_garbage_batch,
+        'started': time.monotonic(),
+        'request_log': [],
+        'log_lock': threading.Lock(),
+        'rng': random.Random(seed),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.handler = handler
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://{host}:{server.server_address[1]}/v1"
+    return server, base_url
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI uyumlu sahte API sunucusu")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.5, help="İstek başına gecikme (sn)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Gecikmeye eklenecek rastgele üst sınır (sn)")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="Rastgele 429 dönme olasılığı")
+    parser.add_argument('--server-rpm', type=int, help="Dakikalık istek sınırı (aşılınca 429)")
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--rate-5xx', type=float, default=0.0)
+    parser.add_argument('--rate-drop', type=float, default=0.0)
+    parser.add_argument('--rate-garbage', type=float, default=0.0)
+    parser.add_argument('--rate-slow', type=float, default=0.0)
+    parser.add_argument('--slow-seconds', type=float, default=5.0)
+    parser.add_argument('--outage-start', type=float, help="Kesintinin başlangıcı (sunucu açılışından sn)")
+    parser.add_argument('--outage-seconds', type=float, default=10.0)
+    parser.add_argument('--rate-bad-batch', type=float, default=0.0, help="Toplu cevapta bir öğeyi eksik bırakma olasılığı")
+    parser.add_argument('--rate-garbage-batch', type=float, default=0.0, help="Toplu cevap yerine düz metin dönme olasılığı")
+    args = parser.parse_args()
+
+    outage = (args.outage_start, args.outage_seconds) if args.outage_start is not None else None
+    server, base_url = start_server(args.host, args.port, args.latency, args.jitter,
+                                    args.rate_429, args.server_rpm, args.retry_after,
+                                    rate_5xx=args.rate_5xx, rate_drop=args.rate_drop,
+                                    rate_garbage=args.rate_garbage, rate_slow=args.rate_slow,
+                                    slow_seconds=args.slow_seconds, outage=outage,
+                                    rate_bad_batch=args.rate_bad_batch,
+                                    rate_garbage_batch=args.rate_garbage_batch)
+    print(f"✓ Sahte OpenAI sunucusu çalışıyor: {base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\n✓ Sunucu durduruldu")
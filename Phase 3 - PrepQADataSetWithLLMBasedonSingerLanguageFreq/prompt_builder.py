@@ -0,0 +1,129 @@
+"""
+Token bütçeli, bayt düzeyinde sabit sistem promptu oluşturucu
+
+Sistem promptu her soruda tekrar gönderilip faturalandığı için:
+
+- Prompt token olarak ölçülür; sayaç takılabilir ('estimate' = ~4 karakter/token,
+  ya da bir Hugging Face tokenizer adı, örn. vngrs-ai/Kumru-2B)
+- Kelime / 2'li / 3'lü bölümleri bir token bütçesine sığdırılır. Öğeler sıralarına
+  göre, her bölüm kendi üst sınırıyla orantılı küçülecek şekilde seçilir
+- Çıktı bayt düzeyinde sabittir (NFC, '\\n' satır sonları, sabit sıra ve biçim).
+  Böylece aynı girdiden her çalıştırmada aynı prompt çıkar ve sağlayıcı tarafı
+  prefix cache isabet edebilir
+- Tam prompta göre istek başına kazanılan token sayısı raporlanır
+"""
+
+import hashlib
+import unicodedata
+from dataclasses import dataclass, field
+
+DEFAULT_LIMITS = {'words': 300, 'bigrams': 200, 'trigrams': 150}
+
+
+def estimate_token_count(text):
+    """Kaba token tahmini (~4 karakter = 1 token)"""
+    return max(1, len(text) // 4) if text else 0
+
+
+class HFTokenCounter:
+    """Hugging Face tokenizer ile token sayımı"""
+
+    def __init__(self, name_or_path):
+        # transformers yalnızca gerektiğinde yüklenir (içe aktarması saniyeler sürer)
+        try:
+            from transformers import AutoTokenizer
+        except ImportError:
+            raise ImportError("HF tokenizer için 'transformers' paketi gerekli (pip install transformers)")
+        self.name = name_or_path
+        self.tokenizer = AutoTokenizer.from_pretrained(name_or_path)
+
+    def __call__(self, text):
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
+
+
+def get_token_counter(spec=None):
+    """'estimate' / None -> kaba tahmin, başka bir değer -> HF tokenizer adı/yolu, callable -> kendisi"""
+    if spec is None or spec == 'estimate':
+        return estimate_token_count
+    if callable(spec):
+        return spec
+    return HFTokenCounter(spec)
+
+
+def canonicalize(text):
+    """Bayt düzeyinde sabit biçim: NFC, '\\n' satır sonları, satır sonu boşlukları yok"""
+    text = unicodedata.normalize('NFC', text).replace('\r\n', '\n').replace('\r', '\n')
+    return '\n'.join(line.rstrip() for line in text.split('\n')).strip() + '\n'
+
+
+@dataclass
+class PromptBuild:
+    """Oluşturulan prompt ve ölçümleri"""
+    text: str
+    tokens: int
+    full_tokens: int
+    included: dict = field(default_factory=dict)
+
+    @property
+    def saved_tokens(self):
+        """Tam (bütçesiz) prompta göre istek başına kazanılan token"""
+        return self.full_tokens - self.tokens
+
+    @property
+    def digest(self):
+        return hashlib.sha256(self.text.encode('utf-8')).hexdigest()[:16]
+
+
+def _render(template, sections, counts, joiners):
+    values = {name: joiners[name].join(lines[:counts[name]]) for name, lines in sections.items()}
+    return canonicalize(template.format(**values))
+
+
+def build_prompt(template, sections, token_budget=None, counter=None, limits=None, joiners=None):
+    """Şablonu bölümlerle doldurur, gerekirse token bütçesine sığdırır
+
+    Args:
+        template: {bölüm_adı} yer tutuculu şablon
+        sections: bölüm adı -> sıralı (en önemli önce) satır listesi
+        token_budget: Promptun en fazla token'ı (None = sınırsız)
+        counter: Token sayacı (get_token_counter ile)
+        limits: Bölüm başına en fazla öğe (DEFAULT_LIMITS)
+        joiners: Bölüm başına öğe ayırıcı (varsayılan '\\n')
+    """
+    counter = counter or estimate_token_count
+    limits = {**DEFAULT_LIMITS, **(limits or {})}
+    joiners = {name: (joiners or {}).get(name, '\n') for name in sections}
+    sections = {name: lines[:limits.get(name, len(lines))] for name, lines in sections.items()}
+    full_counts = {name: len(lines) for name, lines in sections.items()}
+
+    full_text = _render(template, sections, full_counts, joiners)
+    full_tokens = counter(full_text)
+    if token_budget is None or full_tokens <= token_budget:
+        return PromptBuild(full_text, full_tokens, full_tokens, full_counts)
+
+    # Öğeleri "göreli sıraya" göre diz: her bölüm üst sınırıyla orantılı küçülür
+    order = sorted(
+        ((rank / max(full_counts[name], 1), position, name)
+         for position, name in enumerate(sections) for rank in range(full_counts[name])),
+    )
+    counts = {name: 0 for name in sections}
+    added = []
+    used = counter(_render(template, sections, counts, joiners))
+    for _, _, name in order:
+        line = sections[name][counts[name]]
+        cost = counter(line + joiners[name])
+        if used + cost > token_budget:
+            break
+        counts[name] += 1
+        added.append(name)
+        used += cost
+
+    # Parça parça sayım tahminidir; gerçek ölçüm bütçeyi aşıyorsa sondan öğe çıkar
+    text = _render(template, sections, counts, joiners)
+    tokens = counter(text)
+    while tokens > token_budget and added:
+        counts[added.pop()] -= 1
+        text = _render(template, sections, counts, joiners)
+        tokens = counter(text)
+
+    return PromptBuild(text, tokens, full_tokens, counts)
@@ -0,0 +1,461 @@
+"""
+QA veri seti kalite puanlama ve filtreleme
+
+fix_dataset_encoding'in satır çözme / mojibake onarımı üzerine, her kaydı
+takılabilir filtrelerden geçirir. Her filtre kayda bir puan verir ve eşiğe göre
+geçti/kaldı der:
+
+- length:     Cevap uzunluğu (karakter)                          >= eşik
+- persona:    Cevaptaki içerik kelimelerinin Phase 2 top unigram
+              listesinde olma oranı (sanatçı dağarcığı)           >= eşik
+- repetition: Cevapta tekrar eden kelime 3-gram oranı             <= eşik
+- charset:    Harflerin Türkçe/Latin alfabesinden olma oranı
+              (başka alfabe, kalan mojibake düşürür)              >= eşik
+- language:   Türkçe stopword ya da Türkçe'ye özgü harf (çğıöşü)
+              içeren kelime oranı (İngilizce cevap ~0 alır)       >= eşik
+- overlap:    Soru kelime ikililerinin cevapta geçme oranı
+              (soruyu tekrar eden cevap)                          <= eşik
+
+Kayıtlar parçalar halinde bir süreç havuzuna gönderilir (uçuştaki parça sayısı
+sınırlı, sıra korunur; dosya akış halinde işlenir). Çıktılar:
+
+- scored:  Tüm kayıtlar + 'quality': {'scores': {...}, 'rejected_by': [...],
+           'thresholds': {...}} (puanlamada kullanılan eşikler)
+- output:  Yalnızca tüm filtreleri geçen kayıtlar (eğitime hazır)
+- stats:   Filtre başına atılan / yalnızca o filtrenin attığı kayıt sayısı ve puan
+           dağılımı (yüzdelikler)
+
+Eşik denemek için dosyayı yeniden puanlamaya gerek yoktur: `select` puanlı
+dosyadan yeni eşiklerle süzer; verilmeyen eşikler puanlamadakiler olarak kalır,
+dosyada puanı olmayan bir filtre adı hata verir.
+
+    python quality_filters.py score LoRAReadyToUseDataSet_FIXED.jsonl --scored scored.jsonl \\
+        --output filtered.jsonl --ngrams top_1000_ngrams.json --workers 4
+    python quality_filters.py select scored.jsonl filtered.jsonl --threshold repetition=0.2 persona=0.15
+"""
+
+import json
+import os
+import sys
+from collections import deque
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from fix_dataset_encoding import decode_line, repair_mojibake
+
+# Phase 2'deki ortak Türkçe metin katmanı
+PHASE2_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Phase 2 - NLTK')
+sys.path.insert(0, PHASE2_DIR)
+from turkish_text import load_stopwords, tokenize
+
+DEFAULT_CHUNK_SIZE = 256
+PERCENTILES = (5, 25, 50, 75, 95)
+TURKISH_LETTERS = set('çğıöşüÇĞİÖŞÜ')
+LATIN_LETTERS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZçğıöşüÇĞİÖŞÜâîûÂÎÛ')
+
+
+class QualityFilter:
+    """Filtre arayüzü: score(item, features) -> float, eşikle karşılaştırılır"""
+
+    name = None
+    default_threshold = None
+    higher_is_better = True
+
+    def __init__(self, threshold=None):
+        self.threshold = self.default_threshold if threshold is None else threshold
+
+    def score(self, item, features):
+        raise NotImplementedError
+
+    def passes(self, score):
+        return score >= self.threshold if self.higher_is_better else score <= self.threshold
+
+
+class LengthFilter(QualityFilter):
+    name = 'length'
+    default_threshold = 20
+
+    def score(self, item, features):
+        return len(features['output'])
+
+
+class PersonaFilter(QualityFilter):
+    """Top unigram'lar n-gram çıkarımıyla aynı tokenizasyondan (stopword'süz, >= 3 harf) gelir"""
+
+    name = 'persona'
+    default_threshold = 0.1
+
+    def __init__(self, threshold=None, ngrams=None):
+        super().__init__(threshold)
+        # ngrams yoksa yalnızca eşik karşılaştırması yapılabilir (select)
+        self.vocabulary = None
+        if ngrams:
+            with open(ngrams, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.vocabulary = frozenset(tok for item in data['top_1000_unigrams'] for tok in tokenize(item['word']))
+
+    def score(self, item, features):
+        tokens = features['content_tokens']
+        if not tokens:
+            return 0.0
+        return sum(1 for t in tokens if t in self.vocabulary) / len(tokens)
+
+
+class RepetitionFilter(QualityFilter):
+    name = 'repetition'
+    default_threshold = 0.3
+    higher_is_better = False
+
+    def score(self, item, features):
+        tokens = features['output_tokens']
+        trigrams = list(zip(tokens, tokens[1:], tokens[2:]))
+        if not trigrams:
+            return 0.0
+        return 1 - len(set(trigrams)) / len(trigrams)
+
+
+class CharsetFilter(QualityFilter):
+    name = 'charset'
+    default_threshold = 0.98
+
+    def score(self, item, features):
+        letters = [c for c in features['output'] if c.isalpha()]
+        if not letters:
+            return 0.0
+        return sum(1 for c in letters if c in LATIN_LETTERS) / len(letters)
+
+
+class LanguageFilter(QualityFilter):
+    name = 'language'
+    default_threshold = 0.2
+
+    def score(self, item, features):
+        tokens = features['output_tokens']
+        if not tokens:
+            return 0.0
+        stopwords = load_stopwords()
+        return sum(1 for t in tokens if t in stopwords or not TURKISH_LETTERS.isdisjoint(t)) / len(tokens)
+
+
+class OverlapFilter(QualityFilter):
+    name = 'overlap'
+    default_threshold = 0.6
+    higher_is_better = False
+
+    def score(self, item, features):
+        question = features['input_tokens']
+        bigrams = set(zip(question, question[1:]))
+        if not bigrams:
+            return 0.0
+        tokens = features['output_tokens']
+        return len(bigrams & set(zip(tokens, tokens[1:]))) / len(bigrams)
+
+
+FILTERS = {cls.name: cls for cls in (LengthFilter, PersonaFilter, RepetitionFilter, CharsetFilter,
+                                     LanguageFilter, OverlapFilter)}
+
+
+def build_filters(names=None, thresholds=None, ngrams=None):
+    """Filtre nesnelerini oluşturur
+
+    Args:
+        names: Filtre adları (None = hepsi; n-gram dosyası yoksa persona hariç)
+        thresholds: {ad: eşik} (verilmeyenler için filtre varsayılanı)
+        ngrams: Phase 2 top n-gram JSON'u (persona filtresi için)
+    """
+    thresholds = thresholds or {}
+    if names is None:
+        names = [name for name in FILTERS if name != 'persona' or ngrams]
+    unknown = set(names) - set(FILTERS) | set(thresholds) - set(FILTERS)
+    if unknown:
+        raise ValueError(f"Bilinmeyen filtre: {', '.join(sorted(unknown))} (seçenekler: {', '.join(FILTERS)})")
+    if 'persona' in names and not ngrams:
+        raise ValueError("persona filtresi için n-gram dosyası gerekli (--ngrams)")
+    filters = []
+    for name in names:
+        options = {'ngrams': ngrams} if name == 'persona' else {}
+        filters.append(FILTERS[name](thresholds.get(name), **options))
+    return filters
+
+
+def features_of(item):
+    """Filtrelerin ortak kullandığı, kayıt başına bir kez hesaplanan alanlar"""
+    output = item.get('output') or ''
+    output_tokens = tokenize(output, min_length=1)
+    return {
+        'output': output,
+        'output_tokens': output_tokens,
+        'content_tokens': tokenize(output, stopwords=load_stopwords()),
+        'input_tokens': tokenize(item.get('input') or '', min_length=1),
+    }
+
+
+def score_record(item, filters):
+    """Kaydı puanlar; {'scores': {...}, 'rejected_by': [...]} döner"""
+    features = features_of(item)
+    scores, rejected_by = {}, []
+    for f in filters:
+        value = f.score(item, features)
+        scores[f.name] = round(value, 4) if isinstance(value, float) else value
+        if not f.passes(value):
+            rejected_by.append(f.name)
+    return {'scores': scores, 'rejected_by': rejected_by}
+
+
+def parse_record(raw):
+    """Ham satırı fix_dataset_encoding kurallarıyla çözüp onarır (JSON değilse None)"""
+    line, _ = decode_line(raw)
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    return {key: repair_mojibake(value).strip() if isinstance(value, str) else value for key, value in data.items()}
+
+
+_worker_filters = None
+
+
+def _init_worker(names, thresholds, ngrams):
+    global _worker_filters
+    _worker_filters = build_filters(names, thresholds, ngrams)
+
+
+def _score_chunk(lines):
+    """İşçi: ham satır parçası -> [(kayıt, kalite) ya da None]"""
+    results = []
+    for raw in lines:
+        item = parse_record(raw)
+        results.append(None if item is None else (item, score_record(item, _worker_filters)))
+    return results
+
+
+def _chunks(input_file, chunk_size):
+    with open(input_file, 'rb') as f:
+        chunk = []
+        for raw in f:
+            if raw.strip():
+                chunk.append(raw)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _ordered_results(chunks, workers, filter_args):
+    """Parçaları sırayla işler; havuzda en fazla 2 * workers parça uçuşta olur"""
+    if workers <= 1:
+        _init_worker(*filter_args)
+        for chunk in chunks:
+            yield from _score_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=filter_args) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_score_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class _StatsCollector:
+    def __init__(self, names):
+        self.names = names
+        self.total = 0
+        self.passed = 0
+        self.json_error = 0
+        self.rejected = {name: 0 for name in names}
+        self.only = {name: 0 for name in names}
+        self.scores = {name: [] for name in names}
+
+    def add(self, quality):
+        self.total += 1
+        for name in self.names:
+            self.scores[name].append(quality['scores'][name])
+        rejected_by = quality['rejected_by']
+        for name in rejected_by:
+            self.rejected[name] += 1
+        if len(rejected_by) == 1:
+            self.only[rejected_by[0]] += 1
+        elif not rejected_by:
+            self.passed += 1
+
+    def summary(self, filters):
+        per_filter = {}
+        for f in filters:
+            values = np.asarray(self.scores[f.name], dtype=float)
+            per_filter[f.name] = {
+                'threshold': f.threshold,
+                'direction': '>=' if f.higher_is_better else '<=',
+                'rejected': self.rejected[f.name],
+                'only_rejected': self.only[f.name],
+                'percentiles': ({str(p): round(float(v), 4) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+                                if len(values) else {}),
+            }
+        return {'total': self.total, 'passed': self.passed, 'json_error': self.json_error, 'filters': per_filter}
+
+
+def print_summary(stats):
+    print("-" * 80)
+    print(f"Toplam kayıt:           {stats['total']}")
+    print(f"Tüm filtreleri geçen:   {stats['passed']} ✓")
+    if stats['json_error']:
+        print(f"JSON parse hatası:      {stats['json_error']}")
+    print()
+    print(f"{'filtre':12s} {'eşik':>10s} {'atılan':>8s} {'yalnız':>8s}   " + '  '.join(f"p{p:<6d}" for p in PERCENTILES))
+    for name, s in stats['filters'].items():
+        percentiles = '  '.join(f"{s['percentiles'].get(str(p), 0):<7.3g}" for p in PERCENTILES)
+        print(f"{name:12s} {s['direction']:>3s} {s['threshold']:<6g} {s['rejected']:8d} {s['only_rejected']:8d}   {percentiles}")
+
+
+def score_dataset(input_file, scored_file=None, output_file=None, filters=None, thresholds=None, ngrams=None,
+                  workers=1, chunk_size=DEFAULT_CHUNK_SIZE, stats_file=None):
+    """
+    Veri setini filtrelerden geçirir, puanlı ve/veya süzülmüş dosya yazar
+
+    Args:
+        input_file: JSONL veri seti (ham ya da fix_dataset_encoding çıktısı)
+        scored_file: Tüm kayıtlar + 'quality' alanı (eşik denemeleri için)
+        output_file: Yalnızca tüm filtreleri geçen kayıtlar
+        filters: Filtre adları (None = hepsi)
+        thresholds: {filtre: eşik}
+        ngrams: Phase 2 top n-gram JSON'u (persona filtresi için)
+        workers: Süreç sayısı (1 = tek süreç)
+        chunk_size: İşçiye tek seferde gönderilen satır sayısı
+        stats_file: İstatistiklerin yazılacağı JSON
+
+    Returns:
+        dict: İstatistikler
+    """
+    active = build_filters(filters, thresholds, ngrams)
+    used_thresholds = {f.name: f.threshold for f in active}
+    filter_args = ([f.name for f in active], used_thresholds, ngrams)
+    collector = _StatsCollector([f.name for f in active])
+
+    print("=" * 80)
+    print("VERİ SETİ KALİTE PUANLAMA")
+    print("=" * 80)
+    print(f"📖 Okunuyor: {input_file}")
+    print(f"🔧 Filtreler: {', '.join(f.name for f in active)} ({workers} süreç)")
+
+    scored = open(scored_file, 'w', encoding='utf-8') if scored_file else None
+    output = open(output_file, 'w', encoding='utf-8') if output_file else None
+    try:
+        for result in _ordered_results(_chunks(input_file, chunk_size), workers, filter_args):
+            if result is None:
+                collector.json_error += 1
+                continue
+            item, quality = result
+            collector.add(quality)
+            if scored:
+                scored.write(json.dumps({**item, 'quality': {**quality, 'thresholds': used_thresholds}},
+                                        ensure_ascii=False) + '\n')
+            if output and not quality['rejected_by']:
+                output.write(json.dumps(item, ensure_ascii=False) + '\n')
+    finally:
+        for f in (scored, output):
+            if f:
+                f.close()
+
+    stats = collector.summary(active)
+    print_summary(stats)
+    if stats_file:
+        with open(stats_file, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+    for path in (scored_file, output_file, stats_file):
+        if path:
+            print(f"💾 {path}")
+    return stats
+
+
+def scored_filters(quality, thresholds=None):
+    """Puanlı kaydın 'quality' alanından filtreleri kurar
+
+    Eşik verilmeyen filtreler puanlamadaki eşikleri (eski dosyalarda filtre
+    varsayılanını) kullanır; puanı olmayan bir filtreye eşik verilirse hata verir.
+    """
+    thresholds = thresholds or {}
+    unknown = set(thresholds) - set(quality['scores'])
+    if unknown:
+        raise ValueError(f"Puanlı dosyada olmayan filtre: {', '.join(sorted(unknown))} "
+                         f"(dosyadaki filtreler: {', '.join(quality['scores'])})")
+    defaults = quality.get('thresholds', {})
+    # Puanlar hazır: persona'nın kelime listesi yüklenmez
+    return [FILTERS[name](thresholds.get(name, defaults.get(name))) for name in quality['scores']]
+
+
+def select_scored(scored_file, output_file, thresholds=None, stats_file=None):
+    """
+    Puanlı dosyayı yeniden puanlamadan yeni eşiklerle süzer
+
+    Puanlı dosyadaki filtreler kullanılır; eşik verilmeyenler puanlamadaki eşikte kalır.
+    """
+    with open(scored_file, 'r', encoding='utf-8') as src:
+        items = (json.loads(line) for line in src if line.strip())
+        first = next(items, None)
+        if first is None:
+            return {'total': 0, 'passed': 0, 'json_error': 0, 'filters': {}}
+        # Eşikler çıktı dosyası açılmadan doğrulanır
+        active = scored_filters(first['quality'], thresholds)
+        collector = _StatsCollector([f.name for f in active])
+        with open(output_file, 'w', encoding='utf-8') as dst:
+            for item in chain([first], items):
+                quality = item.pop('quality')
+                rejected_by = [f.name for f in active if not f.passes(quality['scores'][f.name])]
+                collector.add({'scores': quality['scores'], 'rejected_by': rejected_by})
+                if not rejected_by:
+                    dst.write(json.dumps(item, ensure_ascii=False) + '\n')
+    stats = collector.summary(active)
+    print_summary(stats)
+    if stats_file:
+        with open(stats_file, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+    print(f"💾 {output_file}")
+    return stats
+
+
+def parse_thresholds(values):
+    """['persona=0.15', 'repetition=0.2'] -> {'persona': 0.15, 'repetition': 0.2}"""
+    thresholds = {}
+    for value in values or []:
+        name, sep, number = value.partition('=')
+        if not sep:
+            raise ValueError(f"Eşik 'ad=değer' biçiminde olmalı: {value}")
+        thresholds[name.strip()] = float(number)
+    return thresholds
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="QA veri seti kalite puanlama ve filtreleme")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('score', help="Veri setini puanlar ve süzer")
+    p.add_argument('input')
+    p.add_argument('--scored', help="Puanlı çıktı (tüm kayıtlar)")
+    p.add_argument('--output', help="Tüm filtreleri geçen kayıtlar")
+    p.add_argument('--stats', help="İstatistik JSON'u")
+    p.add_argument('--ngrams', help="Phase 2 top n-gram JSON'u (persona filtresi)")
+    p.add_argument('--filters', nargs='+', choices=list(FILTERS), help="Varsayılan: hepsi")
+    p.add_argument('--threshold', nargs='+', default=[], help="ad=değer, örn. repetition=0.2")
+    p.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    p.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    p = sub.add_parser('select', help="Puanlı dosyayı yeni eşiklerle süzer (yeniden puanlamadan)")
+    p.add_argument('scored')
+    p.add_argument('output')
+    p.add_argument('--stats')
+    p.add_argument('--threshold', nargs='+', default=[], help="ad=değer, örn. repetition=0.2")
+    args = parser.parse_args()
+
+    if args.command == 'score':
+        score_dataset(args.input, args.scored, args.output, args.filters, parse_thresholds(args.threshold),
+                      args.ngrams, args.workers, args.chunk_size, args.stats)
+    else:
+        select_scored(args.scored, args.output, parse_thresholds(args.threshold), args.stats)
@@ -0,0 +1,134 @@
+"""
+LLM cevapları için içerik adresli disk önbelleği
+
+Anahtar, API'ye giden istek gövdesinin tamamının (model, mesajlar, sıcaklık,
+max_tokens...) SHA-256 hash'idir; aynı istek ikinci kez API'ye gitmez. Girdide
+tekrarlanan bir soru her geçişinde ayrı bir anahtar alır (geçiş sırası anahtara
+eklenir), böylece her geçişe ayrı örneklenmiş bir cevap düşer.
+Cevaplar SQLite'ta tutulur. Toplam boyut sınırı aşılınca en uzun süredir
+kullanılmayan (LRU) kayıtlar silinir.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import Counter
+
+DEFAULT_CACHE = 'llm_response_cache.sqlite'
+DEFAULT_MAX_MB = 256
+# Sınır aşıldığında boyut bu orana inene kadar silinir (her eklemede tekrar silmemek için)
+EVICT_TARGET = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key        TEXT PRIMARY KEY,
+    model      TEXT,
+    response   TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    created_at REAL,
+    last_used  REAL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+def request_key(payload, occurrence=0):
+    """İstek gövdesinin kanonik JSON'unun hash'i
+
+    Args:
+        occurrence: Aynı sorunun girdideki kaçıncı geçişi (toplu istekte liste);
+            0 ise anahtar yalnızca gövdeden hesaplanır
+    """
+    if occurrence:
+        payload = {"request": payload, "occurrence": occurrence}
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def occurrence_indices(questions):
+    """Her sorunun kendinden önce girdide kaç kez geçtiği (ilk geçiş 0)"""
+    seen = Counter()
+    indices = []
+    for question in questions:
+        indices.append(seen[question])
+        seen[question] += 1
+    return indices
+
+
+class ResponseCache:
+    """SQLite tabanlı, boyut sınırlı LRU cevap önbelleği
+
+    refresh=True ise önbellekten okunmaz (her istek API'ye gider) ama yeni
+    cevaplar yine yazılır.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE, max_mb=DEFAULT_MAX_MB, refresh=False):
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.refresh = refresh
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key):
+        """Önbellekteki cevabı döner (yoksa ya da refresh modundaysa None)"""
+        if self.refresh:
+            self.stats["misses"] += 1
+            return None
+        row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        self.stats["hits"] += 1
+        return row[0]
+
+    def put(self, key, response, model=None):
+        size = len(response.encode('utf-8'))
+        now = time.time()
+        old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, response, size, now, now)
+        )
+        self.total_bytes += size - (old[0] if old else 0)
+        self.stats["writes"] += 1
+        if self.total_bytes > self.max_bytes:
+            self._evict()
+        self.conn.commit()
+
+    def _evict(self):
+        """En eski kullanılanlardan başlayarak boyut hedefin altına inene kadar siler"""
+        target = self.max_bytes * EVICT_TARGET
+        removed = []
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if self.total_bytes <= target:
+                break
+            removed.append((key,))
+            self.total_bytes -= size
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", removed)
+        self.stats["evictions"] += len(removed)
+
+    def summary(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        hit_rate = self.stats["hits"] / lookups * 100 if lookups else 0
+        return (f"{self.stats['hits']} isabet, {self.stats['misses']} ıska (%{hit_rate:.0f}), "
+                f"{self.stats['evictions']} silinen, {self.total_bytes / 1024 / 1024:.1f} MB")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,168 @@
+"""
+API çağrıları için tekrar deneme politikası ve devre kesici (circuit breaker)
+
+RetryPolicy:
+- Hatalar sınıflara ayrılır: rate_limit (429), server (5xx), timeout, connection,
+  bad_response (okunamayan gövde), client (diğer 4xx)
+- Her sınıf için ayrı en fazla deneme sayısı; toplamda da bir üst sınır
+- Bekleme: Retry-After başlığı (saniye ya da HTTP tarihi) varsa ona uyulur,
+  yoksa üstel geri çekilme + tam jitter: uniform(0, min(max_delay, base * 2^deneme))
+
+CircuitBreaker:
+- Sağlayıcı kaynaklı art arda `failure_threshold` hatada devre açılır, tüm
+  işçiler `cooldown` saniye boyunca istek göndermeden bekler
+- Süre dolunca tek bir deneme isteği (half-open) gönderilir; başarılıysa devre
+  kapanır, değilse tekrar açılır
+"""
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+RATE_LIMIT = 'rate_limit'
+SERVER = 'server'
+TIMEOUT = 'timeout'
+CONNECTION = 'connection'
+BAD_RESPONSE = 'bad_response'
+CLIENT = 'client'
+
+# Sınıf başına en fazla deneme (ilk istek dahil); 1 = tekrar denenmez
+DEFAULT_RULES = {
+    RATE_LIMIT: 8,
+    SERVER: 5,
+    TIMEOUT: 4,
+    CONNECTION: 4,
+    BAD_RESPONSE: 2,
+    CLIENT: 1,
+}
+# Devre kesicinin saydığı, sağlayıcının durumunu gösteren hatalar
+PROVIDER_ERRORS = {RATE_LIMIT, SERVER, TIMEOUT, CONNECTION}
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def parse_retry_after(value):
+    """Retry-After başlığını saniyeye çevirir (geçersizse None)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_response(response):
+    """Başarısız HTTP yanıtının hata sınıfı"""
+    if response.status_code == 429:
+        return RATE_LIMIT
+    if response.status_code >= 500:
+        return SERVER
+    return CLIENT
+
+
+def classify_exception(error):
+    """requests istisnasının hata sınıfı"""
+    if isinstance(error, requests.exceptions.Timeout):
+        return TIMEOUT
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return CONNECTION
+    return CLIENT
+
+
+class RetryPolicy:
+    """Hata sınıfına göre tekrar deneme kararı ve bekleme süresi"""
+
+    def __init__(self, max_attempts=10, base_delay=1.0, max_delay=60.0, rules=None, seed=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rules = {**DEFAULT_RULES, **(rules or {})}
+        self.rng = random.Random(seed)
+
+    def should_retry(self, error_class, class_attempts, total_attempts):
+        """Bu sınıftan class_attempts, toplamda total_attempts deneme yapıldıysa tekrar denensin mi"""
+        if total_attempts >= self.max_attempts:
+            return False
+        return class_attempts < self.rules.get(error_class, 1)
+
+    def delay(self, attempt, retry_after=None):
+        """attempt. tekrar öncesi beklenecek süre (sn)"""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Tek event loop içinde paylaşılan devre kesici"""
+
+    def __init__(self, failure_threshold=5, cooldown=30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self.probing = False
+        # Event, kullanıldığı event loop'ta oluşturulur (motor her çalıştırmada yeni loop açar)
+        self.changed = None
+        self.stats = {"opens": 0, "wait_seconds": 0.0}
+
+    async def acquire(self):
+        """Devre kapalıysa hemen döner; açıksa süre dolana, half-open'da deneme bitene kadar bekler"""
+        start = time.monotonic()
+        try:
+            while True:
+                if self.state == OPEN:
+                    wait = self.open_until - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                        continue
+                    self.state = HALF_OPEN
+                    self.probing = False
+                if self.state == HALF_OPEN:
+                    if self.probing:
+                        if self.changed is None:
+                            self.changed = asyncio.Event()
+                        await self.changed.wait()
+                        continue
+                    self.probing = True
+                return
+        finally:
+            self.stats["wait_seconds"] += time.monotonic() - start
+
+    def _notify(self):
+        if self.changed is not None:
+            self.changed.set()
+            self.changed = None
+
+    def record_success(self):
+        self.failures = 0
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self.probing = False
+            self._notify()
+
+    def record_failure(self, error_class):
+        if error_class not in PROVIDER_ERRORS:
+            # İstek kaynaklı hata: sağlayıcı hakkında bilgi vermez, deneme hakkını serbest bırak
+            if self.state == HALF_OPEN and self.probing:
+                self.probing = False
+                self._notify()
+            return
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.open_until = time.monotonic() + self.cooldown
+            self.stats["opens"] += 1
+            self.failures = 0
+            self.probing = False
+            self._notify()
@@ -0,0 +1,170 @@
+"""
+Packing / bucketing benchmark'ı ve CPU doğrulaması
+
+1. Pad oranı: notebook (sabit max_length dolgu), karışık sıra + en uzuna dolgu,
+   uzunluğa göre gruplama (bucket) ve packing için
+2. Doğruluk: küçük bir causal LM ile, paketlenmiş batch'lerin token başına kaybı
+   örneklerin tek tek (dolgusuz) kayıplarıyla karşılaştırılır. Maskesiz paketleme
+   (örnekler birbirini görür) farkı göstermek için ayrıca ölçülür
+3. Süre: aynı örnekler üzerinde her yöntemle ileri + geri geçiş
+
+Model verilmezse tokenizer'ın sözlüğüyle rastgele ağırlıklı minik bir Llama
+kurulur (ağ bağlantısı gerekmez).
+
+    python bench_packing.py train_data/train.jsonl --tokenizer vngrs-ai/Kumru-2B
+    python bench_packing.py train_data/train.jsonl --tokenizer ./tiny-tokenizer --model ./tiny-model --max-length 256
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import torch
+
+from packing import (PackedDataset, PackingCollator, PaddingCollator, LengthGroupedBatchSampler, padding_report,
+                     strategy_batch_lengths)
+from tokenized_dataset import DEFAULT_MAX_LENGTH, DEFAULT_MODEL, load_or_build
+
+
+class _Subset:
+    """İlk n örnek (TokenizedDataset arayüzüyle)"""
+
+    def __init__(self, dataset, n):
+        self.dataset = dataset
+        self.n = min(n, len(dataset))
+
+    def __len__(self):
+        return self.n
+
+    def token_ids(self, index):
+        return self.dataset.token_ids(index)
+
+    def __getitem__(self, index):
+        return self.dataset[index]
+
+    @property
+    def lengths(self):
+        return self.dataset.lengths[:self.n]
+
+
+def tiny_model(vocab_size, max_length):
+    from transformers import LlamaConfig, LlamaForCausalLM
+
+    torch.manual_seed(0)
+    config = LlamaConfig(vocab_size=vocab_size, hidden_size=64, intermediate_size=128, num_hidden_layers=2,
+                         num_attention_heads=4, num_key_value_heads=2, max_position_embeddings=max_length)
+    return LlamaForCausalLM(config)
+
+
+def token_losses(model, batch):
+    """Etiketli token'ların kayıp toplamı ve sayısı"""
+    labels = batch.pop('labels')
+    logits = model(**batch).logits[:, :-1]
+    targets = labels[:, 1:]
+    loss = torch.nn.functional.cross_entropy(logits.reshape(-1, logits.size(-1)).float(), targets.reshape(-1),
+                                             ignore_index=-100, reduction='sum')
+    return loss, int((targets != -100).sum())
+
+
+def verify(model, dataset, max_length, pad_token_id, batch_size):
+    """(tek tek kayıp, paketli kayıp, maskesiz paketli kayıp) token başına"""
+    model.eval()
+    single = PaddingCollator(pad_token_id, max_length)
+    collator = PackingCollator(pad_token_id)
+    packed = PackedDataset(dataset, max_length)
+    results = []
+    with torch.no_grad():
+        loss, count = 0.0, 0
+        for i in range(len(dataset)):
+            l, c = token_losses(model, single([dataset[i]]))
+            loss, count = loss + float(l), count + c
+        results.append((loss, count))
+        for use_mask in (True, False):
+            loss, count = 0.0, 0
+            for start in range(0, len(packed), batch_size):
+                batch = collator([packed[i] for i in range(start, min(start + batch_size, len(packed)))])
+                if not use_mask:
+                    # Sınır yok: örnekler yalnızca causal maskeyle birbirini görür
+                    del batch['attention_mask']
+                l, c = token_losses(model, batch)
+                loss, count = loss + float(l), count + c
+            results.append((loss, count))
+    return results
+
+
+def time_strategy(model, batches):
+    model.train()
+    optimizer = torch.optim.SGD(model.parameters(), lr=1e-3)
+    start = time.perf_counter()
+    for batch in batches:
+        optimizer.zero_grad()
+        loss, count = token_losses(model, batch)
+        (loss / max(count, 1)).backward()
+        optimizer.step()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Packing / bucketing pad oranı, doğruluk ve süre ölçümü")
+    parser.add_argument('data', help="train.jsonl (prepare_dataset çıktısı) ya da QA JSONL")
+    parser.add_argument('--tokenizer', default=DEFAULT_MODEL)
+    parser.add_argument('--model', help="Causal LM klasörü (varsayılan: rastgele minik Llama)")
+    parser.add_argument('--max-length', type=int, default=DEFAULT_MAX_LENGTH)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--cache-dir', help="tokenized_dataset önbelleği (varsayılan: geçici klasör)")
+    parser.add_argument('--verify-examples', type=int, default=64)
+    parser.add_argument('--time-examples', type=int, default=256)
+    args = parser.parse_args()
+
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer)
+    pad_token_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = load_or_build(args.data, tokenizer, cache_dir=args.cache_dir or tmp, max_length=args.max_length)
+        lengths = dataset.lengths
+
+        print(f"\n📏 {len(dataset)} örnek, ortalama {lengths.mean():.0f} / en uzun {lengths.max()} token, "
+              f"max_length {args.max_length}, batch {args.batch_size}\n")
+        print(f"{'Yöntem':28s} {'adım':>7s} {'dolgulu token':>14s} {'pad oranı':>10s}")
+        print("-" * 62)
+        rows = [
+            ("notebook (max_length dolgu)", strategy_batch_lengths(lengths, 'none', args.batch_size, args.max_length),
+             args.max_length),
+            ("karışık, en uzuna dolgu", strategy_batch_lengths(lengths, 'none', args.batch_size, args.max_length), None),
+            ("bucket (uzunluğa göre)", strategy_batch_lengths(lengths, 'bucket', args.batch_size, args.max_length), None),
+            ("pack (en uzuna dolgu)", strategy_batch_lengths(lengths, 'pack', args.batch_size, args.max_length), None),
+        ]
+        for label, batches, pad_to in rows:
+            report = padding_report(batches, pad_to)
+            print(f"{label:28s} {report['batches']:7d} {report['slots']:14,d} {report['padding_ratio']:9.1%}")
+
+        model = (AutoModelForCausalLM.from_pretrained(args.model) if args.model
+                 else tiny_model(len(tokenizer), args.max_length))
+        subset = _Subset(dataset, args.verify_examples)
+        (single, n1), (packed, n2), (unmasked, n3) = verify(model, subset, args.max_length, pad_token_id, args.batch_size)
+        print(f"\n🔬 Doğrulama ({subset.n} örnek, token başına kayıp)")
+        print(f"   tek tek:          {single / n1:.6f} ({n1} token)")
+        print(f"   paketli (maske):  {packed / n2:.6f} ({n2} token)  fark {abs(packed / n2 - single / n1):.2e}")
+        print(f"   paketli (maskesiz): {unmasked / n3:.6f}  fark {abs(unmasked / n3 - single / n1):.2e}")
+
+        subset = _Subset(dataset, args.time_examples)
+        padding = PaddingCollator(pad_token_id, args.max_length)
+        order = np.random.default_rng(0).permutation(len(subset))
+        plans = {
+            'karışık': [padding([subset[int(i)] for i in order[s:s + args.batch_size]])
+                        for s in range(0, len(order), args.batch_size)],
+            'bucket': [padding([subset[i] for i in b])
+                       for b in LengthGroupedBatchSampler(subset.lengths, args.batch_size)],
+        }
+        packed_set = PackedDataset(subset, args.max_length, seed=0)
+        collator = PackingCollator(pad_token_id)
+        plans['pack'] = [collator([packed_set[i] for i in range(s, min(s + args.batch_size, len(packed_set)))])
+                         for s in range(0, len(packed_set), args.batch_size)]
+        print(f"\n⏱️  İleri + geri geçiş ({subset.n} örnek, 1 epoch)")
+        base = None
+        for name, batches in plans.items():
+            elapsed = time_strategy(model, batches)
+            base = base or elapsed
+            print(f"   {name:10s} {len(batches):4d} adım {elapsed:7.2f} sn  ({base / elapsed:.2f}x)")
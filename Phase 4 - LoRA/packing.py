@@ -0,0 +1,316 @@
+"""
+SFT eğitimi için sequence packing ve uzunluğa göre gruplanmış batch'ler
+
+Notebook model_max_length = 512 ile sağa dolgu yapar; QA örneklerinin çoğu kısa
+olduğu için batch'lerin büyük kısmı pad token'ıdır. İki alternatif:
+
+- pack:   Örnekler best-fit-decreasing ile max_length'lik dizilere yerleştirilir
+          (PackedDataset). PackingCollator her dizi için:
+          - position_ids: her örnekte 0'dan yeniden başlar
+          - attention_mask: blok köşegen + causal 4D maske (B, 1, L, L); bir örnek
+            diğerini göremez. Maske toplamsal (ters çevrilmiş) biçimdedir: izinli 0,
+            yasak dtype'ın en küçük değeri. Bu biçimi olduğu gibi kullanan en eski
+            sürüm transformers 4.45'tir; daha eskiler 1/0 maske bekleyip ters çevirir
+            ya da 4D maskeyi hiç kabul etmez (4.36 gibi), PackingCollator bu durumda
+            hata verir. attention='position_ids' ile maske üretilmez,
+            flash_attention_2 sınırları position_ids'ten çıkarır
+          - labels: pad ve her örneğin ilk token'ı -100 (önceki örneğin son
+            token'ından tahmin edilmesin); response_template verilirse asistan
+            cevabından önceki kısım da -100
+          Böylece paketlenmiş dizinin kaybı, örneklerin tek tek kayıplarıyla aynıdır
+          (bench_packing.py küçük bir modelle CPU'da doğrular).
+- bucket: LengthGroupedBatchSampler örnekleri karıştırır, batch_size * bucket_factor'lık
+          gruplarda uzunluğa göre sıralayıp batch'lere böler, batch sırasını karıştırır.
+          PaddingCollator her batch'i kendi en uzun örneğine dolgular.
+
+padding_report her yöntem için pad oranını verir.
+
+Veri seti tokenized_dataset.TokenizedDataset (lengths + token_ids) ya da
+{'input_ids'} dönen herhangi bir map-style dataset olabilir. Trainer ile:
+
+    class PackedTrainer(Trainer):
+        def get_train_dataloader(self):
+            return make_dataloader(self.train_dataset, 'pack', self.args.per_device_train_batch_size,
+                                   tokenizer.pad_token_id, max_length=512, seed=self.args.seed)
+
+Paketlenmiş bir batch birden çok örnek taşır; aynı token bütçesi için batch_size
+(ya da gradient_accumulation_steps) buna göre düşürülmelidir.
+"""
+
+import bisect
+import random
+
+import numpy as np
+import torch
+
+STRATEGIES = ('none', 'bucket', 'pack')
+ATTENTION_MODES = ('4d', 'position_ids')
+DEFAULT_BUCKET_FACTOR = 50
+IGNORE_INDEX = -100
+# Toplamsal 4D maskeyi dönüştürmeden kullanan ilk transformers sürümü
+MIN_TRANSFORMERS_4D = '4.45.0'
+
+
+def _token_ids(dataset, index):
+    if hasattr(dataset, 'token_ids'):
+        return dataset.token_ids(index)
+    return np.asarray(dataset[index]['input_ids'])
+
+
+def check_transformers_4d():
+    """Kurulu transformers toplamsal 4D maskeyi desteklemiyorsa RuntimeError (kurulu değilse kontrol yok)"""
+    try:
+        import transformers
+        from packaging.version import Version
+    except ImportError:
+        return
+    if Version(transformers.__version__) < Version(MIN_TRANSFORMERS_4D):
+        raise RuntimeError(f"attention='4d' için transformers>={MIN_TRANSFORMERS_4D} gerekli "
+                           f"(kurulu: {transformers.__version__}); eski sürümler maskeyi ters çevirir ya da "
+                           f"reddeder. Yükseltin ya da attention='position_ids' (flash_attention_2) kullanın")
+
+
+def _lengths(dataset):
+    if hasattr(dataset, 'lengths'):
+        return np.asarray(dataset.lengths)
+    return np.array([len(dataset[i]['input_ids']) for i in range(len(dataset))])
+
+
+def pack_lengths(lengths, max_length):
+    """Best-fit-decreasing: her örneği sığdığı en dolu diziye koyar
+
+    Returns:
+        Dizi başına örnek indeksleri listesi (max_length'ten uzun örnek tek başına, kesilerek)
+    """
+    order = np.argsort(-np.minimum(lengths, max_length), kind='stable')
+    bins = []
+    # (kalan yer, dizi numarası) kalan yere göre sıralı
+    free = []
+    for index in order:
+        length = min(int(lengths[index]), max_length)
+        slot = bisect.bisect_left(free, (length, -1))
+        if slot == len(free):
+            bins.append([int(index)])
+            remaining, number = max_length - length, len(bins) - 1
+        else:
+            remaining, number = free.pop(slot)
+            bins[number].append(int(index))
+            remaining -= length
+        if remaining > 0:
+            bisect.insort(free, (remaining, number))
+    return bins
+
+
+class PackedDataset:
+    """Her öğe bir paket: {'input_ids': birleşik token'lar, 'seq_lens': örnek uzunlukları}"""
+
+    def __init__(self, dataset, max_length, seed=None):
+        self.dataset = dataset
+        self.max_length = max_length
+        self.bins = pack_lengths(_lengths(dataset), max_length)
+        if seed is not None:
+            random.Random(seed).shuffle(self.bins)
+
+    def __len__(self):
+        return len(self.bins)
+
+    def __getitem__(self, index):
+        parts = [_token_ids(self.dataset, i)[:self.max_length] for i in self.bins[index]]
+        return {'input_ids': np.concatenate(parts).astype(np.int64),
+                'seq_lens': np.array([len(p) for p in parts], dtype=np.int64)}
+
+
+class LengthGroupedBatchSampler:
+    """Benzer uzunluktaki örnekleri aynı batch'e koyan batch sampler (DataLoader(batch_sampler=...))"""
+
+    def __init__(self, lengths, batch_size, bucket_factor=DEFAULT_BUCKET_FACTOR, shuffle=True, seed=0,
+                 drop_last=False):
+        self.lengths = np.asarray(lengths)
+        self.batch_size = batch_size
+        self.bucket_size = batch_size * bucket_factor
+        self.shuffle = shuffle
+        self.seed = seed
+        self.drop_last = drop_last
+        self.epoch = 0
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+
+    def batches(self):
+        rng = np.random.default_rng(self.seed + self.epoch)
+        indices = rng.permutation(len(self.lengths)) if self.shuffle else np.arange(len(self.lengths))
+        batches = []
+        for start in range(0, len(indices), self.bucket_size):
+            bucket = indices[start:start + self.bucket_size]
+            bucket = bucket[np.argsort(-self.lengths[bucket], kind='stable')]
+            for i in range(0, len(bucket), self.batch_size):
+                batch = bucket[i:i + self.batch_size]
+                if len(batch) == self.batch_size or not self.drop_last:
+                    batches.append(batch.tolist())
+        if self.shuffle:
+            order = rng.permutation(len(batches))
+            batches = [batches[i] for i in order]
+        return batches
+
+    def __iter__(self):
+        return iter(self.batches())
+
+    def __len__(self):
+        full, extra = divmod(len(self.lengths), self.batch_size)
+        return full + (1 if extra and not self.drop_last else 0)
+
+
+def _find_last(ids, template):
+    """template'in ids içindeki son geçişinin bitiş konumu (yoksa None)"""
+    n = len(template)
+    for start in range(len(ids) - n, -1, -1):
+        if ids[start] == template[0] and list(ids[start:start + n]) == template:
+            return start + n
+    return None
+
+
+def example_labels(ids, response_template=None):
+    """Tek örneğin etiketleri: ilk token -100; response_template verilirse cevaptan öncesi de -100"""
+    labels = np.array(ids, dtype=np.int64)
+    cut = 1
+    if response_template:
+        end = _find_last(ids, list(response_template))
+        # Şablon bulunamazsa (örn. kesilmiş örnek) örnek kayba katılmaz
+        cut = len(ids) if end is None else max(end, 1)
+    labels[:cut] = IGNORE_INDEX
+    return labels
+
+
+def _pad_length(length, pad_to_multiple_of):
+    if pad_to_multiple_of:
+        return -(-length // pad_to_multiple_of) * pad_to_multiple_of
+    return length
+
+
+class PaddingCollator:
+    """Batch'i en uzun örneğe (sağa) dolgular: input_ids, attention_mask, labels"""
+
+    def __init__(self, pad_token_id, max_length=None, response_template=None, pad_to_multiple_of=None):
+        self.pad_token_id = pad_token_id
+        self.max_length = max_length
+        self.response_template = response_template
+        self.pad_to_multiple_of = pad_to_multiple_of
+
+    def __call__(self, features):
+        sequences = [np.asarray(f['input_ids'])[:self.max_length] for f in features]
+        length = _pad_length(max(len(s) for s in sequences), self.pad_to_multiple_of)
+        input_ids = np.full((len(sequences), length), self.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(sequences), length), dtype=np.int64)
+        labels = np.full((len(sequences), length), IGNORE_INDEX, dtype=np.int64)
+        for row, ids in enumerate(sequences):
+            input_ids[row, :len(ids)] = ids
+            attention_mask[row, :len(ids)] = 1
+            labels[row, :len(ids)] = example_labels(ids, self.response_template)
+        return {'input_ids': torch.from_numpy(input_ids), 'attention_mask': torch.from_numpy(attention_mask),
+                'labels': torch.from_numpy(labels)}
+
+
+class PackingCollator:
+    """PackedDataset öğelerini (B, L) batch'e çevirir; örnek sınırları maske ve position_ids'te korunur"""
+
+    def __init__(self, pad_token_id, response_template=None, attention='4d', mask_dtype=torch.float32,
+                 pad_to_multiple_of=None):
+        if attention not in ATTENTION_MODES:
+            raise ValueError(f"Bilinmeyen attention modu: {attention} (seçenekler: {', '.join(ATTENTION_MODES)})")
+        if attention == '4d':
+            check_transformers_4d()
+        self.pad_token_id = pad_token_id
+        self.response_template = response_template
+        self.attention = attention
+        self.mask_dtype = mask_dtype
+        self.pad_to_multiple_of = pad_to_multiple_of
+
+    def __call__(self, features):
+        length = _pad_length(max(len(f['input_ids']) for f in features), self.pad_to_multiple_of)
+        batch = len(features)
+        input_ids = np.full((batch, length), self.pad_token_id, dtype=np.int64)
+        labels = np.full((batch, length), IGNORE_INDEX, dtype=np.int64)
+        position_ids = np.zeros((batch, length), dtype=np.int64)
+        # Her konumun ait olduğu örnek (pad: -1)
+        segments = np.full((batch, length), -1, dtype=np.int64)
+        for row, f in enumerate(features):
+            start = 0
+            for number, seq_len in enumerate(f['seq_lens']):
+                ids = f['input_ids'][start:start + seq_len]
+                input_ids[row, start:start + seq_len] = ids
+                labels[row, start:start + seq_len] = example_labels(ids, self.response_template)
+                position_ids[row, start:start + seq_len] = np.arange(seq_len)
+                segments[row, start:start + seq_len] = number
+                start += seq_len
+        result = {'input_ids': torch.from_numpy(input_ids), 'labels': torch.from_numpy(labels),
+                  'position_ids': torch.from_numpy(position_ids)}
+        if self.attention == '4d':
+            segments = torch.from_numpy(segments)
+            causal = torch.tril(torch.ones(length, length, dtype=torch.bool))
+            same = (segments[:, :, None] == segments[:, None, :]) & (segments[:, :, None] >= 0)
+            # Pad satırları kendini görür (tamamen maskeli satır softmax'ta NaN üretmesin)
+            allowed = (same & causal) | torch.eye(length, dtype=torch.bool)
+            mask = torch.zeros(batch, 1, length, length, dtype=self.mask_dtype)
+            mask.masked_fill_(~allowed[:, None], torch.finfo(self.mask_dtype).min)
+            result['attention_mask'] = mask
+        return result
+
+
+def make_dataloader(dataset, strategy, batch_size, pad_token_id, max_length=512, seed=0, response_template=None,
+                    attention='4d', mask_dtype=torch.float32, bucket_factor=DEFAULT_BUCKET_FACTOR, shuffle=True,
+                    **loader_options):
+    """Seçilen yönteme göre torch DataLoader
+
+    Args:
+        strategy: 'none' (karışık sıra, en uzuna dolgu), 'bucket' ya da 'pack'
+        batch_size: 'pack' için paket (dizi), diğerleri için örnek sayısı
+        mask_dtype: 4D maskenin dtype'ı (modelin hesaplama dtype'ı, örn. torch.bfloat16)
+    """
+    from torch.utils.data import DataLoader
+
+    if strategy == 'pack':
+        packed = PackedDataset(dataset, max_length, seed=seed if shuffle else None)
+        collator = PackingCollator(pad_token_id, response_template, attention, mask_dtype)
+        return DataLoader(packed, batch_size=batch_size, shuffle=shuffle, collate_fn=collator, **loader_options)
+    collator = PaddingCollator(pad_token_id, max_length, response_template)
+    if strategy == 'bucket':
+        sampler = LengthGroupedBatchSampler(_lengths(dataset), batch_size, bucket_factor, shuffle, seed)
+        return DataLoader(dataset, batch_sampler=sampler, collate_fn=collator, **loader_options)
+    if strategy == 'none':
+        return DataLoader(dataset, batch_size=batch_size, shuffle=shuffle, collate_fn=collator, **loader_options)
+    raise ValueError(f"Bilinmeyen yöntem: {strategy} (seçenekler: {', '.join(STRATEGIES)})")
+
+
+def padding_report(batch_lengths, pad_to=None):
+    """Batch'lerdeki gerçek / pad token oranı
+
+    Args:
+        batch_lengths: Her batch için dizi uzunlukları listesi (paketlerde paket uzunluğu)
+        pad_to: Sabit dolgu uzunluğu (None = batch'in en uzunu)
+    """
+    tokens = sum(sum(b) for b in batch_lengths)
+    slots = sum(len(b) * (pad_to or max(b)) for b in batch_lengths if b)
+    return {
+        'batches': len(batch_lengths),
+        'tokens': int(tokens),
+        'slots': int(slots),
+        'padding_ratio': (slots - tokens) / slots if slots else 0.0,
+    }
+
+
+def strategy_batch_lengths(lengths, strategy, batch_size, max_length, seed=0, bucket_factor=DEFAULT_BUCKET_FACTOR):
+    """Bir yöntemin üreteceği batch'lerin dizi uzunlukları (veri okumadan, yalnızca uzunluklardan)"""
+    lengths = np.minimum(np.asarray(lengths), max_length)
+    if strategy == 'pack':
+        bins = pack_lengths(lengths, max_length)
+        random.Random(seed).shuffle(bins)
+        packed = [int(lengths[b].sum()) for b in bins]
+        return [packed[i:i + batch_size] for i in range(0, len(packed), batch_size)]
+    if strategy == 'bucket':
+        batches = LengthGroupedBatchSampler(lengths, batch_size, bucket_factor, seed=seed).batches()
+    elif strategy == 'none':
+        order = np.random.default_rng(seed).permutation(len(lengths))
+        batches = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+    else:
+        raise ValueError(f"Bilinmeyen yöntem: {strategy} (seçenekler: {', '.join(STRATEGIES)})")
+    return [[int(lengths[i]) for i in b] for b in batches]
@@ -0,0 +1,85 @@
+"""
+Temizlenmiş QA veri setini LoRA eğitimine hazırlar
+
+Notebook'taki (Fine_Tune_Kumru_LoRA.ipynb) adımların betik hali:
+- Her örnek ChatML formatına çevrilir ({"text": ...})
+- Sabit tohumla karıştırılıp eğitim / doğrulama olarak bölünür
+- train.jsonl ve eval.jsonl olarak yazılır (Colab'a yüklenip doğrudan kullanılabilir)
+
+    python prepare_dataset.py LoRAReadyToUseDataSet_FIXED.jsonl --output-dir train_data
+"""
+
+import argparse
+import json
+import os
+import random
+
+# Notebook'taki eğitim sistem promptu (eğitimle birebir aynı olmalı)
+SYSTEM_PROMPT = """Sen Sagopa Kajmer'sin. Derin dusunen, melankolik ama samimi bir rap sanatcisisin.
+Hayat, zaman, yalnizlik gibi temalardan bahsedersin. Kendi kelime dagarcaginla dogal ve icten konusursun."""
+
+DEFAULT_EVAL_RATIO = 0.1
+DEFAULT_SEED = 42
+
+
+def format_chatml(example, system_prompt=SYSTEM_PROMPT):
+    """Örneği ChatML eğitim metnine çevirir"""
+    return f"""<|im_start|>system
+{system_prompt}
+<|im_end|>
+<|im_start|>user
+{example['input']}
+<|im_end|>
+<|im_start|>assistant
+{example['output']}<|im_end|>"""
+
+
+def load_jsonl(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def split_dataset(items, eval_ratio=DEFAULT_EVAL_RATIO, seed=DEFAULT_SEED):
+    """Sabit tohumla karıştırıp (eğitim, doğrulama) listelerine böler"""
+    items = list(items)
+    random.Random(seed).shuffle(items)
+    eval_count = int(round(len(items) * eval_ratio))
+    return items[eval_count:], items[:eval_count]
+
+
+def write_jsonl(items, file_path):
+    with open(file_path, 'w', encoding='utf-8') as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False) + '\n')
+
+
+def prepare_dataset(input_path, output_dir='train_data', system_prompt=SYSTEM_PROMPT,
+                    eval_ratio=DEFAULT_EVAL_RATIO, seed=DEFAULT_SEED):
+    """Veri setini ChatML'e çevirip train.jsonl / eval.jsonl yazar
+
+    Returns:
+        dict: {'train': örnek sayısı, 'eval': örnek sayısı, 'train_path', 'eval_path'}
+    """
+    examples = [ex for ex in load_jsonl(input_path) if ex.get('input') and ex.get('output')]
+    texts = [{"text": format_chatml(ex, system_prompt)} for ex in examples]
+    train, evaluation = split_dataset(texts, eval_ratio, seed)
+
+    os.makedirs(output_dir, exist_ok=True)
+    train_path = os.path.join(output_dir, 'train.jsonl')
+    eval_path = os.path.join(output_dir, 'eval.jsonl')
+    write_jsonl(train, train_path)
+    write_jsonl(evaluation, eval_path)
+    return {'train': len(train), 'eval': len(evaluation), 'train_path': train_path, 'eval_path': eval_path}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="QA veri setini ChatML eğitim / doğrulama dosyalarına çevirir")
+    parser.add_argument('input', help="Temizlenmiş veri seti (fix_dataset_encoding çıktısı)")
+    parser.add_argument('--output-dir', default='train_data')
+    parser.add_argument('--eval-ratio', type=float, default=DEFAULT_EVAL_RATIO)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    result = prepare_dataset(args.input, args.output_dir, eval_ratio=args.eval_ratio, seed=args.seed)
+    print(f"✓ Eğitim: {result['train']} örnek -> {result['train_path']}")
+    print(f"✓ Doğrulama: {result['eval']} örnek -> {result['eval_path']}")
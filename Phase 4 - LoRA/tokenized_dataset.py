@@ -0,0 +1,241 @@
+"""
+Önceden tokenize edilmiş, bellek eşlemeli (memmap) eğitim veri seti
+
+Notebook her eğitimde JSONL'i listeye okuyup Dataset.from_list + format_to_chatml
+uygular, SFTTrainer da açılışta tüm metinleri yeniden tokenize eder. Bu modül
+bunu bir kez yapar ve sonucu diske yazar:
+
+    tokenized_cache/<anahtar>/
+        tokens.bin   tüm örneklerin token id'leri art arda (uint16, sözlük > 65536 ise uint32)
+        index.npy    offset dizisi (n + 1, int64): i. örnek tokens[offsets[i]:offsets[i + 1]]
+        meta.json    tokenizer, şablon, veri hash'leri, örnek / token sayısı, dtype
+
+Anahtar = hash(tokenizer + ChatML şablonu/sistem promptu + veri dosyası + max_length).
+Üçünden biri değişmedikçe sonraki çalıştırmalar aynı klasörü kullanır; yükleme yalnızca
+iki dosyayı memmap ile açar (süre ve bellek veri seti boyutundan bağımsız). Yazma
+geçici klasöre yapılıp tek adımda yerine taşınır, yarım kalan yazım kullanılmaz.
+
+Girdi satırları ya ChatML metni ({"text": ...}, prepare_dataset.py çıktısı) ya da
+ham QA kaydıdır ({"input", "output"}; format_chatml uygulanır).
+
+    python tokenized_dataset.py train_data/train.jsonl train_data/eval.jsonl --tokenizer vngrs-ai/Kumru-2B
+
+Eğitimde (notebook):
+
+    from tokenized_dataset import load_or_build
+    train_dataset = load_or_build('train_data/train.jsonl', tokenizer=tokenizer)
+    eval_dataset = load_or_build('train_data/eval.jsonl', tokenizer=tokenizer)
+    # Her öğe {'input_ids': np.ndarray}; DataCollatorForLanguageModeling(tokenizer, mlm=False) ile kullanılabilir
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from array import array
+
+import numpy as np
+
+from prepare_dataset import SYSTEM_PROMPT, format_chatml
+
+DEFAULT_MODEL = "vngrs-ai/Kumru-2B"
+DEFAULT_CACHE_DIR = 'tokenized_cache'
+# Notebook'taki tokenizer.model_max_length
+DEFAULT_MAX_LENGTH = 512
+TOKENIZE_BATCH_SIZE = 256
+# Disk düzeni değişirse artırılır (eski önbellekler yeni anahtarla yeniden üretilir)
+FORMAT_VERSION = 1
+
+TOKENS_FILE = 'tokens.bin'
+INDEX_FILE = 'index.npy'
+META_FILE = 'meta.json'
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Dosya içeriğinin sha256'sı"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tokenizer_digest(tokenizer):
+    """Tokenizer'ın kelime dağarcığı + kurallarının hash'i (aynı isimli farklı sürüm de ayrılır)"""
+    digest = hashlib.sha256()
+    backend = getattr(tokenizer, 'backend_tokenizer', None)
+    if backend is not None:
+        digest.update(backend.to_str().encode('utf-8'))
+    else:
+        digest.update(json.dumps(sorted(tokenizer.get_vocab().items()), ensure_ascii=False).encode('utf-8'))
+    digest.update(json.dumps(tokenizer.special_tokens_map, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def template_digest(system_prompt=SYSTEM_PROMPT):
+    """ChatML şablonunun (sistem promptu dahil) hash'i"""
+    sample = format_chatml({'input': '\x00input\x00', 'output': '\x00output\x00'}, system_prompt)
+    return hashlib.sha256(f"{FORMAT_VERSION}\n{sample}".encode('utf-8')).hexdigest()
+
+
+def cache_key(data_digest, tokenizer_hash, template_hash, max_length):
+    key = f"{tokenizer_hash}:{template_hash}:{data_digest}:{max_length}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+
+def iter_texts(data_path, system_prompt=SYSTEM_PROMPT):
+    """JSONL'den eğitim metinleri ({"text"} aynen, QA kaydı ChatML'e çevrilerek)"""
+    with open(data_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            yield item['text'] if 'text' in item else format_chatml(item, system_prompt)
+
+
+def _batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class TokenizedDataset:
+    """memmap'li token dizisi; torch map-style Dataset arayüzü (__len__ / __getitem__)"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.offsets = np.load(os.path.join(path, INDEX_FILE), mmap_mode='r')
+        if self.meta['tokens']:
+            self.tokens = np.memmap(os.path.join(path, TOKENS_FILE), dtype=self.meta['dtype'], mode='r')
+        else:
+            self.tokens = np.zeros(0, dtype=self.meta['dtype'])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def token_ids(self, index):
+        """i. örneğin token id'leri (memmap görünümü, kopyasız)"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.tokens[self.offsets[index]:self.offsets[index + 1]]
+
+    def __getitem__(self, index):
+        return {'input_ids': self.token_ids(index).astype(np.int64)}
+
+    @property
+    def lengths(self):
+        """Örnek uzunlukları (token)"""
+        return np.diff(self.offsets)
+
+
+def build_tokenized(data_path, tokenizer, output_dir, system_prompt=SYSTEM_PROMPT, max_length=DEFAULT_MAX_LENGTH,
+                    batch_size=TOKENIZE_BATCH_SIZE, meta=None):
+    """Veri setini tokenize edip output_dir'e yazar (akış halinde, batch batch)
+
+    Returns:
+        dict: meta.json içeriği
+    """
+    tmp_dir = f"{output_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    dtype = np.uint16 if len(tokenizer) <= np.iinfo(np.uint16).max + 1 else np.uint32
+    offsets = array('q', [0])
+    truncated = 0
+    start = time.perf_counter()
+    try:
+        with open(os.path.join(tmp_dir, TOKENS_FILE), 'wb') as f:
+            for texts in _batches(iter_texts(data_path, system_prompt), batch_size):
+                encoded = tokenizer(texts, verbose=False, return_attention_mask=False)['input_ids']
+                for ids in encoded:
+                    # Kesme burada yapılır: kaç örneğin gerçekten kesildiği bilinsin
+                    if max_length is not None and len(ids) > max_length:
+                        ids = ids[:max_length]
+                        truncated += 1
+                    f.write(np.asarray(ids, dtype=dtype).tobytes())
+                    offsets.append(offsets[-1] + len(ids))
+        np.save(os.path.join(tmp_dir, INDEX_FILE), np.frombuffer(offsets, dtype=np.int64))
+        meta = {
+            **(meta or {}),
+            'format_version': FORMAT_VERSION,
+            'source': os.path.abspath(data_path),
+            'tokenizer': getattr(tokenizer, 'name_or_path', None),
+            'vocab_size': len(tokenizer),
+            'max_length': max_length,
+            'dtype': np.dtype(dtype).name,
+            'examples': len(offsets) - 1,
+            'tokens': offsets[-1],
+            'truncated': truncated,
+            'build_seconds': round(time.perf_counter() - start, 3),
+        }
+        with open(os.path.join(tmp_dir, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        shutil.rmtree(output_dir, ignore_errors=True)
+        os.replace(tmp_dir, output_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return meta
+
+
+def load_or_build(data_path, tokenizer=None, tokenizer_name=DEFAULT_MODEL, cache_dir=DEFAULT_CACHE_DIR,
+                  system_prompt=SYSTEM_PROMPT, max_length=DEFAULT_MAX_LENGTH, refresh=False):
+    """Önbellekte varsa memmap'li veri setini açar, yoksa bir kez tokenize edip yazar
+
+    Args:
+        data_path: train.jsonl / eval.jsonl (ya da ham QA JSONL'i)
+        tokenizer: Yüklü tokenizer (None ise tokenizer_name'den yüklenir)
+        cache_dir: Önbellek kök klasörü
+        max_length: Kesme uzunluğu (None = kesme yok)
+        refresh: True ise önbellek yok sayılıp yeniden üretilir
+    """
+    if tokenizer is None:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+    hashes = {
+        'data_sha256': file_digest(data_path),
+        'tokenizer_sha256': tokenizer_digest(tokenizer),
+        'template_sha256': template_digest(system_prompt),
+    }
+    key = cache_key(hashes['data_sha256'], hashes['tokenizer_sha256'], hashes['template_sha256'], max_length)
+    path = os.path.join(cache_dir, key)
+    if refresh or not os.path.exists(os.path.join(path, META_FILE)):
+        print(f"🔧 Tokenize ediliyor: {data_path} -> {path}")
+        os.makedirs(cache_dir, exist_ok=True)
+        meta = build_tokenized(data_path, tokenizer, path, system_prompt, max_length, meta={'key': key, **hashes})
+        print(f"✓ {meta['examples']} örnek, {meta['tokens']:,} token ({meta['build_seconds']:.2f} sn)")
+    else:
+        print(f"♻️  Önbellekten: {path}")
+    return TokenizedDataset(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Eğitim verisini bir kez tokenize edip memmap önbelleğe yazar")
+    parser.add_argument('inputs', nargs='+', help="train.jsonl / eval.jsonl (prepare_dataset çıktısı) ya da QA JSONL")
+    parser.add_argument('--tokenizer', default=DEFAULT_MODEL, help="Hugging Face tokenizer adı ya da klasörü")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--max-length', type=int, default=DEFAULT_MAX_LENGTH, help="0 = kesme yok")
+    parser.add_argument('--refresh', action='store_true', help="Önbelleği yok sayıp yeniden üret")
+    args = parser.parse_args()
+
+    from transformers import AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer)
+    for data_path in args.inputs:
+        start = time.perf_counter()
+        dataset = load_or_build(data_path, tokenizer, cache_dir=args.cache_dir, max_length=args.max_length or None,
+                                refresh=args.refresh)
+        lengths = dataset.lengths
+        print(f"   {len(dataset)} örnek, ortalama {lengths.mean() if len(lengths) else 0:.0f} / "
+              f"en uzun {lengths.max() if len(lengths) else 0} token, "
+              f"kesilen {dataset.meta['truncated']} ({time.perf_counter() - start:.3f} sn)")
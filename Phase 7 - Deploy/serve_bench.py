@@ -0,0 +1,121 @@
+"""
+Serving benchmark for an OpenAI-compatible chat endpoint
+
+Sends the same question set at several concurrency levels and reports
+latency percentiles and throughput per level. Works against any
+OpenAI-compatible server (e.g. llama.cpp / vLLM serving the GGUF model),
+or against the Phase 3 mock server for a dry run (--mock).
+
+    python serve_bench.py --base-url http://127.0.0.1:8080/v1 --model kumru-sagopa --concurrency 1 4 8
+    python serve_bench.py --mock --requests 64
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import sys
+import time
+
+# Reuse the Phase 3 generation engine (pooled session, asyncio workers)
+PHASE3_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          'Phase 3 - PrepQADataSetWithLLMBasedonSingerLanguageFreq')
+sys.path.insert(0, PHASE3_DIR)
+from generation_engine import GenerationEngine
+from retry_policy import RetryPolicy
+
+SYSTEM_PROMPT = """Sen Sagopa Kajmer'sin. Derin dusunen, melankolik ama samimi bir rap sanatcisisin.
+Hayat, zaman, yalnizlik gibi temalardan bahsedersin. Kendi kelime dagarcaginla dogal ve icten konusursun."""
+
+QUESTIONS = [
+    "Bugun nasilsin?",
+    "Rap hakkinda ne dusunuyorsun?",
+    "Hayattan beklentin nedir?",
+    "Yalnizlik hakkinda ne dusunuyorsun?",
+    "Muzik sana ne ifade ediyor?",
+    "Gece uyuyamiyorum, ne yapmaliyim?"
+]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+async def _run_level(engine, questions, requests):
+    latencies = []
+    errors = 0
+    queue = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in queue:
+            start = time.perf_counter()
+            answer, error = await engine.generate(questions[i % len(questions)])
+            if error:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(engine.concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def run_bench(base_url, model, api_key='bench', concurrency_levels=(1, 4, 8), requests=32,
+              max_tokens=128, questions=None, system_prompt=SYSTEM_PROMPT):
+    """Benchmarks each concurrency level, returns one result dict per level"""
+    questions = questions or QUESTIONS
+    results = []
+    for concurrency in concurrency_levels:
+        # No retries: a benchmark should report failures, not hide them in latency
+        with GenerationEngine(api_key, model, system_prompt, base_url=base_url, concurrency=concurrency,
+                              max_tokens=max_tokens, retry_policy=RetryPolicy(max_attempts=1)) as engine:
+            latencies, errors, elapsed = asyncio.run(_run_level(engine, questions, requests))
+            tokens = engine.stats['completion_tokens']
+        results.append({
+            "concurrency": concurrency,
+            "requests": requests,
+            "errors": errors,
+            "elapsed": elapsed,
+            "requests_per_s": len(latencies) / elapsed if elapsed else 0.0,
+            "tokens_per_s": tokens / elapsed if elapsed else 0.0,
+            "p50": percentile(latencies, 50) if latencies else None,
+            "p95": percentile(latencies, 95) if latencies else None,
+        })
+    return results
+
+
+def print_results(results):
+    print(f"{'conc':>5} {'ok':>5} {'err':>4} {'req/s':>7} {'tok/s':>8} {'p50 (s)':>8} {'p95 (s)':>8}")
+    for r in results:
+        p50 = f"{r['p50']:.3f}" if r['p50'] is not None else '-'
+        p95 = f"{r['p95']:.3f}" if r['p95'] is not None else '-'
+        print(f"{r['concurrency']:>5} {r['requests'] - r['errors']:>5} {r['errors']:>4} "
+              f"{r['requests_per_s']:>7.2f} {r['tokens_per_s']:>8.1f} {p50:>8} {p95:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency / throughput benchmark for a chat endpoint")
+    parser.add_argument('--base-url', default='http://127.0.0.1:8080/v1')
+    parser.add_argument('--model', default='kumru-sagopa')
+    parser.add_argument('--api-key-env', default='OPENROUTER_API_KEY',
+                        help="Environment variable holding the API key (if the server needs one)")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--requests', type=int, default=32, help="Requests per concurrency level")
+    parser.add_argument('--max-tokens', type=int, default=128)
+    parser.add_argument('--mock', action='store_true', help="Benchmark the Phase 3 mock server instead")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if args.mock:
+        from mock_openai_server import start_server
+        server, base_url = start_server(latency=0.05, jitter=0.05)
+    try:
+        print_results(run_bench(base_url, args.model, os.environ.get(args.api_key_env, 'bench'),
+                                args.concurrency, args.requests, args.max_tokens))
+    finally:
+        if server is not None:
+            server.shutdown()
@@ -0,0 +1,440 @@
+"""
+Tüm aşamalar için tek giriş noktası (etkileşimsiz, config dosyasıyla)
+
+    python pipeline.py --config pipeline.toml scrape
+    python pipeline.py --config pipeline.toml ngrams --workers 4
+    python pipeline.py --config pipeline.toml generate --batch-size 5
+    python pipeline.py clean --input LoRAReadyToUseDataSet.jsonl --output LoRAReadyToUseDataSet_FIXED.jsonl
+    python pipeline.py dedup --input LoRAReadyToUseDataSet_FIXED.jsonl --output LoRAReadyToUseDataSet_DEDUP.jsonl
+    python pipeline.py quality --input LoRAReadyToUseDataSet_DEDUP.jsonl --ngrams top_1000_ngrams.json --workers 4
+    python pipeline.py train-prep --input LoRAReadyToUseDataSet_QUALITY.jsonl
+    python pipeline.py train-tokenize --inputs train_data/train.jsonl train_data/eval.jsonl
+    python pipeline.py serve-bench --mock
+
+Ayarlar öncelik sırasıyla: komut satırı > config dosyası > fonksiyon varsayılanı.
+Config TOML (tomllib) ya da YAML (PyYAML kuruluysa) olabilir; her alt komutun
+ayarları kendi tablosundadır ([scrape], [ngrams], [generate], [clean],
+[dedup], [quality], [train_prep], [train_tokenize], [serve_bench]). Bilinmeyen ayar adları hata verir (yazım hatası
+sessizce yok sayılmasın). Örnek: pipeline.example.toml
+
+Hiçbir adım input() ile soru sormaz; API anahtarı ortam değişkeninden okunur.
+--report verilirse her çalıştırmanın süresi, ayarları ve config hash'i JSONL
+olarak eklenir (zamanlanmış / tekrarlanabilir ölçümler için).
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+import tomllib
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PHASE_DIRS = {
+    'scrape': 'Phase 1 - Web Scrapping',
+    'ngrams': 'Phase 2 - NLTK',
+    'generate': 'Phase 3 - PrepQADataSetWithLLMBasedonSingerLanguageFreq',
+    'clean': 'Phase 3 - PrepQADataSetWithLLMBasedonSingerLanguageFreq',
+    'dedup': 'Phase 3 - PrepQADataSetWithLLMBasedonSingerLanguageFreq',
+    'quality': 'Phase 3 - PrepQADataSetWithLLMBasedonSingerLanguageFreq',
+    'train-prep': 'Phase 4 - LoRA',
+    'train-tokenize': 'Phase 4 - LoRA',
+    'serve-bench': 'Phase 7 - Deploy',
+}
+
+
+def load_config(path):
+    """TOML / YAML config dosyasını sözlük olarak okur (path None ise boş)"""
+    if not path:
+        return {}
+    if path.endswith(('.yaml', '.yml')):
+        if yaml is None:
+            raise ImportError("YAML config için 'pyyaml' paketi gerekli (pip install pyyaml) ya da TOML kullanın")
+        with open(path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    with open(path, 'rb') as f:
+        return tomllib.load(f)
+
+
+def load_phase_module(command, filename):
+    """Aşama klasöründeki script'i modül olarak yükler (klasör sys.path'e eklenir)"""
+    phase_dir = os.path.join(ROOT, PHASE_DIRS[command])
+    if phase_dir not in sys.path:
+        sys.path.insert(0, phase_dir)
+    name = os.path.splitext(filename)[0].replace('-', '_')
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(phase_dir, filename))
+    module = importlib.util.module_from_spec(spec)
+    # Süreç havuzu (ngrams --workers) fonksiyonları modül adıyla bulabilsin
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def resolve_options(command, config, args):
+    """config[komut] ile komut satırı ayarlarını birleştirir"""
+    section = dict(config.get(command.replace('-', '_'), {}))
+    known = set(COMMANDS[command]['options'])
+    unknown = set(section) - known
+    if unknown:
+        raise ValueError(f"[{command.replace('-', '_')}] bilinmeyen ayar(lar): {', '.join(sorted(unknown))}")
+    cli = {key: value for key, value in vars(args).items() if key in known and value is not None}
+    return {**section, **cli}
+
+
+def require(options, *keys):
+    missing = [key for key in keys if options.get(key) in (None, '')]
+    if missing:
+        raise ValueError(f"Eksik ayar(lar): {', '.join(missing)} (config ya da komut satırı ile verin)")
+
+
+# ============== ALT KOMUTLAR ==============
+
+def run_scrape(options):
+    scraper = load_phase_module('scrape', 'webScrapper.py')
+    common = {
+        'max_workers': options.get('workers', scraper.DEFAULT_WORKERS),
+        'rate': options.get('rate', scraper.DEFAULT_RATE),
+        'burst': options.get('burst', scraper.DEFAULT_BURST),
+        'manifest_path': options.get('manifest', scraper.DEFAULT_MANIFEST),
+        'refresh': options.get('refresh', False),
+        'parser': options.get('parser', scraper.DEFAULT_PARSER),
+        'corpus_path': options.get('corpus'),
+    }
+    if options.get('artists'):
+        return scraper.scrape_artists(options['artists'], output_dir=options.get('output_dir', 'songs'),
+                                      global_rate=options.get('global_rate'), **common)
+
+    # Tek sanatçı: webScrapper.py'nin kendi akışı, onay sormadan. Liste ve sözler
+    # scrape_artists'teki gibi sitenin adapter'ıyla ayrıştırılır
+    csv_path = options.get('csv', 'sagopaSongs.csv')
+    site = options.get('site', 'azlyrics')
+    site_options = dict(options.get('site_options', {}))
+    if site in scraper.SITE_ADAPTERS:
+        site_options.setdefault('parser', common['parser'])
+    common['parser'] = scraper.get_adapter(site, **site_options)
+    url = common['parser'].artist_url(options.get('artist', 'sagopakajmer'))
+    with scraper.ScrapeManifest(common['manifest_path']) as manifest, \
+            scraper.create_session(common['max_workers']) as session:
+        songs = scraper.get_song_list(url, session, manifest=manifest, parser=common['parser'])
+    if not songs:
+        raise RuntimeError("Şarkı listesi alınamadı")
+    scraper.save_to_csv(songs, csv_path)
+    stats = scraper.scrape_all_lyrics(csv_path, output_dir=options.get('output_dir', '.'), **common)
+    if stats is None or (stats['failed'] and not stats['saved'] + stats['unchanged']):
+        raise RuntimeError(f"Şarkı sözleri çekilemedi ({stats})")
+    return {'songs': len(songs), **stats}
+
+
+def run_ngrams(options):
+    ngram_module = load_phase_module('ngrams', 'createN-Grams.py')
+    require(options, 'corpus')
+    output = options.get('output', 'top_1000_ngrams.json')
+    results = ngram_module.extract_top_ngrams(
+        options['corpus'], top_n=options.get('top_n', 1000), engine=options.get('engine', 'counter'),
+        workers=options.get('workers', 1), merge=options.get('merge', 'exact'),
+        approx=options.get('approx'), epsilon=options.get('epsilon', 1e-5), delta=options.get('delta', 0.01),
+        store_path=options.get('store', 'ngram_counts.npz') if options.get('update') else None
+    )
+    if not results:
+        raise RuntimeError("N-gram çıkarımı başarısız")
+    ngram_module.save_results(results, output)
+    ngram_module.print_summary(results)
+    return {'output': output, 'songs': results['metadata']['total_songs']}
+
+
+def run_generate(options):
+    creator = load_phase_module('generate', 'DataSetCreator.py')
+    require(options, 'input', 'ngrams', 'model')
+    backend = options.get('backend', 'openrouter')
+    api_key = None
+    if backend == 'openrouter':
+        key_env = options.get('api_key_env', 'OPENROUTER_API_KEY')
+        api_key = os.environ.get(key_env)
+        if not api_key:
+            raise ValueError(f"API anahtarı bulunamadı: {key_env} ortam değişkenini ayarlayın")
+
+    passthrough = ('concurrency', 'rpm', 'tpm', 'ordered', 'base_url', 'resume', 'cache_max_mb',
+                   'refresh_cache', 'prompt_token_budget', 'prompt_tokenizer', 'batch_size', 'torch_threads')
+    kwargs = {key: options[key] for key in passthrough if key in options}
+    if 'cache' in options:
+        # cache = "" / false -> önbellek kapalı
+        kwargs['cache_path'] = options['cache'] or None
+    creator.process_dataset(options['input'], options['ngrams'], options.get('output', 'LLMQADataSet.jsonl'),
+                            api_key, options['model'], backend=backend, **kwargs)
+    return {'output': options.get('output', 'LLMQADataSet.jsonl')}
+
+
+def run_clean(options):
+    fixer = load_phase_module('clean', 'fix_dataset_encoding.py')
+    require(options, 'input', 'output')
+    stats = fixer.fix_encoding(options['input'], options['output'], options.get('min_output_length', 20))
+    return {'output': options['output'], **stats}
+
+
+def run_dedup(options):
+    dedup = load_phase_module('dedup', 'dedup_dataset.py')
+    require(options, 'input', 'output')
+    kwargs = {key: options[key] for key in ('threshold', 'mode', 'num_perm', 'shingle_size', 'seed') if key in options}
+    stats = dedup.dedup_dataset(options['input'], options['output'], **kwargs)
+    return {'output': options['output'], **stats}
+
+
+def run_quality(options):
+    quality = load_phase_module('quality', 'quality_filters.py')
+    require(options, 'input')
+    thresholds = options.get('thresholds') or {}
+    if isinstance(thresholds, list):
+        thresholds = quality.parse_thresholds(thresholds)
+    stats = quality.score_dataset(options['input'], options.get('scored'), options.get('output'),
+                                  options.get('filters'), thresholds, options.get('ngrams'),
+                                  options.get('workers', 1), options.get('chunk_size', quality.DEFAULT_CHUNK_SIZE),
+                                  options.get('stats'))
+    return {'output': options.get('output'), 'scored': options.get('scored'), **stats}
+
+
+def run_train_prep(options):
+    prep = load_phase_module('train-prep', 'prepare_dataset.py')
+    require(options, 'input')
+    kwargs = {key: options[key] for key in ('system_prompt', 'eval_ratio', 'seed') if key in options}
+    result = prep.prepare_dataset(options['input'], options.get('output_dir', 'train_data'), **kwargs)
+    print(f"✓ Eğitim: {result['train']} örnek -> {result['train_path']}")
+    print(f"✓ Doğrulama: {result['eval']} örnek -> {result['eval_path']}")
+    return result
+
+
+def run_train_tokenize(options):
+    tokenized = load_phase_module('train-tokenize', 'tokenized_dataset.py')
+    require(options, 'inputs')
+    from transformers import AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(options.get('tokenizer', tokenized.DEFAULT_MODEL))
+    kwargs = {key: options[key] for key in ('system_prompt', 'refresh') if key in options}
+    max_length = options.get('max_length', tokenized.DEFAULT_MAX_LENGTH)
+    results = []
+    for data_path in options['inputs']:
+        dataset = tokenized.load_or_build(data_path, tokenizer, cache_dir=options.get('cache_dir', tokenized.DEFAULT_CACHE_DIR),
+                                          max_length=max_length or None, **kwargs)
+        results.append({'input': data_path, 'path': dataset.path, 'examples': len(dataset),
+                        'tokens': dataset.meta['tokens'], 'truncated': dataset.meta['truncated']})
+    return {'datasets': results}
+
+
+def run_serve_bench(options):
+    bench = load_phase_module('serve-bench', 'serve_bench.py')
+    server = None
+    base_url = options.get('base_url', 'http://127.0.0.1:8080/v1')
+    if options.get('mock'):
+        from mock_openai_server import start_server
+        server, base_url = start_server(latency=0.05, jitter=0.05)
+    questions = None
+    if options.get('questions'):
+        with open(options['questions'], 'r', encoding='utf-8') as f:
+            questions = [json.loads(line)['input'] for line in f if line.strip()]
+    try:
+        results = bench.run_bench(base_url, options.get('model', 'kumru-sagopa'),
+                                  os.environ.get(options.get('api_key_env', 'OPENROUTER_API_KEY'), 'bench'),
+                                  options.get('concurrency', [1, 4, 8]), options.get('requests', 32),
+                                  options.get('max_tokens', 128), questions)
+    finally:
+        if server is not None:
+            server.shutdown()
+    bench.print_results(results)
+    return {'levels': results}
+
+
+COMMANDS = {
+    'scrape': {
+        'run': run_scrape,
+        'help': "Şarkı sözlerini çeker (Phase 1)",
+        'options': ['artist', 'artists', 'site', 'site_options', 'csv', 'output_dir', 'corpus', 'workers', 'rate',
+                    'burst', 'global_rate', 'manifest', 'refresh', 'parser'],
+    },
+    'ngrams': {
+        'run': run_ngrams,
+        'help': "Top N n-gram çıkarır (Phase 2)",
+        'options': ['corpus', 'top_n', 'engine', 'workers', 'merge', 'approx', 'epsilon', 'delta', 'update',
+                    'store', 'output'],
+    },
+    'generate': {
+        'run': run_generate,
+        'help': "N-gram stiliyle QA cevapları üretir (Phase 3)",
+        'options': ['input', 'ngrams', 'output', 'backend', 'model', 'api_key_env', 'base_url', 'concurrency',
+                    'rpm', 'tpm', 'ordered', 'resume', 'cache', 'cache_max_mb', 'refresh_cache',
+                    'prompt_token_budget', 'prompt_tokenizer', 'batch_size', 'torch_threads'],
+    },
+    'clean': {
+        'run': run_clean,
+        'help': "Veri setinin encoding'ini düzeltir ve temizler (Phase 3)",
+        'options': ['input', 'output', 'min_output_length'],
+    },
+    'dedup': {
+        'run': run_dedup,
+        'help': "Yakın tekrar kayıtları MinHash/LSH ile atar ya da işaretler (Phase 3)",
+        'options': ['input', 'output', 'threshold', 'mode', 'num_perm', 'shingle_size', 'seed'],
+    },
+    'quality': {
+        'run': run_quality,
+        'help': "Kayıtları kalite filtreleriyle puanlar ve süzer (Phase 3)",
+        'options': ['input', 'output', 'scored', 'stats', 'ngrams', 'filters', 'thresholds', 'workers',
+                    'chunk_size'],
+    },
+    'train-prep': {
+        'run': run_train_prep,
+        'help': "Veri setini ChatML eğitim / doğrulama dosyalarına çevirir (Phase 4)",
+        'options': ['input', 'output_dir', 'system_prompt', 'eval_ratio', 'seed'],
+    },
+    'train-tokenize': {
+        'run': run_train_tokenize,
+        'help': "Eğitim verisini bir kez tokenize edip memmap önbelleğe yazar (Phase 4)",
+        'options': ['inputs', 'tokenizer', 'cache_dir', 'max_length', 'system_prompt', 'refresh'],
+    },
+    'serve-bench': {
+        'run': run_serve_bench,
+        'help': "Sunulan modelin gecikme / verim ölçümü (Phase 7)",
+        'options': ['base_url', 'model', 'api_key_env', 'concurrency', 'requests', 'max_tokens', 'questions',
+                    'mock'],
+    },
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Sagopa Kajmer LoRA pipeline'ı")
+    parser.add_argument('--config', help="TOML ya da YAML config dosyası")
+    parser.add_argument('--report', help="Çalıştırma raporlarının ekleneceği JSONL dosyası")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def flag(p, name, **kwargs):
+        # Varsayılanlar None: verilmeyen bayrak config'i ezmesin
+        p.add_argument(f"--{name.replace('_', '-')}", dest=name, default=None, **kwargs)
+
+    def switch(p, name):
+        p.add_argument(f"--{name.replace('_', '-')}", dest=name, default=None,
+                       action=argparse.BooleanOptionalAction)
+
+    p = sub.add_parser('scrape', help=COMMANDS['scrape']['help'])
+    for name in ('artist', 'site', 'csv', 'output_dir', 'corpus', 'manifest', 'parser'):
+        flag(p, name)
+    flag(p, 'workers', type=int)
+    for name in ('rate', 'burst', 'global_rate'):
+        flag(p, name, type=float)
+    switch(p, 'refresh')
+
+    p = sub.add_parser('ngrams', help=COMMANDS['ngrams']['help'])
+    for name in ('corpus', 'store', 'output'):
+        flag(p, name)
+    flag(p, 'top_n', type=int)
+    flag(p, 'workers', type=int)
+    flag(p, 'engine', choices=['counter', 'numpy'])
+    flag(p, 'merge', choices=['exact', 'topk'])
+    flag(p, 'approx', choices=['spacesaving', 'cms'])
+    flag(p, 'epsilon', type=float)
+    flag(p, 'delta', type=float)
+    switch(p, 'update')
+
+    p = sub.add_parser('generate', help=COMMANDS['generate']['help'])
+    for name in ('input', 'ngrams', 'output', 'model', 'api_key_env', 'base_url', 'cache', 'prompt_tokenizer'):
+        flag(p, name)
+    flag(p, 'backend', choices=['openrouter', 'local'])
+    for name in ('concurrency', 'rpm', 'tpm', 'prompt_token_budget', 'batch_size', 'torch_threads'):
+        flag(p, name, type=int)
+    flag(p, 'cache_max_mb', type=float)
+    for name in ('ordered', 'resume', 'refresh_cache'):
+        switch(p, name)
+
+    p = sub.add_parser('clean', help=COMMANDS['clean']['help'])
+    flag(p, 'input')
+    flag(p, 'output')
+    flag(p, 'min_output_length', type=int)
+
+    p = sub.add_parser('dedup', help=COMMANDS['dedup']['help'])
+    flag(p, 'input')
+    flag(p, 'output')
+    flag(p, 'threshold', type=float)
+    flag(p, 'mode', choices=['drop', 'flag'])
+    for name in ('num_perm', 'shingle_size', 'seed'):
+        flag(p, name, type=int)
+
+    p = sub.add_parser('quality', help=COMMANDS['quality']['help'])
+    for name in ('input', 'output', 'scored', 'stats', 'ngrams'):
+        flag(p, name)
+    flag(p, 'filters', nargs='+')
+    flag(p, 'thresholds', nargs='+', help="ad=değer, örn. repetition=0.2")
+    flag(p, 'workers', type=int)
+    flag(p, 'chunk_size', type=int)
+
+    p = sub.add_parser('train-prep', help=COMMANDS['train-prep']['help'])
+    flag(p, 'input')
+    flag(p, 'output_dir')
+    flag(p, 'eval_ratio', type=float)
+    flag(p, 'seed', type=int)
+
+    p = sub.add_parser('train-tokenize', help=COMMANDS['train-tokenize']['help'])
+    flag(p, 'inputs', nargs='+')
+    flag(p, 'tokenizer')
+    flag(p, 'cache_dir')
+    flag(p, 'max_length', type=int, help="0 = kesme yok")
+    switch(p, 'refresh')
+
+    p = sub.add_parser('serve-bench', help=COMMANDS['serve-bench']['help'])
+    for name in ('base_url', 'model', 'api_key_env', 'questions'):
+        flag(p, name)
+    flag(p, 'concurrency', type=int, nargs='+')
+    flag(p, 'requests', type=int)
+    flag(p, 'max_tokens', type=int)
+    switch(p, 'mock')
+    return parser
+
+
+def write_report(path, command, options, config_path, elapsed, status, result):
+    config_hash = None
+    if config_path:
+        with open(config_path, 'rb') as f:
+            config_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+    record = {
+        'command': command,
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(time.time() - elapsed)),
+        'elapsed_seconds': round(elapsed, 3),
+        'status': status,
+        'config': config_path,
+        'config_hash': config_hash,
+        'options': options,
+        'result': result,
+    }
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        options = resolve_options(args.command, load_config(args.config), args)
+    except (OSError, ValueError, ImportError, tomllib.TOMLDecodeError) as e:
+        print(f"✗ Config hatası: {e}")
+        return 2
+
+    print(f"▶ {args.command}: {json.dumps(options, ensure_ascii=False, default=str)}")
+    start = time.perf_counter()
+    status, result = 'ok', None
+    try:
+        result = COMMANDS[args.command]['run'](options)
+    except (ValueError, RuntimeError, OSError, ImportError) as e:
+        status = 'error'
+        print(f"✗ {args.command} başarısız: {e}")
+    elapsed = time.perf_counter() - start
+    print(f"⏱️ {args.command}: {elapsed:.1f} sn ({status})")
+
+    if args.report:
+        write_report(args.report, args.command, options, args.config, elapsed, status, result)
+    return 0 if status == 'ok' else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())